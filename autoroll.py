@@ -0,0 +1,101 @@
+"""
+Auto-roll mode for the luck simulators.
+
+AutoRoller rolls one batch per root.after frame through roll_n(n), sized
+so rolling takes about WORK_SHARE of the frame and the window stays
+responsive. rate caps the rolls per second (0: as fast as frames allow);
+rolls_per_sec is the rate achieved over the last RATE_WINDOW seconds.
+"""
+
+import time
+from collections import deque
+
+DEFAULT_FPS = 30
+WORK_SHARE = 0.5   # share of each frame the batch may use
+MAX_GROWTH = 2     # largest factor the batch grows by between frames
+MAX_BATCH = 10**9
+RATE_WINDOW = 1.0  # seconds of history behind rolls_per_sec
+
+
+class AutoRoller:
+    """Roll in timed batches on the Tk thread until stopped.
+
+    roll_n(n) applies n rolls (LuckSim.roll_n does); on_batch() runs after
+    each batch, typically to mark the labels and the save dirty.
+    """
+
+    def __init__(self, root, roll_n, on_batch, rate=0, fps=DEFAULT_FPS):
+        self.root = root
+        self.roll_n = roll_n
+        self.on_batch = on_batch
+        self.rate = rate  # rolls per second, 0 for no cap
+        self.frame = 1.0 / fps
+        self.batch = 1  # most rolls the next frame will do
+        self.rolls = 0  # rolls done since start()
+        self.rolls_per_sec = 0.0
+        self._pending = None  # after() id of the next frame
+        self._last = 0.0
+        self._owed = 0.0  # rolls earned by rate but not rolled yet
+        self._window = deque()  # (time, rolls) of recent frames
+        self._window_rolls = 0
+
+    @property
+    def running(self):
+        return self._pending is not None
+
+    def start(self):
+        if self._pending is None:
+            self._last = time.monotonic()
+            self._owed = 0.0
+            self.rolls = 0
+            self._pending = self.root.after(0, self._frame)
+
+    def stop(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        self._window.clear()
+        self._window_rolls = 0
+        self.rolls_per_sec = 0.0
+
+    def toggle(self):
+        """Start if stopped, stop if running; returns the new running state."""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+        return self.running
+
+    def _frame(self):
+        started = time.monotonic()
+        n = self.batch
+        if self.rate > 0:
+            self._owed += self.rate * (started - self._last)
+            n = min(int(self._owed), n)
+            self._owed = min(self._owed - n, self.batch)
+        self._last = started
+        if n:
+            self.roll_n(n)
+            self._adapt(n, time.monotonic() - started)
+            self.rolls += n
+        self._measure(started, n)
+        if n:
+            self.on_batch()
+        delay = self.frame - (time.monotonic() - started)
+        self._pending = self.root.after(max(1, round(delay * 1000)), self._frame)
+
+    def _adapt(self, n, elapsed):
+        budget = self.frame * WORK_SHARE
+        if elapsed <= budget and n < self.batch:
+            return  # throttled by rate; the batch size was not tested
+        scale = budget / elapsed if elapsed > 0 else MAX_GROWTH
+        self.batch = max(1, min(MAX_BATCH, int(n * min(scale, MAX_GROWTH))))
+
+    def _measure(self, now, n):
+        self._window.append((now, n))
+        self._window_rolls += n
+        while now - self._window[0][0] > RATE_WINDOW:
+            self._window_rolls -= self._window.popleft()[1]
+        span = now - self._window[0][0]
+        if span > 0:
+            self.rolls_per_sec = (self._window_rolls - self._window[0][1]) / span
@@ -0,0 +1,120 @@
+"""
+Debounced background saving for the luck simulators.
+
+SaveScheduler.mark_dirty() snapshots the state on the caller's thread; a
+daemon thread writes the latest snapshot at most once per interval. close() flushes anything pending and also runs
+at interpreter exit. write_json_atomic() replaces a JSON file atomically.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+
+import perf
+
+
+def write_json_atomic(path, data):
+    """Write data as JSON to path through a temp file and an atomic rename.
+
+    A crash mid-write leaves the previous save intact instead of a
+    truncated file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            if perf.enabled:
+                perf.count("save_bytes", f.tell())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class SaveScheduler:
+    """Coalesce saves to at most one per interval on a background thread.
+
+    snapshot() is called by mark_dirty() on the caller's thread, between
+    handlers, so a save never sees a half-applied change. It must return a
+    copy of the data to save (LuckSim.to_dict does). write(data) does the
+    actual I/O on the saver thread.
+    """
+
+    def __init__(self, snapshot, write, interval=2.0):
+        self.snapshot = snapshot
+        self.write = write
+        self.interval = interval
+        self.error = None  # last exception raised by write, if any
+        self._pending = None  # latest snapshot not written yet
+        self._pending_lock = threading.Lock()
+        self._closed = False
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self):
+        """Snapshot the changed state now; the write happens later, off-thread."""
+        data = self.snapshot()
+        with self._pending_lock:
+            self._pending = data
+        self._wake.set()
+
+    def flush(self):
+        """Write now if anything is pending; safe from any thread."""
+        with self._lock:
+            # clear first so a snapshot racing with the take wakes us again
+            self._wake.clear()
+            with self._pending_lock:
+                data, self._pending = self._pending, None
+            if data is None:
+                return
+            try:
+                self._save(data)
+                self.error = None
+            except Exception as exc:
+                self.error = exc
+                with self._pending_lock:
+                    if self._pending is None:  # keep a newer snapshot if there is one
+                        self._pending = data
+                self._wake.set()
+            self._last_write = time.monotonic()
+
+    def _save(self, data):
+        self.write(data)
+
+    def close(self):
+        """Stop the saver thread and flush pending changes. Idempotent."""
+        if not self._closed:
+            self._closed = True
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            atexit.unregister(self.close)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            delay = self._last_write + self.interval - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            self.flush()
+            if self.error is not None:
+                # don't spin on a failing disk; retry after a full interval
+                self._stop.wait(self.interval)
+
+
+perf.hook(SaveScheduler, "_save", "save")
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the engine hot paths.
+
+Times the luck engines, Game.tick in the incremental_stats_game scripts,
+statgame's tick and apply_all_boosts, the number formatters and the
+save/load paths. Reports the per-call median and minimum over --repeat
+samples; a script that fails to load is skipped.
+
+    python bench.py --json baseline.json
+    python bench.py --compare baseline.json     # exit status 1 on regressions
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from journal import Journal
+
+MIN_SAMPLE = 0.02  # seconds per timed sample of cheap cases
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.15
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GAME_SCRIPTS = {
+    "v3": "incremental_stats_game.py",
+    "7": "incremental_stats_game (7).py",
+    "8": "incremental_stats_game (8).py",
+}
+LUCK_SCRIPTS = ("luckiestsim", "luck100", "luck101")  # the ones with a format_number
+STATGAME_UNLOCKED = 1000
+
+_scripts = {}
+
+
+def load_script(filename):
+    """Import a repo script by file name; cached, raises on a broken script."""
+    if filename not in _scripts:
+        name = "bench_" + "".join(c if c.isalnum() else "_" for c in filename)
+        loader = importlib.machinery.SourceFileLoader(name, os.path.join(HERE, filename))
+        module = importlib.util.module_from_spec(importlib.util.spec_from_loader(name, loader))
+        sys.modules[name] = module
+        loader.exec_module(module)
+        _scripts[filename] = module
+    return _scripts[filename]
+
+
+# ---- cases ----
+# each maker returns the function to time; fresh cases get a new one per sample
+CASES = []  # (name, maker, fresh)
+
+
+def case(name, fresh=False):
+    def register(maker):
+        CASES.append((name, maker, fresh))
+        return maker
+    return register
+
+
+def _luck_cases():
+    from lucksim import VARIANTS
+    midgame = {"LP": 50, "PP": 10, "TP": 3, "RP": 1, "Rp": 1, "Luck": 1e6, "best_rarity": 20}
+    for variant, cls in VARIANTS.items():
+        def make_sim(cls=cls):
+            sim = cls()
+            sim.state.update((k, v) for k, v in midgame.items() if k in sim.state)
+            return sim
+        case(f"luck/{variant}/calc_luck")(lambda make_sim=make_sim: make_sim().calc_luck)
+        case(f"luck/{variant}/roll_rarity")(lambda make_sim=make_sim: make_sim().roll_rarity)
+        case(f"luck/{variant}/roll_n_1e6")(
+            lambda make_sim=make_sim: (lambda sim: lambda: sim.roll_n(10**6))(make_sim()))
+
+
+def _game_cases():
+    import stat_labels
+    from bignum import BigNum
+    for version, filename in GAME_SCRIPTS.items():
+        for n in (10, 100, 1000):
+            @case(f"game/{version}/tick/{n}", fresh=True)
+            def make(filename=filename, n=n):
+                game = load_script(filename).Game()
+                game.unlocked = [stat_labels.label(i) for i in range(1, n + 1)]
+                # as in play: "a" has grown, newly unlocked stats start near 0
+                game.stats = {name: BigNum(0.0) for name in game.unlocked}
+                game.stats["a"] = BigNum(1e6)
+                return game.tick
+        @case(f"format/game-{version}")
+        def make(filename=filename):
+            fmt = load_script(filename).Game()._format
+            values = [BigNum.from_log10(e) for e in range(0, 400, 7)]
+            return lambda: [fmt(v) for v in values]
+
+
+def _statgame_state(statgame, max_stats):
+    # up to STATGAME_UNLOCKED stats, spread evenly, so large max_stats stays runnable
+    state = statgame.GameState(max_stats)
+    step = max(1, max_stats // STATGAME_UNLOCKED)
+    for n in range(1 + step, max_stats + 1, step):
+        state.unlock(n)
+        state.generation[n] = 1e-12
+    statgame.tick(state, 10)
+    return state
+
+
+def _statgame_cases():
+    for max_stats in (100, 1000, 10000):
+        @case(f"statgame/tick/{max_stats}", fresh=True)
+        def make(max_stats=max_stats):
+            statgame = load_script("statgame")
+            state = _statgame_state(statgame, max_stats)
+            return lambda: statgame.tick(state, 1000)
+
+        @case(f"statgame/apply_all_boosts/{max_stats}", fresh=True)
+        def make(max_stats=max_stats):
+            statgame = load_script("statgame")
+            state = _statgame_state(statgame, max_stats)
+            return lambda: statgame.apply_all_boosts(state)
+
+    @case("format/statgame")
+    def make():
+        from bignum import BigNum
+        format_value = load_script("statgame").format_value
+        values = [BigNum.from_log10(e) for e in range(0, 20000, 97)]
+        return lambda: [format_value(v) for v in values]
+
+
+def _format_cases():
+    for script in LUCK_SCRIPTS:
+        @case(f"format/{script}")
+        def make(script=script):
+            format_number = load_script(script + ".py").format_number
+            values = [10.0 ** e for e in range(0, 60, 2)]
+            return lambda: [format_number(v) for v in values]
+
+
+def _save_cases(tmp):
+    from autosave import write_json_atomic
+    from lucksim import LuckiestSim
+    from profile_store import ProfileStore
+    from roll_recorder import RollRecorder
+
+    @case("save/lucksim")
+    def make():
+        sim = LuckiestSim()
+        path = os.path.join(tmp, "luck.json")
+        return lambda: write_json_atomic(path, sim.to_dict())
+
+    @case("save/profile-store")
+    def make():
+        sim = LuckiestSim()
+        store = ProfileStore(os.path.join(tmp, "profiles.db"))
+
+        def save():
+            sim.state["best_rarity"] += 1  # one changed field, as between autosaves
+            store.save("bench", "luckiestsim", sim.to_dict())
+        return save
+
+    @case("save/roll-log-append")
+    def make():
+        recorder = RollRecorder(os.path.join(tmp, "bench.rolls"))
+        return lambda: recorder.record(12)
+
+    @case("save/statgame-snapshot/1000")
+    def make():
+        state = _statgame_state(load_script("statgame"), 1000)
+        journal = Journal(os.path.join(tmp, "snap.json"))
+        return lambda: journal.snapshot(state.to_dict())
+
+    @case("save/statgame-journal-append")
+    def make():
+        journal = Journal(os.path.join(tmp, "append.json"), compact_every=10**12)
+        journal.snapshot({})
+        return lambda: journal.append(1, 1)
+
+    @case("load/statgame-snapshot/1000")
+    def make():
+        statgame = load_script("statgame")
+        path = os.path.join(tmp, "load-snap.json")
+        Journal(path).snapshot(_statgame_state(statgame, 1000).to_dict())
+        return lambda: _load(statgame, path)
+
+    @case("load/statgame-replay/100+10")
+    def make():
+        # replay re-runs the commands, so this is dominated by 10 tick+boost passes
+        statgame = load_script("statgame")
+        path = os.path.join(tmp, "load-replay.json")
+        state = _statgame_state(statgame, 100)
+        journal = Journal(path, compact_every=10**12)
+        journal.snapshot(state.to_dict())
+        for _ in range(10):
+            statgame.play(state, journal, statgame.OP_TICK, 1)
+        journal.close()
+        return lambda: _load(statgame, path)
+
+
+def _load(statgame, path):
+    journal = Journal(path)
+    statgame.load_game(journal)
+    journal.close()
+
+
+# ---- running ----
+def _time_calls(fn, number):
+    started = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - started
+
+
+def measure(maker, fresh, repeat):
+    """Per-call seconds over repeat samples."""
+    samples = []
+    if fresh:
+        for _ in range(repeat):
+            samples.append(_time_calls(maker(), 1))
+        return samples
+    fn = maker()
+    number = 1
+    while True:  # calibrate, as timeit.autorange does
+        elapsed = _time_calls(fn, number)
+        if elapsed >= MIN_SAMPLE:
+            break
+        number *= 10 if elapsed < MIN_SAMPLE / 10 else 2
+    samples.append(elapsed / number)
+    for _ in range(repeat - 1):
+        samples.append(_time_calls(fn, number) / number)
+    return samples
+
+
+def run(pattern=None, repeat=DEFAULT_REPEAT, out=sys.stdout):
+    """Run every case whose name contains pattern; returns the results dict."""
+    results = {}
+    skipped = {}
+    for name, maker, fresh in CASES:
+        if pattern and pattern not in name:
+            continue
+        try:
+            samples = measure(maker, fresh, repeat)
+        except (SyntaxError, ImportError, OSError) as exc:
+            skipped[name] = f"{type(exc).__name__}: {exc}".splitlines()[0]
+            print(f"{name:<40} skipped ({skipped[name]})", file=out)
+            continue
+        results[name] = {"median": statistics.median(samples), "min": min(samples),
+                         "repeat": len(samples)}
+        print(f"{name:<40} {_fmt(results[name]['median']):>10} "
+              f"(min {_fmt(results[name]['min'])})", file=out)
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "time": time.time(), "results": results, "skipped": skipped}
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """[(name, baseline median, current median, ratio)] for cases that got slower."""
+    regressions = []
+    for name, row in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = row["median"] / base["median"] if base["median"] else float("inf")
+        if ratio > 1 + tolerance:
+            regressions.append((name, base["median"], row["median"], ratio))
+    return regressions
+
+
+def _fmt(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+_luck_cases()
+_game_cases()
+_statgame_cases()
+_format_cases()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engine hot paths.")
+    parser.add_argument("-k", "--filter", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against this results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a case is flagged (default 0.15 = 15%%)")
+    parser.add_argument("--list", action="store_true", help="list the case names and exit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        _save_cases(tmp)
+        if args.list:
+            for name, _, _ in CASES:
+                print(name)
+            return
+        current = run(args.filter, args.repeat)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {_fmt(before)} -> {_fmt(after)} ({ratio:.2f}x)")
+        print(f"{len(regressions)} regression(s) against {args.compare} "
+              f"(tolerance {args.tolerance:.0%})")
+        raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,617 @@
+"""
+Overflow-free numbers for the incremental games.
+
+BigNum is the Python counterpart of one.html's {c, e} numbers: m * 10 ** e
+with a float m and an int e. While 1e-300 <= |value| < 1e300 it keeps
+e == 0 and behaves exactly like the float; past that it keeps about 15
+significant digits at any exponent. It mixes with int and float, hashes
+like the equal float, and str() round-trips through BigNum(str).
+
+BigArray is a vector of BigNums (NumPy mantissa and exponent arrays, or a
+list of BigNum without NumPy) with add, mul, pow, maximum, sum and log10.
+plain_floats() and from_plain_floats() convert plain BigNums to floats
+and back.
+"""
+
+import math
+from numbers import Rational
+
+try:
+    import numpy as np
+except ImportError:  # BigArray falls back to a list of BigNum
+    np = None
+
+FLOAT_DIGITS = 300  # values with |decimal exponent| below this are plain floats
+ADD_DIGITS = 17     # beyond this exponent gap the smaller addend is below float precision
+TINY = 10.0 ** -FLOAT_DIGITS
+HUGE = 10.0 ** FLOAT_DIGITS
+LOG10_2 = math.log10(2)
+
+
+def _make(m, e):
+    num = object.__new__(BigNum)
+    num.m = m
+    num.e = e
+    return num
+
+
+def _shift(m, k):
+    """m * 10 ** k for a float m, without overflowing along the way."""
+    while k > FLOAT_DIGITS:
+        m *= 10.0 ** FLOAT_DIGITS
+        k -= FLOAT_DIGITS
+    while k < -FLOAT_DIGITS:
+        m /= 10.0 ** FLOAT_DIGITS
+        k += FLOAT_DIGITS
+    return m * 10.0 ** k if k >= 0 else m / 10.0 ** -k
+
+
+def _normalize(m, e):
+    """BigNum for m * 10 ** e with any finite float m and int e."""
+    if m == 0:
+        return _make(0.0, 0)
+    if not math.isfinite(m):
+        raise OverflowError("BigNum mantissa is not finite")
+    k = math.floor(math.log10(abs(m)))
+    digits = e + k
+    # log10 can round across a power of ten, so only digits a step inside the
+    # range are sure to be plain; the edges are settled on the mantissa below
+    if -FLOAT_DIGITS < digits < FLOAT_DIGITS - 1:
+        return _make(_shift(m, e) if e else m, 0)
+    mant = _shift(m, -k)
+    if abs(mant) >= 10.0:  # log10 rounded up at an edge
+        mant /= 10.0
+        digits += 1
+    elif abs(mant) < 1.0:
+        mant *= 10.0
+        digits -= 1
+    if -FLOAT_DIGITS <= digits < FLOAT_DIGITS:
+        return _make(_shift(m, e) if e else m, 0)
+    return _make(mant, digits)
+
+
+def _split(num):
+    """(m, e) with 1 <= |m| < 10, whatever form num is stored in."""
+    m, e = num.m, num.e
+    if e or not m:
+        return m, e
+    k = math.floor(math.log10(abs(m)))
+    m = _shift(m, -k)
+    if abs(m) >= 10.0:
+        m /= 10.0
+        k += 1
+    elif abs(m) < 1.0:
+        m *= 10.0
+        k -= 1
+    return m, k
+
+
+def _coerce(value):
+    if isinstance(value, BigNum):
+        return value
+    if isinstance(value, (int, float, Rational)):
+        return BigNum(value)
+    return None
+
+
+class BigNum:
+    """A real number as a float mantissa and an unbounded base-10 exponent."""
+
+    __slots__ = ("m", "e")
+
+    def __init__(self, value=0.0):
+        if isinstance(value, BigNum):
+            self.m, self.e = value.m, value.e
+            return
+        if isinstance(value, str):
+            mant, _, exp = value.strip().lower().partition("e")
+            if abs(int(exp or 0)) < FLOAT_DIGITS:
+                num = _normalize(float(value), 0)  # exact parse of a plain float
+            else:
+                num = _normalize(float(mant), int(exp))
+        elif isinstance(value, int) and abs(value).bit_length() > 990:
+            # go through the top 60 bits so huge ints never hit float()
+            shift = abs(value).bit_length() - 60
+            top = value >> shift if value > 0 else -(-value >> shift)
+            num = BigNum.from_log10(math.log10(abs(top)) + shift * LOG10_2)
+            if value < 0:
+                num = -num
+        elif isinstance(value, Rational) and not isinstance(value, int):
+            try:
+                num = _normalize(float(value), 0)
+            except OverflowError:
+                num = BigNum(value.numerator) / BigNum(value.denominator)
+        else:
+            value = float(value)
+            if not math.isfinite(value):
+                raise OverflowError("BigNum needs a finite value")
+            num = _normalize(value, 0)
+        self.m, self.e = num.m, num.e
+
+    @classmethod
+    def from_log10(cls, log):
+        """The positive BigNum 10 ** log (0 for log == -inf)."""
+        if log == -math.inf:
+            return _make(0.0, 0)
+        if not math.isfinite(log):
+            raise OverflowError("BigNum exponent out of range")
+        if -FLOAT_DIGITS <= log < FLOAT_DIGITS:
+            return _normalize(10.0 ** log, 0)
+        e = math.floor(log)
+        return _normalize(10.0 ** (log - e), e)
+
+    # ---- arithmetic ----
+    def __add__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        if not other.m:
+            return self
+        if not self.m:
+            return other
+        if not self.e and not other.e:
+            total = self.m + other.m
+            if math.isfinite(total):
+                return _normalize(total, 0)
+        am, ae = _split(self)
+        bm, be = _split(other)
+        gap = ae - be
+        if gap > ADD_DIGITS:
+            return self
+        if gap < -ADD_DIGITS:
+            return other
+        if gap >= 0:
+            return _normalize(am + bm / 10.0 ** gap, ae)
+        return _normalize(am / 10.0 ** -gap + bm, be)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self + _make(-other.m, other.e)
+
+    def __rsub__(self, other):
+        return _make(-self.m, self.e) + other
+
+    def __mul__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        if not self.e and not other.e:
+            product = self.m * other.m
+            if math.isfinite(product) and (abs(product) >= TINY or not (self.m and other.m)):
+                return _normalize(product, 0)
+        am, ae = _split(self)
+        bm, be = _split(other)
+        return _normalize(am * bm, ae + be)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        if not other.m:
+            raise ZeroDivisionError("BigNum division by zero")
+        if not self.e and not other.e:
+            quotient = self.m / other.m
+            if math.isfinite(quotient) and (abs(quotient) >= TINY or not self.m):
+                return _normalize(quotient, 0)
+        am, ae = _split(self)
+        bm, be = _split(other)
+        return _normalize(am / bm, ae - be)
+
+    def __rtruediv__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return other / self
+
+    def __pow__(self, power):
+        if isinstance(power, BigNum):
+            power = float(power)
+        if isinstance(power, float) and power.is_integer() and abs(power) <= 1 << 53:
+            power = int(power)
+        if not self.m:
+            if power > 0:
+                return _make(0.0, 0)
+            if power == 0:
+                return _make(1.0, 0)
+            raise ZeroDivisionError("0 cannot be raised to a negative power")
+        sign = 1.0
+        if self.m < 0:
+            if not isinstance(power, int):
+                raise ValueError("negative BigNum to a fractional power")
+            sign = -1.0 if power % 2 else 1.0
+        if not self.e:
+            try:
+                result = abs(self.m) ** power
+            except OverflowError:
+                result = math.inf
+            if math.isfinite(result) and result >= TINY:
+                return _normalize(sign * result, 0)
+        m, e = _split(abs(self))
+        # split off the integer part of e * power so the mantissa keeps its precision
+        scaled = e * power
+        if not math.isfinite(scaled):
+            raise OverflowError("BigNum exponent out of range")
+        whole = math.floor(scaled)
+        frac = scaled - whole + power * math.log10(m)
+        k = math.floor(frac)
+        return _normalize(sign * 10.0 ** (frac - k), whole + k)
+
+    def __rpow__(self, base):
+        base = _coerce(base)
+        if base is None:
+            return NotImplemented
+        return base ** float(self)
+
+    def __neg__(self):
+        return _make(-self.m, self.e)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return _make(abs(self.m), self.e)
+
+    def __bool__(self):
+        return self.m != 0
+
+    # ---- comparisons ----
+    def _cmp(self, other):
+        if (self.m > 0) != (other.m > 0) or not self.m or not other.m:
+            return (self.m > other.m) - (self.m < other.m)  # signs or zero decide
+        # big values have e >= FLOAT_DIGITS, tiny ones e < -FLOAT_DIGITS, plain floats e == 0
+        key, other_key = (self.e, abs(self.m)), (other.e, abs(other.m))
+        if self.m < 0:
+            key, other_key = other_key, key
+        return (key > other_key) - (key < other_key)
+
+    def __eq__(self, other):
+        other = _coerce(other)
+        if other is None:
+            return NotImplemented
+        return self.m == other.m and self.e == other.e
+
+    def __lt__(self, other):
+        other = _coerce(other)
+        return NotImplemented if other is None else self._cmp(other) < 0
+
+    def __le__(self, other):
+        other = _coerce(other)
+        return NotImplemented if other is None else self._cmp(other) <= 0
+
+    def __gt__(self, other):
+        other = _coerce(other)
+        return NotImplemented if other is None else self._cmp(other) > 0
+
+    def __ge__(self, other):
+        other = _coerce(other)
+        return NotImplemented if other is None else self._cmp(other) >= 0
+
+    def __hash__(self):
+        return hash(self.m) if not self.e else hash((self.m, self.e))
+
+    # ---- conversions ----
+    def __float__(self):
+        if not self.e:
+            return self.m
+        if self.e > 308:
+            return math.copysign(math.inf, self.m)
+        return _shift(self.m, self.e)
+
+    def __int__(self):
+        if self.e < FLOAT_DIGITS:
+            return int(float(self))
+        return int(self.m * 1e15) * 10 ** (self.e - 15)
+
+    def log10(self):
+        if self.m <= 0:
+            raise ValueError("math domain error")
+        return math.log10(self.m) + self.e
+
+    def log2(self):
+        return self.log10() / LOG10_2
+
+    def scale10(self, k):
+        """self * 10 ** k (exact when the result is stored normalized)."""
+        m, e = _split(self)
+        return _normalize(m, e + k) if m else self
+
+    def __str__(self):
+        if not self.e:
+            return repr(self.m)
+        return f"{self.m!r}e{self.e}"
+
+    def __repr__(self):
+        return f"BigNum('{self}')"
+
+    def __format__(self, spec):
+        if not spec:
+            return str(self)
+        if not self.e:
+            return format(self.m, spec)
+        kind = spec[-1] if spec[-1].isalpha() else "e"
+        body = spec[:-1] if spec[-1].isalpha() else spec
+        mark = "E" if kind in "EG" else "e"
+        return f"{format(self.m, body + 'f')}{mark}{self.e:+d}"
+
+    def __reduce__(self):
+        return (BigNum, (str(self),))
+
+
+def log10(value):
+    """log10 of an int, float or BigNum (ints of any size are fine)."""
+    if isinstance(value, BigNum):
+        return value.log10()
+    return math.log10(value)
+
+
+def scale10(value, k):
+    """value * 10 ** k as a float, for any int, float or BigNum value."""
+    return float(BigNum(value).scale10(k))
+
+
+def plain_floats(values):
+    """The values as floats, or None if any BigNum among them is not plain."""
+    floats = []
+    for x in values:
+        if isinstance(x, BigNum):
+            if x.e:
+                return None
+            x = x.m
+        floats.append(float(x))
+    return floats
+
+
+def from_plain_floats(values):
+    """BigNums equal to the floats, or None if any is outside the plain range."""
+    nums = []
+    for x in values:
+        if x and not TINY <= abs(x) < HUGE:  # also catches inf and nan
+            return None
+        nums.append(_make(x, 0))
+    return nums
+
+
+class BigArray:
+    """A vector of BigNums stored as mantissa and exponent arrays.
+
+    Vector methods return new arrays. pow() and maximum() assume
+    non-negative values, which is all the stat vectors ever hold.
+    """
+
+    def __init__(self, values=()):
+        nums = [BigNum(v) for v in values]
+        if np is None:
+            self._items = nums
+        else:
+            self.m = np.array([x.m for x in nums], dtype=float)
+            self.e = np.array([x.e for x in nums], dtype=float)
+
+    @classmethod
+    def zeros(cls, n):
+        arr = cls.__new__(cls)
+        if np is None:
+            arr._items = [_make(0.0, 0)] * n
+        else:
+            arr.m = np.zeros(n)
+            arr.e = np.zeros(n)
+        return arr
+
+    @classmethod
+    def _wrap(cls, m, e):
+        arr = cls.__new__(cls)
+        arr.m, arr.e = _np_normalize(m, e)
+        return arr
+
+    @classmethod
+    def _plain(cls, m):
+        arr = cls.__new__(cls)
+        arr.m, arr.e = m, np.zeros(len(m))
+        return arr
+
+    @classmethod
+    def _from_items(cls, items):
+        arr = cls.__new__(cls)
+        arr._items = items
+        return arr
+
+    def __len__(self):
+        return len(self._items) if np is None else len(self.m)
+
+    def __getitem__(self, i):
+        if np is None:
+            return self._items[i]
+        return _make(float(self.m[i]), int(self.e[i]))
+
+    def __setitem__(self, i, value):
+        value = BigNum(value)
+        if np is None:
+            self._items[i] = value
+        else:
+            self.m[i] = value.m
+            self.e[i] = value.e
+
+    def tolist(self):
+        return [self[i] for i in range(len(self))]
+
+    def take(self, indices):
+        if np is None:
+            return BigArray._from_items([self._items[i] for i in indices])
+        arr = BigArray.__new__(BigArray)
+        arr.m, arr.e = self.m[indices], self.e[indices]
+        return arr
+
+    def put(self, indices, values):
+        if np is None:
+            for i, v in zip(indices, values._items):
+                self._items[i] = v
+        else:
+            self.m[indices] = values.m
+            self.e[indices] = values.e
+
+    def _operand(self, other):
+        if isinstance(other, BigArray):
+            return other._items if np is None else (other.m, other.e)
+        other = BigNum(other)
+        return [other] * len(self) if np is None else (other.m, float(other.e))
+
+    def add(self, other):
+        if np is None:
+            return BigArray._from_items([a + b for a, b in zip(self._items, self._operand(other))])
+        om, oe = self._operand(other)
+        with np.errstate(all="ignore"):
+            plain = self.m + om
+            if _np_all_plain(plain, self.e, oe):
+                return BigArray._plain(plain)
+            fast = (self.e == 0) & (oe == 0) & np.isfinite(plain)
+            am, ae = _np_split(self.m, self.e)
+            bm, be = _np_split(om, oe)
+            mine = np.where(am == 0, be, ae)
+            theirs = np.where(bm == 0, mine, be)
+            top = np.maximum(mine, theirs)
+            m = (am * 10.0 ** np.maximum(mine - top, -400.0)
+                 + bm * 10.0 ** np.maximum(theirs - top, -400.0))
+        return BigArray._wrap(np.where(fast, plain, m), np.where(fast, 0.0, top))
+
+    def mul(self, other):
+        if np is None:
+            return BigArray._from_items([a * b for a, b in zip(self._items, self._operand(other))])
+        om, oe = self._operand(other)
+        with np.errstate(all="ignore"):
+            plain = self.m * om
+            if _np_all_plain(plain, self.e, oe) and (plain.all() or not (self.m.all() and np.all(om))):
+                return BigArray._plain(plain)
+            fast = ((self.e == 0) & (oe == 0) & np.isfinite(plain)
+                    & ((np.abs(plain) >= TINY) | (self.m == 0) | (om == 0)))
+            am, ae = _np_split(self.m, self.e)
+            bm, be = _np_split(om, oe)
+        return BigArray._wrap(np.where(fast, plain, am * bm), np.where(fast, 0.0, ae + be))
+
+    def pow(self, power):
+        """Elementwise self ** power for a scalar power > 0."""
+        if np is None:
+            return BigArray._from_items([a ** power for a in self._items])
+        with np.errstate(all="ignore"):
+            plain = self.m ** power
+            if _np_all_plain(plain, self.e, 0.0) and (plain.all() or not self.m.all()):
+                return BigArray._plain(plain)
+            fast = (self.e == 0) & np.isfinite(plain) & ((plain >= TINY) | (self.m == 0))
+            m, e = _np_split(self.m, self.e)
+            scaled = e * power
+            whole = np.floor(scaled)
+            frac = scaled - whole + power * np.log10(m)
+            zero = m == 0
+            frac = np.where(zero, 0.0, frac)
+            k = np.floor(frac)
+            big_m = np.where(zero, 0.0, 10.0 ** (frac - k))
+            big_e = np.where(zero, 0.0, whole + k)
+        if not np.isfinite(big_e[~fast]).all():
+            raise OverflowError("BigNum exponent out of range")
+        return BigArray._wrap(np.where(fast, plain, big_m), np.where(fast, 0.0, big_e))
+
+    def maximum(self, floor):
+        """Elementwise max(value, floor) for a non-negative floor."""
+        floor = BigNum(floor)
+        if np is None:
+            return BigArray._from_items([max(a, floor) for a in self._items])
+        arr = BigArray.__new__(BigArray)
+        if not floor.m:
+            arr.m, arr.e = self.m.copy(), self.e.copy()
+            return arr
+        below = (self.m == 0) | (self.e < floor.e) | ((self.e == floor.e) & (self.m < floor.m))
+        arr.m = np.where(below, floor.m, self.m)
+        arr.e = np.where(below, float(floor.e), self.e)
+        return arr
+
+    def log10(self):
+        """Elementwise log10 as floats (-inf for zeros); a NumPy array with NumPy."""
+        if np is None:
+            return [a.log10() if a.m else -math.inf for a in self._items]
+        with np.errstate(divide="ignore"):
+            return np.log10(self.m) + self.e
+
+    @classmethod
+    def from_log10(cls, logs):
+        """The positive BigNums 10 ** log (0 for -inf), as BigNum.from_log10."""
+        if np is None:
+            return cls._from_items([BigNum.from_log10(x) for x in logs])
+        logs = np.asarray(logs, dtype=float)
+        if np.isnan(logs).any() or (logs == math.inf).any():
+            raise OverflowError("BigNum exponent out of range")
+        zero = logs == -math.inf
+        e = np.where(zero, 0.0, np.floor(logs))
+        with np.errstate(invalid="ignore"):
+            m = np.where(zero, 0.0, 10.0 ** (logs - e))
+        return cls._wrap(m, e)
+
+    def sum(self):
+        if np is None:
+            total = _make(0.0, 0)
+            for a in self._items:
+                total = total + a
+            return total
+        if not self.e.any():
+            total = float(self.m.sum())
+            if math.isfinite(total):
+                return _normalize(total, 0)
+        m, e = _np_split(self.m, self.e)
+        nonzero = m != 0
+        if not nonzero.any():
+            return _make(0.0, 0)
+        top = e[nonzero].max()
+        with np.errstate(under="ignore"):
+            mant = float((m * 10.0 ** np.maximum(e - top, -400.0)).sum())
+        return _normalize(mant, int(top))
+
+
+def _np_all_plain(result, *exponents):
+    """True when every operand was a plain float and so is every result.
+
+    Zeros in result pass; the caller rules out products that underflowed.
+    """
+    if any(np.any(e) for e in exponents):
+        return False
+    size = np.abs(result)
+    return bool(((size < HUGE) & ((size >= TINY) | (size == 0))).all())
+
+
+def _np_shift(m, k):
+    half = np.floor(k / 2)
+    return m * 10.0 ** half * 10.0 ** (k - half)
+
+
+def _np_split(m, e):
+    """Vector _split: mantissas in [1, 10) and their decimal exponents."""
+    with np.errstate(all="ignore"):
+        plain = (e == 0) & (m != 0)
+        k = np.where(plain, np.floor(np.log10(np.abs(m))), 0.0)
+        sm = _np_shift(m, -k)
+        high = np.abs(sm) >= 10.0
+        low = (np.abs(sm) < 1.0) & (sm != 0)
+        sm = np.where(high, sm / 10.0, np.where(low, sm * 10.0, sm))
+        k = k + high - low
+    return sm, np.where(plain, k, e)
+
+
+def _np_normalize(m, e):
+    """Vector _normalize for finite m (any scale) and integral e."""
+    if not np.isfinite(m).all():
+        raise OverflowError("BigNum mantissa is not finite")
+    with np.errstate(all="ignore"):
+        zero = m == 0
+        k = np.where(zero, 0.0, np.floor(np.log10(np.abs(m))))
+        plain = np.where(e == 0, m, _np_shift(m, e))
+        dm = _np_shift(m, -k)
+        high = np.abs(dm) >= 10.0
+        low = (np.abs(dm) < 1.0) & ~zero
+        dm = np.where(high, dm / 10.0, np.where(low, dm * 10.0, dm))
+        digits = e + k + high - low
+        in_range = (digits >= -FLOAT_DIGITS) & (digits < FLOAT_DIGITS)
+    out_m = np.where(zero, 0.0, np.where(in_range, plain, dm))
+    out_e = np.where(zero | in_range, 0.0, digits)
+    return out_m, out_e
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Local asyncio game server running incremental-stats sessions on the Python engine.
+
+Every WebSocket connection is one player in a shared SessionPool ("copy"
+rules). The pool ticks once per TICK_INTERVAL and each client gets only
+what changed since its last update. A client over HIGH_WATER buffered
+bytes skips ticks; one over MAX_BUFFER is dropped.
+
+    python game_server.py                       # http://127.0.0.1:8765/
+    python game_server.py --load-test 2000      # spawn a server, connect 2000 clients
+
+Routes:
+    /              minimal client page for the pooled game
+    /ws            WebSocket; send {"cmd": "upgrade" | "unlock" | "challenge" | "complete"}
+    /stats         server counters as JSON
+    /<name>.html   the repo's HTML pages, served as-is
+
+Messages to the client are JSON objects:
+    {"tick": n, "meta": {...}, "stats": {"a": 1.2e5, ...}}   (meta/stats only if changed)
+    {"event": "...", "ok": true | false}                      (reply to a command)
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import struct
+import sys
+import time
+
+import numpy as np
+
+import perf
+import stat_labels
+from session_pool import SessionPool
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+TICK_INTERVAL = 1.0          # seconds, as one.html's setInterval(doTick, 1000)
+HIGH_WATER = 64 * 1024       # skip a client's update above this many buffered bytes
+MAX_BUFFER = 1024 * 1024     # drop a client above this many buffered bytes
+MAX_MESSAGE = 4096           # largest client message accepted
+MAX_HEADER = 8192
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+
+# ---- WebSocket framing ----
+def accept_key(key):
+    return base64.b64encode(hashlib.sha1(key.encode() + WS_GUID).digest()).decode()
+
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    """One final frame; clients must mask (mask=True), servers must not."""
+    head = bytearray([0x80 | opcode])
+    flag = 0x80 if mask else 0
+    n = len(payload)
+    if n < 126:
+        head.append(flag | n)
+    elif n < 1 << 16:
+        head.append(flag | 126)
+        head += struct.pack("!H", n)
+    else:
+        head.append(flag | 127)
+        head += struct.pack("!Q", n)
+    if mask:
+        key = os.urandom(4)
+        head += key
+        payload = _xor(payload, key)
+    return bytes(head) + payload
+
+
+def _xor(data, key):
+    n = len(data)
+    pad = key * (n // 4 + 1)
+    return (int.from_bytes(data, "big") ^ int.from_bytes(pad[:n], "big")).to_bytes(n, "big")
+
+
+async def read_frame(reader):
+    """Return (opcode, payload) of the next frame; raises ProtocolError on bad input."""
+    first, second = await reader.readexactly(2)
+    if not first & 0x80 or first & 0x0F == OP_CONT:
+        raise ProtocolError(1003, "fragmented messages are not supported")
+    n = second & 0x7F
+    if n == 126:
+        (n,) = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        (n,) = struct.unpack("!Q", await reader.readexactly(8))
+    if n > MAX_MESSAGE:
+        raise ProtocolError(1009, "message too big")
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(n)
+    if key:
+        payload = _xor(payload, key)
+    return first & 0x0F, payload
+
+
+class ProtocolError(Exception):
+    def __init__(self, code, reason):
+        super().__init__(reason)
+        self.code = code
+
+
+# ---- sessions ----
+class Session:
+    """One connected player: a pool slot plus the (7) state the pool does not hold."""
+
+    __slots__ = ("slot", "writer", "upgrade_price", "unlock_cost",
+                 "challenge_level", "challenge_active", "meta_dirty", "skipped")
+
+    def __init__(self, slot, writer):
+        self.slot = slot
+        self.writer = writer
+        self.upgrade_price = 100.0
+        self.unlock_cost = 100.0
+        self.challenge_level = 0
+        self.challenge_active = False
+        self.meta_dirty = True
+        self.skipped = 0  # consecutive updates held back by backpressure
+
+
+class GameServer:
+    """Sessions in one SessionPool, ticked together and pushed as diffs."""
+
+    def __init__(self, tick_interval=TICK_INTERVAL):
+        self.tick_interval = tick_interval
+        self.pool = SessionPool("copy")
+        self.sessions = {}  # slot -> Session
+        self.ticks = 0
+        self.counters = {"connections": 0, "messages": 0, "bytes": 0,
+                         "skipped": 0, "dropped": 0, "tick_ms": 0.0}
+        self._sent = np.full(self.pool.values.shape, np.nan)  # values each client last got
+        self._server = None
+        self._ticker = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self._handle, host, port,
+                                                  limit=MAX_HEADER, backlog=4096)
+        self._ticker = asyncio.ensure_future(self._tick_loop())
+        return self._server
+
+    async def close(self):
+        self._ticker.cancel()
+        self._server.close()
+        for session in list(self.sessions.values()):
+            session.writer.close()
+        await self._server.wait_closed()
+
+    # ---- ticking ----
+    async def _tick_loop(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.tick_interval
+            delay = next_tick - loop.time()
+            if delay < 0:  # fell behind: drop the missed ticks rather than bunching them
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+            started = time.perf_counter()
+            self.tick()
+            self.counters["tick_ms"] = (time.perf_counter() - started) * 1e3
+
+    def tick(self):
+        """Advance every session one tick and push the diffs."""
+        self.pool.tick()
+        self.ticks += 1
+        self.push()
+
+    def push(self):
+        sessions = list(self.sessions.values())
+        if not sessions:
+            return
+        self._fit_sent()
+        rows = np.fromiter((s.slot for s in sessions), dtype=np.intp, count=len(sessions))
+        values = self.pool.values[rows]
+        live = np.arange(values.shape[1]) < self.pool.unlocked[rows, None]
+        changed = live & (values != self._sent[rows])  # nan in _sent: never sent
+        dirty = changed.any(axis=1)
+        for i, session in enumerate(sessions):
+            if not dirty[i] and not session.meta_dirty:
+                continue
+            buffered = session.writer.transport.get_write_buffer_size()
+            if buffered > MAX_BUFFER:
+                self.counters["dropped"] += 1
+                session.writer.transport.abort()
+                continue
+            if buffered > HIGH_WATER:
+                session.skipped += 1
+                self.counters["skipped"] += 1
+                continue
+            message = {"tick": self.ticks}
+            if session.meta_dirty:
+                message["meta"] = self._meta(session)
+                session.meta_dirty = False
+            cols = np.flatnonzero(changed[i])
+            if len(cols):
+                row = values[i]
+                message["stats"] = {stat_labels.label(c + 1): _number(row[c]) for c in cols}
+                self._sent[session.slot, cols] = row[cols]
+            session.skipped = 0
+            self._send(session, message)
+
+    def _fit_sent(self):
+        # follow the pool's amortized growth; new cells have never been sent
+        shape = self.pool.values.shape
+        if self._sent.shape != shape:
+            grown = np.full(shape, np.nan)
+            rows, cols = self._sent.shape
+            grown[:rows, :cols] = self._sent[:shape[0], :shape[1]]
+            self._sent = grown
+
+    def _forget(self, session, start=0):
+        """Make stats from position start on count as unsent."""
+        self._fit_sent()
+        self._sent[session.slot, start:] = np.nan
+        session.meta_dirty = True
+
+    def _meta(self, session):
+        slot = session.slot
+        return {"unlocked": int(self.pool.unlocked[slot]),
+                "all_boost": _number(self.pool.all_boost[slot]),
+                "a_boost": _number(self.pool.a_boost[slot]),
+                "upgrade_price": _number(session.upgrade_price),
+                "unlock_cost": _number(session.unlock_cost),
+                "challenge_level": session.challenge_level,
+                "challenge_active": session.challenge_active}
+
+    def _send(self, session, message):
+        data = encode_frame(json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode())
+        session.writer.write(data)
+        self.counters["messages"] += 1
+        self.counters["bytes"] += len(data)
+
+    # ---- commands (same rules as incremental_stats_game (7).py) ----
+    def command(self, session, cmd):
+        """Apply one client command; returns (ok, event text)."""
+        pool, slot = self.pool, session.slot
+        if cmd == "upgrade":
+            if pool.values[slot, 0] < session.upgrade_price:
+                return False, "❌ Not enough 'a'!"
+            pool.values[slot, 0] -= session.upgrade_price
+            pool.all_boost[slot] *= 2
+            session.upgrade_price *= 10
+            self._forget(session, 0)
+            return True, "✅ Upgrade bought! All boost ×2."
+        if cmd == "unlock":
+            if pool.values[slot, 0] < session.unlock_cost:
+                return False, "❌ Not enough 'a' to unlock next stat!"
+            pool.values[slot, 0] -= session.unlock_cost
+            n = int(pool.unlocked[slot])
+            pool.unlock(slot)
+            session.unlock_cost *= 10
+            self._forget(session, 0)
+            return True, f"🔓 Unlocked new stat: {stat_labels.label(n + 1)}"
+        if cmd == "challenge":
+            if session.challenge_active:
+                return False, "⚠️ Already in a challenge!"
+            session.challenge_active = True
+            session.challenge_level += 1
+            pool.reset(slot)
+            session.upgrade_price = session.unlock_cost = 100.0
+            self._forget(session, 0)
+            return True, f"🏁 Challenge {session.challenge_level} started! Progress reset."
+        if cmd == "complete":
+            if not session.challenge_active:
+                return False, "❌ Not in a challenge."
+            reward = 1 + session.challenge_level * 0.5
+            pool.a_boost[slot] *= reward
+            session.challenge_active = False
+            session.meta_dirty = True
+            return True, f"🎉 Challenge {session.challenge_level} complete! a boost ×{reward:.2f}"
+        return False, f"unknown command {cmd!r}"
+
+    # ---- connections ----
+    async def _handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        path = parts[1].split("?")[0] if len(parts) >= 2 else ""
+        try:
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._websocket(reader, writer, headers)
+            else:
+                self._http(writer, parts[0] if parts else "", path)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _http(self, writer, method, path):
+        if method != "GET":
+            return _respond(writer, 405, "text/plain", b"method not allowed")
+        if path == "/":
+            return _respond(writer, 200, "text/html; charset=utf-8", CLIENT_PAGE.encode())
+        if path == "/stats":
+            body = dict(self.counters, sessions=len(self.sessions), ticks=self.ticks,
+                        perf=perf.snapshot())
+            return _respond(writer, 200, "application/json", json.dumps(body).encode())
+        name = path.lstrip("/")
+        if name.endswith(".html") and name in os.listdir(HERE):  # no paths outside the repo
+            with open(os.path.join(HERE, name), "rb") as f:
+                return _respond(writer, 200, "text/html; charset=utf-8", f.read())
+        return _respond(writer, 404, "text/plain", b"not found")
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            return _respond(writer, 400, "text/plain", b"missing Sec-WebSocket-Key")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode())
+        session = Session(self.pool.add(), writer)
+        self.sessions[session.slot] = session
+        self.counters["connections"] += 1
+        self._forget(session)
+        try:
+            while True:
+                try:
+                    opcode, payload = await read_frame(reader)
+                except ProtocolError as exc:
+                    writer.write(encode_frame(struct.pack("!H", exc.code) + str(exc).encode(), OP_CLOSE))
+                    break
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(payload[:2], OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+                elif opcode == OP_TEXT:
+                    self._message(session, payload)
+        finally:
+            del self.sessions[session.slot]
+            self.pool.remove(session.slot)
+
+    def _message(self, session, payload):
+        try:
+            cmd = json.loads(payload).get("cmd")
+        except (ValueError, AttributeError):
+            cmd = None
+        ok, event = self.command(session, cmd)
+        if session.writer.transport.get_write_buffer_size() <= MAX_BUFFER:
+            self._send(session, {"event": event, "ok": ok})
+
+
+def _number(x):
+    # JSON has no inf; sessions past the float range show as "inf"
+    x = float(x)
+    return x if math.isfinite(x) else "inf"
+
+
+def _respond(writer, status, content_type, body):
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}[status]
+    writer.write((f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                  f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode() + body)
+
+
+def _raise_fd_limit():
+    # thousands of sockets need more than the usual 1024 descriptors
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+perf.hook(GameServer, "tick", "server_tick")
+
+
+CLIENT_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Incremental Stats Game — server</title>
+<style>body{font-family:monospace;background:#111;color:#ddd}button{margin:2px}
+td{padding:0 8px}#log{color:#8c8}</style></head>
+<body><h3>Incremental Stats Game (server engine)</h3>
+<div><button data-cmd="upgrade">Upgrade</button><button data-cmd="unlock">Unlock</button>
+<button data-cmd="challenge">Start challenge</button><button data-cmd="complete">Complete challenge</button></div>
+<pre id="meta"></pre><table id="stats"></table><div id="log"></div>
+<script>
+const ws = new WebSocket(`ws://${location.host}/ws`);
+let order = [], stats = {}, meta = {};
+function fmt(x) { return typeof x === "number" ? (Math.abs(x) < 1e6 ? x.toFixed(2) : x.toExponential(3)) : x; }
+ws.onmessage = (e) => {
+  const m = JSON.parse(e.data);
+  if (m.event) { document.getElementById("log").textContent = m.event; return; }
+  if (m.meta) {
+    meta = m.meta;
+    for (const name of order.splice(meta.unlocked)) delete stats[name];
+    document.getElementById("meta").textContent =
+      `all boost ×${meta.all_boost}  a boost ×${meta.a_boost}\\n` +
+      `upgrade ${fmt(meta.upgrade_price)} a   unlock ${fmt(meta.unlock_cost)} a\\n` +
+      `challenge ${meta.challenge_active ? "active" : "none"} (level ${meta.challenge_level})`;
+  }
+  for (const [name, value] of Object.entries(m.stats || {})) {
+    if (!(name in stats)) order.push(name);
+    stats[name] = value;
+  }
+  document.getElementById("stats").innerHTML =
+    order.map((n) => `<tr><td>${n}</td><td>${fmt(stats[n])}</td></tr>`).join("");
+};
+ws.onclose = () => { document.getElementById("log").textContent = "disconnected"; };
+for (const b of document.querySelectorAll("button"))
+  b.onclick = () => ws.send(JSON.stringify({cmd: b.dataset.cmd}));
+</script></body></html>
+"""
+
+
+# ---- load test ----
+async def _load_client(host, port, deadline, totals, slow):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                  "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in head.split(b"\r\n")[0]:
+        raise ConnectionError(head.split(b"\r\n")[0].decode())
+    totals["connected"] += 1
+    loop = asyncio.get_running_loop()
+    next_cmd = loop.time() + random.uniform(0, 2)
+    try:
+        while loop.time() < deadline:
+            if slow:  # never read: the server has to hold back our updates
+                await asyncio.sleep(deadline - loop.time())
+                break
+            try:
+                opcode, payload = await asyncio.wait_for(read_frame(reader), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+            totals["messages"] += 1
+            totals["bytes"] += len(payload)
+            if loop.time() >= next_cmd:
+                cmd = random.choice(("upgrade", "unlock", "unlock"))
+                writer.write(encode_frame(json.dumps({"cmd": cmd}).encode(), mask=True))
+                next_cmd = loop.time() + 2
+    finally:
+        writer.close()
+
+
+async def _fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /stats HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+async def load_test(clients, seconds, host, port, tick, slow_share):
+    """Spawn a server process and hold `clients` connections to it for `seconds`."""
+    _raise_fd_limit()
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.abspath(__file__), "--host", host, "--port", str(port),
+        "--tick", str(tick))
+    try:
+        for _ in range(100):  # wait for it to listen
+            try:
+                await _fetch_stats(host, port)
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + seconds
+        totals = {"connected": 0, "messages": 0, "bytes": 0}
+        n_slow = int(clients * slow_share)
+        tasks = []
+        for i in range(clients):
+            tasks.append(asyncio.ensure_future(_load_client(host, port, deadline, totals, i < n_slow)))
+            if i % 100 == 99:
+                await asyncio.sleep(0)  # let the server keep up with the accepts
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failed = [r for r in results if isinstance(r, BaseException)]
+        stats = await _fetch_stats(host, port)
+    finally:
+        server.terminate()
+        await server.wait()
+    print(f"{totals['connected']}/{clients} clients connected ({n_slow} never read), "
+          f"{len(failed)} failed" + (f" (first: {failed[0]!r})" if failed else ""))
+    print(f"received {totals['messages']:,} messages, {totals['bytes']:,} bytes in {seconds:g} s "
+          f"({totals['messages'] / seconds:,.0f} msg/s)")
+    print(f"server: {stats['ticks']} ticks, {stats['messages']:,} messages sent, "
+          f"last tick {stats['tick_ms']:.1f} ms, "
+          f"{stats['skipped']} updates held back, {stats['dropped']} clients dropped")
+    return not failed
+
+
+async def serve(host, port, tick):
+    _raise_fd_limit()
+    server = GameServer(tick)
+    await server.start(host, port)
+    print(f"serving on http://{host}:{port}/ (tick every {tick:g} s)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve pooled game sessions over WebSocket.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL, help="seconds per server tick")
+    parser.add_argument("--load-test", type=int, metavar="CLIENTS",
+                        help="spawn a server and connect this many clients to it")
+    parser.add_argument("--seconds", type=float, default=10, help="load test duration")
+    parser.add_argument("--slow", type=float, default=0.05,
+                        help="share of load-test clients that never read (default 0.05)")
+    args = parser.parse_args()
+    try:
+        if args.load_test:
+            ok = asyncio.run(load_test(args.load_test, args.seconds, args.host, args.port,
+                                       args.tick, args.slow))
+            raise SystemExit(0 if ok else 1)
+        asyncio.run(serve(args.host, args.port, args.tick))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
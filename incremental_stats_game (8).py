@@ -2,40 +2,31 @@
 # Incremental Stats Game 🧮
 # Auto-generating lower stats from higher stats and base a generation
 
-import math
+import perf
+import stat_labels
+import stat_tick
+from bignum import BigNum, log10, scale10
+from triggers import Triggers
 
 class Game:
     def __init__(self):
-        self.stats = {"a": 1.0}
+        self.stats = {"a": BigNum(1.0)}
         self.unlocked = ["a"]
         self.all_boost = 1
         self.a_boost = 1
-        self.upgrade_price = 100
-        self.unlock_cost = 100
+        self.upgrade_price = BigNum(100)
+        self.unlock_cost = BigNum(100)
         self.challenge_level = 0
         self.challenge_active = False
+        # "upgrade"/"unlock" fire once 'a' can pay for them; main() reports them
+        self.triggers = Triggers()
+        self._arm_triggers()
 
     def tick(self):
-        new_stats = self.stats.copy()
-        n = len(self.unlocked)
-        for i in range(n):
-            lower_stat = self.unlocked[i]
-            # Base automatic a generation: 10 a per tick
-            if lower_stat == "a":
-                new_stats["a"] += 10 *3 self.all_boost * self.a_boost
-            for j in range(i+1, n):
-                higher_stat = self.unlocked[j]
-                distance = j - i
-                higher_amount = self.stats[higher_stat]
-                lower_amount = self.stats[lower_stat]
-                if 1 <= distance <= 5:
-                    new_stats[lower_stat] += higher_amount * (5 * distance)
-                else:
-                    exp = distance - 5
-                    if exp > 10:
-                        exp = 10 + math.log10(exp)
-                    new_stats[lower_stat] += lower_amount**exp
-        self.stats = new_stats
+        values = [self.stats[s] for s in self.unlocked]
+        # base a generation and the near/far terms live in stat_tick
+        new = stat_tick.tick_copy(values, self.all_boost, self.a_boost, base_a=10 * 3)
+        self.stats.update(zip(self.unlocked, new))
         return self.stats["a"]
 
     def buy_upgrade(self):
@@ -43,6 +34,8 @@ class Game:
             self.stats["a"] -= self.upgrade_price
             self.all_boost *= 2
             self.upgrade_price *= 10
+            self.triggers.set("upgrade", "a", self.upgrade_price)
+            self.triggers.rearm("a", self.stats["a"])
             print("✅ Upgrade bought! All boost ×2.")
         else:
             print("❌ Not enough 'a'!")
@@ -52,24 +45,17 @@ class Game:
             self.stats["a"] -= self.unlock_cost
             next_stat = self._next_stat_name(self.unlocked[-1])
             self.unlocked.append(next_stat)
-            self.stats[next_stat] = 0.0
+            self.stats[next_stat] = BigNum(0.0)
             self.unlock_cost *= 10
+            self.triggers.set("unlock", "a", self.unlock_cost)
+            self.triggers.rearm("a", self.stats["a"])
             print(f"🔓 Unlocked new stat: {next_stat}")
         else:
             print("❌ Not enough 'a' to unlock next stat!")
 
     def _next_stat_name(self, name):
-        alphabet = [chr(i) for i in range(97, 123)] + [chr(i) for i in range(65, 91)]
-        if name not in alphabet:
-            prefix, last = name[:-1], name[-1]
-            if last == "Z":
-                return prefix + "a"
-            else:
-                return prefix + alphabet[alphabet.index(last) + 1]
-        else:
-            if name == "Z":
-                return "aa"
-            return alphabet[alphabet.index(name) + 1]
+        # a..z, A..Z, aa..aZ, ba.. via the shared label index
+        return stat_labels.next_label(name)
 
     def start_challenge(self):
         if self.challenge_active:
@@ -90,16 +76,25 @@ class Game:
         print(f"🎉 Challenge {self.challenge_level} complete! a boost ×{reward:.2f}")
 
     def _reset_progress(self):
-        self.stats = {"a": 1.0}
+        self.stats = {"a": BigNum(1.0)}
         self.unlocked = ["a"]
         self.all_boost = 1
         self.a_boost = 1
-        self.upgrade_price = 100
-        self.unlock_cost = 100
+        self.upgrade_price = BigNum(100)
+        self.unlock_cost = BigNum(100)
+        self._arm_triggers()
+
+    def _arm_triggers(self):
+        self.triggers.set("upgrade", "a", self.upgrade_price)
+        self.triggers.set("unlock", "a", self.unlock_cost)
+
+    def affordable(self):
+        """Names of the purchases that became affordable since the last call."""
+        return self.triggers.check(self.stats.__getitem__)
 
     def show(self):
         print("\n📊 --- STATUS ---")
-        print(f"Stats: {self.stats}")
+        print(f"Stats: { {k: self._format(v) for k, v in self.stats.items()} }")
         print(f"Unlocked: {self.unlocked}")
         print(f"All boost: ×{self.all_boost}")
         print(f"A boost: ×{self.a_boost}")
@@ -112,20 +107,26 @@ class Game:
         suffixes = ["", "K", "M", "B", "T", "Qd", "Qn", "Sx", "Sp", "Oc", "No", "De"]
         if n < 1000:
             return f"{n:.2f}"
-        exp = int(math.log10(n) // 3)
-        exp = min(exp, len(suffixes) - 1)
-        return f"{n / (10 ** (3 * exp)):.2f}{suffixes[exp]}"
+        exp = int(log10(n) // 3)
+        if exp >= len(suffixes):
+            return f"{n:.2e}"
+        return f"{scale10(n, -3 * exp):.2f}{suffixes[exp]}"
+
+perf.hook_tick(Game)
 
 def main():
     game = Game()
     print("🎮 Welcome to Incremental Stats Game!")
-    print("Commands: tick / upgrade / unlock / challenge / complete / show / exit")
+    print("Commands: tick / upgrade / unlock / challenge / complete / show / perf / exit")
 
     while True:
-        cmd = input("> ").strip().lower()
+        line = input("> ").strip()
+        cmd = line.lower()
         if cmd == "tick":
             a = game.tick()
             print(f"Tick... a = {game._format(a)}")
+            for name in game.affordable():
+                print(f"💡 You can afford the next {name} now.")
         elif cmd == "upgrade":
             game.buy_upgrade()
         elif cmd == "unlock":
@@ -136,11 +137,14 @@ def main():
             game.complete_challenge()
         elif cmd == "show":
             game.show()
+        elif cmd.split()[:1] == ["perf"]:
+            print(perf.command(line.split()[1:]))
         elif cmd == "exit":
             print("👋 Goodbye!")
             break
         else:
             print("❓ Unknown command!")
+        perf.maybe_stream()
 
 if __name__ == "__main__":
     main()
@@ -2,46 +2,78 @@
 # Incremental Stats Game v3 🧮 GUI Edition
 # Click buttons instead of typing commands
 
-import math
+import json
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
 
+import offline
+import perf
+import stat_labels
+import stat_tick
+from autosave import write_json_atomic
+from bignum import BigNum, log10, scale10
+
+SAVE_FILE = "stats_save.json"  # saved on close; time away is caught up on load
+
 class Game:
     def __init__(self):
-        self.stats = {"a": 10.0}
+        self.stats = {"a": BigNum(10.0)}
         self.unlocked = ["a"]
         self.all_boost = 1
         self.a_boost = 1
-        self.upgrade_price = 100
-        self.unlock_cost = 100
+        self.upgrade_price = BigNum(100)
+        self.unlock_cost = BigNum(100)
         self.challenge_level = 0
         self.challenge_active = False
 
     def tick(self):
-        gains = {k: 0 for k in self.stats}
-        for s in self.unlocked:
-            gains[s] += max(1, self.stats[s] * 0.05)
-
-        for i, lower in enumerate(self.unlocked):
-            for j in range(i+1, len(self.unlocked)):
-                higher = self.unlocked[j]
-                distance = j - i
-                h_val = self.stats[higher]
-
-                if 1 <= distance <= 5:
-                    gains[lower] += h_val * (5 * distance) * self.all_boost
-                else:
-                    exp = distance - 5
-                    if exp > 10:
-                        exp = 10 + math.log10(exp)
-                    gains[lower] += h_val * (self.stats[lower] ** exp) * self.all_boost
-
-        for s in self.stats:
-            self.stats[s] += gains[s]
-
-        self.stats["a"] *= 3 * self.a_boost
+        values = [self.stats[s] for s in self.unlocked]
+        new = stat_tick.tick_gains(values, self.all_boost, self.a_boost)
+        self.stats.update(zip(self.unlocked, new))
         return self.stats["a"]
 
+    def advance(self, ticks):
+        """Apply many ticks at once (see offline.py); returns how many were applied."""
+        values = [self.stats[s] for s in self.unlocked]
+        new, done = offline.advance_gains(values, self.all_boost, self.a_boost, ticks)
+        self.stats.update(zip(self.unlocked, new))
+        return done
+
+    # ---- persistence (BigNums as strings, which round-trip exactly) ----
+    def to_dict(self):
+        return {
+            "stats": {k: str(v) for k, v in self.stats.items()},
+            "unlocked": list(self.unlocked),
+            "all_boost": self.all_boost,
+            "a_boost": self.a_boost,
+            "upgrade_price": str(self.upgrade_price),
+            "unlock_cost": str(self.unlock_cost),
+            "challenge_level": self.challenge_level,
+            "challenge_active": self.challenge_active,
+            "saved_at": time.time(),
+        }
+
+    @classmethod
+    def from_dict(cls, data, now=None):
+        """Rebuild a saved game and catch up on the ticks missed since it was saved.
+
+        Returns (game, ticks applied for the time away).
+        """
+        game = cls()
+        game.stats = {k: BigNum(v) for k, v in data["stats"].items()}
+        game.unlocked = list(data["unlocked"])
+        game.all_boost = data["all_boost"]
+        game.a_boost = data["a_boost"]
+        game.upgrade_price = BigNum(data["upgrade_price"])
+        game.unlock_cost = BigNum(data["unlock_cost"])
+        game.challenge_level = data["challenge_level"]
+        game.challenge_active = data["challenge_active"]
+        now = time.time() if now is None else now
+        away = int((now - data.get("saved_at", now)) // offline.TICK_SECONDS)
+        return game, game.advance(away) if away > 0 else 0
+
     def buy_upgrade(self):
         if self.stats["a"] >= self.upgrade_price:
             self.stats["a"] -= self.upgrade_price
@@ -55,18 +87,14 @@ class Game:
             self.stats["a"] -= self.unlock_cost
             next_stat = self._next_stat_name(self.unlocked[-1])
             self.unlocked.append(next_stat)
-            self.stats[next_stat] = 10.0
+            self.stats[next_stat] = BigNum(10.0)
             self.unlock_cost *= 10
             return f"🔓 Unlocked new stat: {next_stat} (auto-generating now!)"
         return f"❌ Need {self._format(self.unlock_cost)} a to unlock next stat!"
 
     def _next_stat_name(self, name):
-        alphabet = [chr(i) for i in range(97,123)] + [chr(i) for i in range(65,91)]
-        if name not in alphabet:
-            prefix, last = name[:-1], name[-1]
-            if last == "Z": return prefix + "a"
-            return prefix + alphabet[alphabet.index(last)+1]
-        return "aa" if name=="Z" else alphabet[alphabet.index(name)+1]
+        # a..z, A..Z, aa..aZ, ba.. via the shared label index
+        return stat_labels.next_label(name)
 
     def start_challenge(self):
         if self.challenge_active:
@@ -85,19 +113,21 @@ class Game:
         return f"🎉 Challenge {self.challenge_level} complete! 'a' boost ×{reward:.2f}"
 
     def _reset_progress(self):
-        self.stats = {"a": 10.0}
+        self.stats = {"a": BigNum(10.0)}
         self.unlocked = ["a"]
         self.all_boost = 1
         self.a_boost = 1
-        self.upgrade_price = 100
-        self.unlock_cost = 100
+        self.upgrade_price = BigNum(100)
+        self.unlock_cost = BigNum(100)
 
     def _format(self, n):
         suffixes = ["","K","M","B","T","Qd","Qn","Sx","Sp","Oc","No","De"]
         if n < 1000: return f"{n:.2f}"
-        exp = int(math.log10(n)//3)
-        exp = min(exp, len(suffixes)-1)
-        return f"{n/(10**(3*exp)):.2f}{suffixes[exp]}"
+        exp = int(log10(n)//3)
+        if exp >= len(suffixes): return f"{n:.2e}"
+        return f"{scale10(n, -3*exp):.2f}{suffixes[exp]}"
+
+perf.hook_tick(Game)
 
 class GameApp:
     def __init__(self, root):
@@ -105,7 +135,7 @@ class GameApp:
         self.root.title("Incremental Stats Game v3 🧮")
         self.root.geometry("420x420")
         self.root.resizable(False, False)
-        self.game = Game()
+        self.game, away = load_game(SAVE_FILE)
 
         # Info panel
         self.info = tk.Label(root, text="", justify="left", font=("Consolas", 11))
@@ -116,4 +146,74 @@ class GameApp:
         btn_frame.pack(pady=5)
         ttk.Button(btn_frame, text="Tick", command=self.tick).grid(row=0, column=0, padx=5)
         ttk.Button(btn_frame, text="Upgrade", command=self.upgrade).grid(row=0, column=1, padx=5)
-        ttk.Button(btn_frame, text="Unlock", command=self.unlock).grid(row=_
+        ttk.Button(btn_frame, text="Unlock", command=self.unlock).grid(row=0, column=2, padx=5)
+        ttk.Button(btn_frame, text="Challenge", command=self.challenge).grid(row=1, column=0, padx=5, pady=5)
+        ttk.Button(btn_frame, text="Complete", command=self.complete).grid(row=1, column=1, padx=5, pady=5)
+        self.auto_button = ttk.Button(btn_frame, text="Auto Tick", command=self.toggle_auto)
+        self.auto_button.grid(row=1, column=2, padx=5, pady=5)
+
+        # Message line
+        self.message = tk.Label(root, text="", wraplength=400, font=("Arial", 10))
+        self.message.pack(pady=5)
+
+        self.auto = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        if away:
+            self.message.config(text=f"👋 Welcome back! {away:,} ticks of offline progress applied.")
+        self.update_info()
+
+    def tick(self):
+        self.game.tick()
+        self.update_info()
+
+    def upgrade(self):
+        self.show(self.game.buy_upgrade())
+
+    def unlock(self):
+        self.show(self.game.unlock_next())
+
+    def challenge(self):
+        self.show(self.game.start_challenge())
+
+    def complete(self):
+        self.show(self.game.complete_challenge())
+
+    def toggle_auto(self):
+        self.auto = not self.auto
+        self.auto_button.config(text="Stop Auto" if self.auto else "Auto Tick")
+        if self.auto:
+            self._auto_tick()
+
+    def _auto_tick(self):
+        if self.auto:
+            self.tick()
+            self.root.after(int(offline.TICK_SECONDS * 1000), self._auto_tick)
+
+    def show(self, message):
+        self.message.config(text=message)
+        self.update_info()
+
+    def update_info(self):
+        g = self.game
+        lines = [f"{s}: {g._format(g.stats[s])}" for s in g.unlocked[-8:]]
+        lines.append(f"All boost: ×{g.all_boost}   a boost: ×{g.a_boost:.2f}")
+        lines.append(f"Upgrade: {g._format(g.upgrade_price)} a   Unlock: {g._format(g.unlock_cost)} a")
+        if g.challenge_active:
+            lines.append(f"Challenge {g.challenge_level} in progress")
+        self.info.config(text="\n".join(lines))
+
+    def on_close(self):
+        write_json_atomic(SAVE_FILE, self.game.to_dict())
+        self.root.destroy()
+
+def load_game(path, now=None):
+    """The saved game at path caught up to now, and the ticks that took (a new game if none)."""
+    if not os.path.exists(path):
+        return Game(), 0
+    with open(path) as f:
+        return Game.from_dict(json.load(f), now)
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    GameApp(root)
+    root.mainloop()
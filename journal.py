@@ -0,0 +1,115 @@
+"""
+Append-only command journal with snapshot compaction.
+
+Each state-changing command appends one 21-byte record:
+
+    seq (uint64) | op (uint8) | arg (int64) | crc32 of the first 17 bytes
+
+arg must be in ARG_RANGE. Every compact_every records the caller writes a
+snapshot (state plus last seq) and the journal is truncated. load() reads
+the snapshot, replays later records and drops a torn last record.
+"""
+
+import json
+import os
+import struct
+import zlib
+
+import perf
+from autosave import write_json_atomic
+
+RECORD = struct.Struct("<QBq")  # seq, op, arg
+ARG_RANGE = range(-2**63, 2**63)  # args a record can hold (int64)
+CRC = struct.Struct("<I")
+RECORD_SIZE = RECORD.size + CRC.size
+COMPACT_EVERY = 1000
+SEQ_KEY = "journal_seq"  # snapshot key holding the last seq it includes
+
+
+class Journal:
+    """Snapshot file at path plus a record journal at path + ".journal".
+
+    sync=True fsyncs after every record, which also survives power loss.
+    By default records reach the OS at once but are not fsynced.
+    """
+
+    def __init__(self, path, compact_every=COMPACT_EVERY, sync=False):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.sync = sync
+        self.seq = 0  # seq of the last record written or replayed
+        self.pending = 0  # records since the last snapshot
+        self._fd = None
+
+    def load(self):
+        """Return (snapshot dict or None, [(op, arg), ...] to replay on top).
+
+        Also opens the journal for appending after the last good record.
+        """
+        snapshot = None
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        self.seq = snapshot.get(SEQ_KEY, 0) if snapshot else 0
+        records = []
+        good = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+            for start in range(0, len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+                body = data[start:start + RECORD.size]
+                (crc,) = CRC.unpack_from(data, start + RECORD.size)
+                if zlib.crc32(body) != crc:
+                    break  # torn or corrupt record: everything after it is suspect
+                seq, op, arg = RECORD.unpack(body)
+                good = start + RECORD_SIZE
+                if seq <= self.seq:
+                    continue  # already in the snapshot
+                records.append((op, arg))
+                self.seq = seq
+        self._open(truncate_to=good)
+        self.pending = len(records)
+        return snapshot, records
+
+    def append(self, op, arg=0):
+        """Record one command; O(1) whatever the size of the state."""
+        if self._fd is None:
+            self._open()
+        body = RECORD.pack(self.seq + 1, op, arg)  # struct.error for an arg outside ARG_RANGE
+        self.seq += 1
+        os.write(self._fd, body + CRC.pack(zlib.crc32(body)))
+        if self.sync:
+            os.fsync(self._fd)
+        if perf.enabled:
+            perf.count("save_bytes", RECORD_SIZE)
+        self.pending += 1
+
+    @property
+    def needs_snapshot(self):
+        return self.pending >= self.compact_every
+
+    def snapshot(self, data):
+        """Write data (a state dict) as the snapshot and empty the journal."""
+        data = dict(data)
+        data[SEQ_KEY] = self.seq
+        write_json_atomic(self.path, data)
+        if self._fd is None:
+            self._open()
+        os.ftruncate(self._fd, 0)
+        self.pending = 0
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _open(self, truncate_to=None):
+        self.close()
+        self._fd = os.open(self.journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        if truncate_to is not None:
+            os.ftruncate(self._fd, truncate_to)
+
+
+perf.hook(Journal, "append", "journal")
+perf.hook(Journal, "snapshot", "save")
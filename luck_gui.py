@@ -0,0 +1,158 @@
+"""
+Tkinter front-end shared by the luck simulators.
+
+luckysimu.py, luckiestsim.py, luck100.py and luck101.py each subclass
+LuckApp with their table: the engine, save key, reset keys, number
+format and label texts. Rolling, auto-roll, rendering and saving live here.
+"""
+
+import tkinter as tk
+from tkinter import messagebox
+
+from autoroll import AutoRoller
+from autosave import SaveScheduler
+from profile_store import DEFAULT_PROFILE, ProfileStore
+from render import PerfOverlay, RenderScheduler
+from roll_recorder import recorder_from_env
+
+SAVE_INTERVAL = 2.0  # seconds between background saves
+RENDER_FPS = 30      # label refreshes per second, at most
+
+
+class LuckApp:
+    """Tkinter front-end; all game rules live in the SIM engine."""
+
+    SIM = None           # lucksim engine class
+    VARIANT = None       # key of this simulator's saves in the profile store
+    LEGACY_SAVE = None   # old JSON save, imported once
+    TITLE = "Luck Simulator"
+    RESET_KEYS = ()      # (key, layer, action) rows, lowest layer first
+    LABELS = 1           # number of stat labels stat_texts() fills
+    LABELS_ABOVE = True  # stat labels above the roll buttons, else below
+    FONT = None          # font of the labels and buttons (None: Tk default)
+    HINTS = False        # explain failed resets and bad input in a message box
+
+    def __init__(self, root, sim, saver):
+        self.root = root
+        self.sim = sim
+        self.saver = saver
+        self.root.title(self.TITLE)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        font = {"font": self.FONT} if self.FONT else {}
+
+        self.stat_labels = [tk.Label(root, text="", **font) for _ in range(self.LABELS)]
+        if self.LABELS_ABOVE:
+            for label in self.stat_labels:
+                label.pack()
+
+        tk.Button(root, text="Roll", command=self.roll, **font).pack(pady=10)
+
+        bulk_frame = tk.Frame(root)
+        bulk_frame.pack()
+        self.roll_count = tk.StringVar(value="1000")
+        tk.Entry(bulk_frame, textvariable=self.roll_count, width=12).pack(side=tk.LEFT)
+        tk.Button(bulk_frame, text="Roll \u00d7N", command=self.roll_n,
+                  **font).pack(side=tk.LEFT, padx=5)
+
+        auto_frame = tk.Frame(root)
+        auto_frame.pack()
+        self.auto_rate = tk.StringVar(value="max")  # rolls per second, or max
+        tk.Entry(auto_frame, textvariable=self.auto_rate, width=12).pack(side=tk.LEFT)
+        self.auto_button = tk.Button(auto_frame, text="Auto Roll", command=self.toggle_auto, **font)
+        self.auto_button.pack(side=tk.LEFT, padx=5)
+        self.auto_label = tk.Label(auto_frame, text="")
+        self.auto_label.pack(side=tk.LEFT)
+        self.auto = AutoRoller(root, self.sim.roll_n, self.changed)
+
+        if not self.LABELS_ABOVE:
+            for label in self.stat_labels:
+                label.pack(pady=10)
+
+        for key, layer, action in self.RESET_KEYS:
+            root.bind(key, lambda e, layer=layer, action=action: self.reset(layer, action))
+
+        self.perf_label = tk.Label(root, text="", font=("Courier", 10), justify=tk.LEFT)
+        self.perf_overlay = PerfOverlay(root, self.perf_label)
+        root.bind("p", self.perf_overlay.toggle)  # perf overlay
+
+        self.renderer = RenderScheduler(root, self.label_texts, RENDER_FPS)
+        self.renderer.mark_dirty()
+
+    @staticmethod
+    def format_number(n):
+        return f"{n:,}"
+
+    def stat_texts(self):
+        """Texts of the LABELS stat labels."""
+        raise NotImplementedError
+
+    def hint(self, title, message):
+        if self.HINTS:
+            messagebox.showinfo(title, message)
+
+    def roll(self):
+        self.sim.roll()
+        self.changed()
+
+    def roll_n(self):
+        try:
+            n = int(self.roll_count.get())
+        except ValueError:
+            self.hint("Roll \u00d7N", "Enter a whole number of rolls.")
+            return
+        self.sim.roll_n(n)
+        self.changed()
+
+    def reset(self, layer, action):
+        if self.sim.reset(layer):
+            self.changed()
+        else:
+            threshold = self.sim.LADDER[self.sim.LAYERS.index(layer)].threshold
+            self.hint(action, f"Reach rarity {threshold} to {action}.")
+
+    def toggle_auto(self):
+        rate = self.auto_rate.get().strip().lower()
+        try:
+            self.auto.rate = 0 if rate in ("", "max") else float(rate)
+        except ValueError:
+            self.hint("Auto Roll", "Enter rolls per second, or max.")
+            return
+        self.auto.toggle()
+        self.renderer.mark_dirty()
+
+    def changed(self):
+        self.renderer.mark_dirty()
+        self.saver.mark_dirty()
+
+    def on_close(self):
+        self.perf_overlay.close()
+        self.auto.stop()
+        self.renderer.close()
+        self.saver.close()
+        self.root.destroy()
+
+    def label_texts(self):
+        running = self.auto.running
+        rate = f"{self.format_number(int(self.auto.rolls_per_sec))} rolls/s" if running else ""
+        return list(zip(self.stat_labels, self.stat_texts())) + [
+            (self.auto_button, "Stop Auto" if running else "Auto Roll"),
+            (self.auto_label, rate),
+        ]
+
+
+def main(app_class):
+    """Load app_class's save, run its window, and save again on close."""
+    sim = app_class.SIM()
+    sim.recorder = recorder_from_env(app_class.VARIANT)
+    store = ProfileStore()
+    data = store.load_or_import(DEFAULT_PROFILE, app_class.VARIANT, app_class.LEGACY_SAVE)
+    if data:
+        sim.load(data)
+    saver = SaveScheduler(sim.to_dict, store.writer(DEFAULT_PROFILE, app_class.VARIANT), SAVE_INTERVAL)
+    root = tk.Tk()
+    app_class(root, sim, saver)
+    root.mainloop()
+    saver.close()
+    store.close()
+    if sim.recorder is not None:
+        sim.recorder.close()
@@ -0,0 +1,442 @@
+"""
+Headless engines for the luck simulators.
+
+One class per tkinter script (luckysimu.py, luckiestsim.py, luck100.py,
+luck101.py) holds a player's state and applies that script's rules
+without tkinter or files, for the GUIs, batch jobs and tests.
+
+The prestige layers are rows of LADDER (Layer). Derived values (luck,
+rarity table, reset previews) are cached in state.derived and dropped when
+a key they depend on is written.
+
+sim.recorder (a roll_recorder.RollRecorder) sees every roll; roll_n then
+samples at most RECORD_CHUNK rolls at a time.
+
+    sim = LuckiestSim(rng=random.Random(1))
+    sim.roll()
+    sim.reset("LP")
+"""
+
+import math
+import random
+from collections import namedtuple
+
+import perf
+from bignum import FLOAT_DIGITS, BigNum
+from rarity import rarity_table, roll_many as roll_many_at, threshold_rarity
+
+
+LUCK_DERIVED = ("luck", "table", "threshold")  # all computed from calc_luck
+RECORD_CHUNK = 1 << 16  # rolls roll_n samples at once while recording
+
+# One prestige layer. A reset needs best_rarity >= threshold and gains
+# (best_rarity - offset) // divisor points. It zeroes the `clears` layers
+# right below it (None: every lower layer) and puts best_rarity back to the
+# variant's BASE_BEST. boost(points) is the layer's luck multiplier; how it
+# is applied is up to the variant (None if _calc_luck has its own formula).
+Layer = namedtuple("Layer", "name threshold divisor offset clears boost",
+                   defaults=(0, None, None))
+
+
+class LuckState(dict):
+    """State dict that drops cached derived values when their inputs change.
+
+    depends maps a state key to the names in derived computed from it.
+    Bulk updates (update, pop, ...) drop everything.
+    """
+
+    def __init__(self, data, depends):
+        super().__init__(data)
+        self.depends = depends
+        self.derived = {}
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        for name in self.depends.get(key, ()):
+            self.derived.pop(name, None)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.derived.clear()
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self.derived.clear()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        self.derived.clear()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self.derived.clear()
+        return dict.popitem(self)
+
+    def clear(self):
+        dict.clear(self)
+        self.derived.clear()
+
+    def __reduce__(self):
+        # rebuild with depends set before any items go in (pickle, deepcopy)
+        return LuckState, (dict(self), self.depends)
+
+
+class LuckSim:
+    """Base engine; subclasses supply the rules of one simulator."""
+
+    # Layer rows in reset order, lowest first; names match the state keys
+    LADDER = ()
+    BASE_BEST = 0  # best_rarity after any reset
+    DEFAULT_STATE = {}
+    # state keys _calc_luck reads; writing one drops the cached luck
+    # (default: the layer names)
+    LUCK_INPUTS = ()
+    RANDOM_ROLLS = False  # True if roll_rarity draws from rng
+    recorder = None  # a roll_recorder.RollRecorder to see every roll
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ladder = cls.LADDER
+        cls.LAYERS = tuple(layer.name for layer in ladder)
+        if "LUCK_INPUTS" not in cls.__dict__:
+            cls.LUCK_INPUTS = cls.LAYERS
+        cls._LAYER_INDEX = {name: i for i, name in enumerate(cls.LAYERS)}
+        cls._GAINS = tuple((layer.threshold, layer.offset, layer.divisor) for layer in ladder)
+        # what a reset of layer i writes besides its own points, as one update
+        resets = []
+        for i, layer in enumerate(ladder):
+            below = cls.LAYERS[:i] if layer.clears is None else cls.LAYERS[max(0, i - layer.clears):i]
+            resets.append({**dict.fromkeys(below, 0), "best_rarity": cls.BASE_BEST})
+        cls._RESETS = tuple(resets)
+
+    def __init__(self, state=None, rng=None):
+        depends = dict.fromkeys(self.LUCK_INPUTS, LUCK_DERIVED)
+        depends["best_rarity"] = ("preview",)
+        self.state = LuckState(self.DEFAULT_STATE, depends)
+        self.rng = rng or random.Random()
+        if state:
+            self.load(state)
+
+    # ---- persistence (data only; the caller does the I/O) ----
+    def load(self, data):
+        self.state.update(data)
+
+    def to_dict(self):
+        return dict(self.state)
+
+    # ---- derived values, cached until an input changes ----
+    def calc_luck(self):
+        """Effective luck."""
+        derived = self.state.derived
+        if "luck" not in derived:
+            derived["luck"] = self._calc_luck()
+        return derived["luck"]
+
+    def table(self):
+        """RarityTable at the current luck."""
+        derived = self.state.derived
+        if "table" not in derived:
+            derived["table"] = rarity_table(self.calc_luck())
+        return derived["table"]
+
+    def threshold(self):
+        """First rarity whose chance luck / 2**(r - 1) is below 1."""
+        derived = self.state.derived
+        if "threshold" not in derived:
+            derived["threshold"] = threshold_rarity(self.calc_luck())
+        return derived["threshold"]
+
+    def preview(self):
+        """Gain for each layer in LAYERS if that reset were done now."""
+        derived = self.state.derived
+        if "preview" not in derived:
+            derived["preview"] = self._preview()
+        return derived["preview"]
+
+    # ---- rules ----
+    def _calc_luck(self):
+        """Product of every layer's boost at its points."""
+        s = self.state
+        luck = 1
+        for layer in self.LADDER:
+            luck *= layer.boost(s[layer.name])
+        return max(1, luck)
+
+    def roll_rarity(self):
+        raise NotImplementedError
+
+    def roll(self):
+        """Roll once, keep the best rarity and return the rolled one."""
+        rarity = self.roll_rarity()
+        if self.recorder is not None:
+            self.recorder.record(rarity)
+        if rarity > self.state["best_rarity"]:
+            self.state["best_rarity"] = rarity
+        return rarity
+
+    def roll_n(self, n):
+        """Apply n rolls at once; returns the best of them (0 for n <= 0).
+
+        Draws the best rarity straight from the max-of-n law, so the cost
+        does not depend on n and best_rarity ends up distributed exactly as
+        after n calls to roll(). With a recorder attached the n rolls are
+        drawn one by one (batched) instead, so it can see each of them.
+        """
+        if n <= 0:
+            return 0
+        if self.recorder is not None:
+            rarity = self._roll_recorded(n)
+        else:
+            rarity = self.roll_best_of(n)
+        if rarity > self.state["best_rarity"]:
+            self.state["best_rarity"] = rarity
+        return rarity
+
+    def _roll_recorded(self, n):
+        """roll_n's draw with a recorder attached; n equal rolls for deterministic variants."""
+        rarity = self.roll_rarity()
+        self.recorder.record_repeat(rarity, n)
+        return rarity
+
+    def roll_best_of(self, n):
+        """Best rarity of n rolls at the current luck (deterministic default)."""
+        return self.roll_rarity()
+
+    def roll_many(self, n, best_only=False, seed=None):
+        """Roll n times without touching best_rarity.
+
+        This default is for variants whose rolls are deterministic; random
+        variants override it with the batched sampler.
+        """
+        rarity = self.roll_rarity()
+        if best_only:
+            return rarity if n else 0
+        return [rarity] * n
+
+    def tail_probability(self, rarity):
+        """Chance that one roll at the current luck is at least rarity."""
+        return 1.0 if self.roll_rarity() >= rarity else 0.0
+
+    def roll_at_least(self, rarity):
+        """One roll, conditioned on the result being at least rarity.
+
+        Together with tail_probability this lets a caller skip straight to
+        the roll that first reaches a target (see prestige_mc.py).
+        """
+        return self.roll_rarity()
+
+    def _preview(self):
+        best = self.state["best_rarity"]
+        return tuple((best - offset) // divisor if best >= threshold else 0
+                     for threshold, offset, divisor in self._GAINS)
+
+    def reset(self, layer):
+        """Do the reset for layer; returns False if it is not available."""
+        i = self._LAYER_INDEX[layer]
+        threshold, offset, divisor = self._GAINS[i]
+        s = self.state
+        best = s["best_rarity"]
+        if best < threshold:
+            return False
+        s[layer] += (best - offset) // divisor
+        s.update(self._RESETS[i])  # lower layers and best_rarity in one go
+        return True
+
+
+class LuckySimu(LuckSim):
+    """Rules of luckysimu.py: LP/PP/TP, random top-down rolls."""
+
+    LADDER = (
+        Layer("LP", threshold=1, divisor=1),
+        Layer("PP", threshold=15, divisor=15),
+        Layer("TP", threshold=30, divisor=30),
+    )
+    DEFAULT_STATE = {
+        "luck": 1,
+        "LP": 0,
+        "PP": 0,
+        "TP": 0,
+        "best_rarity": 0
+    }
+    RANDOM_ROLLS = True
+
+    def _calc_luck(self):
+        """Calculate effective luck with boosts."""
+        s = self.state
+        lp_boost = s["LP"] * 2
+        pp_boost = max(1, math.ceil(s["PP"]**0.5))
+        tp_boost = 1 + math.ceil(s["TP"]**(3/4))
+        return max(1, (1 + lp_boost) ** pp_boost * tp_boost)
+
+    def roll_rarity(self):
+        return self.table().sample(self.rng.random())
+
+    def roll_many(self, n, best_only=False, seed=None):
+        """Roll n times at the current luck without touching best_rarity."""
+        return roll_many_at(self.calc_luck(), n, best_only, seed)
+
+    def _roll_recorded(self, n):
+        best = 0
+        for start in range(0, n, RECORD_CHUNK):
+            rolled = self.roll_many(min(RECORD_CHUNK, n - start), seed=self.rng.getrandbits(64))
+            best = max(best, self.recorder.record_many(rolled))
+        return best
+
+    def roll_best_of(self, n):
+        return self.table().sample_best_of(n, self.rng.random())
+
+    def tail_probability(self, rarity):
+        return self.table().tail(rarity)
+
+    def roll_at_least(self, rarity):
+        return self.table().sample_at_least(rarity, self.rng.random())
+
+
+
+class LuckiestSim(LuckySimu):
+    """Rules of luckiestsim.py: adds RP (reincarnation) on top of LuckySimu."""
+
+    LADDER = LuckySimu.LADDER + (
+        Layer("RP", threshold=60, divisor=60),
+    )
+    DEFAULT_STATE = {
+        "luck": 1,
+        "LP": 0,
+        "PP": 0,
+        "TP": 0,
+        "RP": 0,
+        "best_rarity": 0
+    }
+
+    def _calc_luck(self):
+        """Calculate effective luck with boosts and reincarnation."""
+        s = self.state
+        lp_boost = s["LP"] * 2
+        pp_boost = max(1, math.ceil(s["PP"]**0.5))
+        tp_boost = 1 + math.ceil(s["TP"]**(3/4))
+        reinc_boost = (1 + s["RP"] / 20)  # Rp scales luck slowly
+        base = 1 + lp_boost
+        tower = pp_boost ** (1 + s["RP"]/10)
+        # the tower leaves the float range after a few RP; BigNum takes over there
+        if tower * math.log10(base) >= FLOAT_DIGITS:
+            base = BigNum(base)
+        return max(1, base ** tower * (tp_boost * (1 + 0.1 * s["RP"])) * reinc_boost)
+
+
+class Luck100(LuckSim):
+    """Rules of luck100.py: deterministic rolls, best_rarity starts at 1."""
+
+    # luck is the product of the boosts (the base _calc_luck)
+    LADDER = (
+        Layer("LP", threshold=0, divisor=1, offset=1, boost=lambda lp: lp * 2 + 1),
+        Layer("PP", threshold=15, divisor=15, boost=lambda pp: math.ceil(pp ** 0.5) if pp > 0 else 1),
+        Layer("TP", threshold=30, divisor=30, boost=lambda tp: math.ceil(3/4) if tp > 0 else 1),
+        Layer("Rp", threshold=100, divisor=100, boost=lambda rp: rp if rp > 0 else 1),
+    )
+    BASE_BEST = 1
+    DEFAULT_STATE = {
+        "best_rarity": 1,
+        "LP": 0,
+        "PP": 0,
+        "TP": 0,
+        "Rp": 0,
+        "luck": 1
+    }
+
+    def calc_lp_boost(self):
+        return self.state["LP"] * 2 + 1
+
+    def calc_pp_boost(self):
+        return 2 if self.state["PP"] > 0 else 1
+
+    def calc_tp_boost(self):
+        return 1 + math.ceil(self.state["TP"] ** (2/3)) if self.state["TP"] > 0 else 1
+
+    def calc_rp_boost(self):
+        return 1 + self.state["Rp"]/10
+
+    def roll_rarity(self):
+        # first rarity where luck / 2**(r - 1) drops below 1
+        return self.threshold()
+
+
+class Luck101(LuckSim):
+    """Rules of luck101.py: Luck is stored and multiplied on every reset."""
+
+    # each reset multiplies the stored Luck by the layer's boost at its new points
+    LADDER = (
+        Layer("LP", threshold=0, divisor=1, offset=1, boost=lambda lp: 1 + lp * 2),
+        Layer("PP", threshold=15, divisor=15, boost=lambda pp: math.ceil(pp ** 0.5)),
+        Layer("TP", threshold=30, divisor=30, boost=lambda tp: math.ceil((1 + (tp ** (3/4))))),
+        Layer("RP", threshold=100, divisor=100, boost=lambda rp: 1 + rp),  # reincarnation
+    )
+    BASE_BEST = 1
+    DEFAULT_STATE = {
+        "Luck": 1.0,
+        "LP": 0,
+        "PP": 0,
+        "TP": 0,
+        "RP": 0,
+        "best_rarity": 1
+    }
+    LUCK_INPUTS = ("Luck",)
+
+    def load(self, data):
+        """Also accepts the progress.json layout: {"stats": {...}, "best_rarity": n}."""
+        if "stats" in data:
+            data = {**data["stats"], "best_rarity": data["best_rarity"]}
+        super().load(data)
+
+    def calc_luck(self):
+        # Luck is stored, so there is nothing to cache; threshold() still is
+        return self.state["Luck"]
+
+    def roll_rarity(self):
+        try:
+            # first rarity whose chance 1 / 2**(r - 1) * Luck drops below 1
+            return self.threshold()
+        except OverflowError:
+            # Luck overflowed to inf, so every rarity is guaranteed: push beyond best rarity
+            return self.state["best_rarity"] + 1
+
+    def reset(self, layer):
+        if not super().reset(layer):
+            return False
+        s = self.state
+        s["Luck"] *= self.LADDER[self._LAYER_INDEX[layer]].boost(s[layer])
+        return True
+
+
+def make_ladder(depth, first=15, ratio=2):
+    """A Luck100-style variant with depth layers, for trying deep ladders.
+
+    L1 works like LP (gain best_rarity - 1, boost 2 * points + 1). Layer k
+    after it needs and divides by first * ratio ** (k - 2), clears every
+    layer below and boosts luck by 1 + points.
+    """
+    names = [f"L{k}" for k in range(1, depth + 1)]
+    ladder = [Layer(names[0], threshold=0, divisor=1, offset=1, boost=lambda p: p * 2 + 1)]
+    for k, name in enumerate(names[1:]):
+        step = first * ratio ** k
+        ladder.append(Layer(name, threshold=step, divisor=step, boost=lambda p: 1 + p))
+    state = {"best_rarity": 1, **dict.fromkeys(names, 0), "luck": 1}
+    return type(f"Ladder{depth}", (Luck100,), {
+        "__doc__": f"make_ladder({depth}, {first}, {ratio}): {depth} Luck100-style layers.",
+        "LADDER": tuple(ladder),
+        "DEFAULT_STATE": state,
+    })
+
+
+VARIANTS = {
+    "luckysimu": LuckySimu,
+    "luckiestsim": LuckiestSim,
+    "luck100": Luck100,
+    "luck101": Luck101,
+}
+
+perf.hook(LuckSim, "roll", "roll")
+perf.hook(LuckSim, "roll_n", "roll", amount_arg=1)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Offline progress for the GUI game: advance Game.tick by many ticks at once.
+
+advance_gains(values, all_boost, a_boost, ticks) returns the state after
+ticks ticks in milliseconds instead of replaying them:
+
+1. Ticks run exactly until every stat is past LINEAR_FROM, where base
+   growth is 5% for good.
+2. The top NEAR + 1 stats then follow a linear map, jumped by repeated
+   squaring in log10 space.
+3. Lower stats run exactly in log10 space until their power term with the
+   top stat dominates to SETTLE_TOL; then they follow a closed-form affine
+   recurrence in log10.
+
+It stops at the last tick below 10 ** LOG10_LIMIT and reports how many
+ticks it applied.
+
+    python offline.py            # check against Game.tick, time a week away
+"""
+
+import argparse
+import math
+import random
+import time
+
+import stat_tick
+from bignum import BigNum, log10
+from stat_tick import NEAR, distance_exponent
+
+TICK_SECONDS = 1.0      # one tick per second of real time away, as one.html's setInterval
+LINEAR_FROM = 20.0      # max(1, 0.05 * v) == 0.05 * v from here on
+SETTLE_TOL = 1e-17      # neglected terms relative to the dominant one (below float eps)
+MAX_SETTLE_TICKS = 20000
+LOG10_LIMIT = 1e300     # log10 of the largest value the ticks may produce
+LOG10_GROWTH = math.log10(1.05)
+
+
+def advance_gains(values, all_boost, a_boost, ticks):
+    """Apply ticks GUI-version ticks to values (lowest stat first).
+
+    Returns (new values as BigNums, ticks applied). Fewer than ticks are
+    applied only if the stats would leave the range Game.tick can handle.
+    """
+    values = list(values)
+    n = len(values)
+    done = 0
+    # 1. exact ticks until every stat is in the linear 5% regime
+    while done < ticks and any(v < LINEAR_FROM for v in values):
+        values = stat_tick.tick_gains(values, all_boost, a_boost)
+        done += 1
+    if done == ticks or not n:
+        return [BigNum(v) for v in values], done
+
+    logs = [float(log10(v)) for v in values]
+    low = max(0, n - NEAR - 1)  # stats below this index get power terms
+    if low:
+        # 3a. exact log-space ticks until the power terms have taken over
+        settled = False
+        settle_from = done
+        while done < ticks and not settled:
+            new, settled = _log_tick(logs, all_boost, a_boost, low)
+            if max(new) > LOG10_LIMIT:
+                return [BigNum.from_log10(x) for x in logs], done
+            logs = new
+            done += 1
+            if done - settle_from > MAX_SETTLE_TICKS:
+                break
+        if done == ticks:
+            return [BigNum.from_log10(x) for x in logs], done
+        if not settled:
+            # has not settled within MAX_SETTLE_TICKS: keep ticking exactly
+            while done < ticks:
+                new, _ = _log_tick(logs, all_boost, a_boost, low)
+                if max(new) > LOG10_LIMIT:
+                    break
+                logs = new
+                done += 1
+            return [BigNum.from_log10(x) for x in logs], done
+
+    k = ticks - done
+    if low:
+        # 3b. closed form for the lower stats; stop where one leaves the range
+        if max(_lower_after(logs, all_boost, a_boost, low, k)) > LOG10_LIMIT:
+            lo, hi = 0, k  # the closed form grows with k, so bisect the last tick in range
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if max(_lower_after(logs, all_boost, a_boost, low, mid)) > LOG10_LIMIT:
+                    hi = mid - 1
+                else:
+                    lo = mid
+            k = lo
+        lower = _lower_after(logs, all_boost, a_boost, low, k)
+    else:
+        lower = []
+    # 2. the top stats: (T ** k) v in log space
+    top = _linear_jump(logs[low:], all_boost, a_boost if low == 0 else None, k)
+    return [BigNum.from_log10(x) for x in lower + top], done + k
+
+
+# ---- the linear part ----
+def _lse(xs):
+    """log10(sum(10 ** x)) without overflow; -inf for an empty sum."""
+    peak = max(xs)
+    if peak == -math.inf:
+        return peak
+    return peak + math.log10(math.fsum(10.0 ** (x - peak) for x in xs))
+
+
+def _log_matmul(a, b):
+    return [[_lse([row[j] + b[j][k] for j in range(len(b))]) for k in range(len(b[0]))]
+            for row in a]
+
+
+def _log_matvec(a, v):
+    return [_lse([x + y for x, y in zip(row, v)]) for row in a]
+
+
+def _transform(m, all_boost, a_boost):
+    """log10 of the one-tick matrix of m top stats (a_boost only if stat a is among them)."""
+    log_boost = math.log10(all_boost)
+    t = [[-math.inf] * m for _ in range(m)]
+    for r in range(m):
+        t[r][r] = math.log10(1.05)
+        for d in range(1, min(NEAR, m - 1 - r) + 1):
+            t[r][r + d] = math.log10(5 * d) + log_boost
+    if a_boost is not None:
+        t[0] = [x + math.log10(3 * a_boost) for x in t[0]]
+    return t
+
+
+def _linear_jump(logs, all_boost, a_boost, k):
+    """logs after k ticks of the linear map (repeated squaring)."""
+    power = _transform(len(logs), all_boost, a_boost)
+    while k:
+        if k & 1:
+            logs = _log_matvec(power, logs)
+        k >>= 1
+        if k:
+            power = _log_matmul(power, power)
+    return logs
+
+
+# ---- the power terms ----
+def _log_tick(logs, all_boost, a_boost, low):
+    """One exact tick in log10 space (all stats >= LINEAR_FROM).
+
+    Also reports whether every stat below low is settled: its largest term
+    is the power term with the top stat, and the rest add under SETTLE_TOL.
+    """
+    n = len(logs)
+    log_boost = math.log10(all_boost)
+    settled = True
+    new = []
+    for i, lower in enumerate(logs):
+        terms = [lower + LOG10_GROWTH]
+        for d in range(1, n - i):
+            if d <= NEAR:
+                terms.append(logs[i + d] + math.log10(5 * d) + log_boost)
+            else:
+                terms.append(logs[i + d] + distance_exponent(d) * lower + log_boost)
+        x = _lse(terms)
+        if i < low and settled:
+            rest = _lse(terms[:-1]) - terms[-1]
+            settled = rest < math.log10(SETTLE_TOL)
+        new.append(x + math.log10(3 * a_boost) if i == 0 else x)
+    return new, settled
+
+
+def _lower_after(logs, all_boost, a_boost, low, k):
+    """Closed form of the settled lower stats after k more ticks."""
+    n = len(logs)
+    result = []
+    for i in range(low):
+        e = distance_exponent(n - 1 - i)
+        beta = logs[-1] + math.log10(all_boost)
+        if i == 0:
+            beta += math.log10(3 * a_boost)
+        if e == 1:
+            # L(k) = L + k * beta + growth * (0 + 1 + ... + k - 1)
+            result.append(logs[i] + k * beta + LOG10_GROWTH * k * (k - 1) / 2)
+            continue
+        grown = _exp_pow(e, k)
+        if grown == math.inf:
+            result.append(math.inf)
+            continue
+        # sum of e ** (k - 1 - s) * (beta + growth * s) for s < k
+        result.append(grown * logs[i] + beta * (grown - 1) / (e - 1)
+                      + LOG10_GROWTH * (grown - 1 - k * (e - 1)) / (e - 1) ** 2)
+    return result
+
+
+def _exp_pow(e, k):
+    try:
+        return float(e) ** k
+    except OverflowError:
+        return math.inf
+
+
+# ---- regression check ----
+def _exact(values, all_boost, a_boost, ticks):
+    done = 0
+    for _ in range(ticks):
+        try:
+            new = stat_tick.tick_gains(values, all_boost, a_boost, backend="python")
+        except OverflowError:
+            break
+        if max(float(log10(v)) for v in new) > LOG10_LIMIT:
+            break
+        values = new
+        done += 1
+    return values, done
+
+
+def check(trials=60, max_stats=9, max_ticks=1500, seed=0, rel=1e-9, min_stats=1):
+    """Compare advance_gains with Game.tick run tick by tick (log10 relative error)."""
+    rng = random.Random(seed)
+    failures = []
+    for trial in range(trials):
+        n = rng.randint(min_stats, max_stats)
+        values = [BigNum(rng.choice((0.0, 10.0, rng.uniform(0, 100)))) for _ in range(n)]
+        all_boost = 2 ** rng.randint(0, 3)
+        a_boost = rng.choice((1, 1.5, 2.25))
+        ticks = rng.randint(0, max_ticks)
+        want, want_done = _exact(values, all_boost, a_boost, ticks)
+        got, got_done = advance_gains(values, all_boost, a_boost, ticks)
+        if got_done != want_done:
+            failures.append(f"trial {trial} (n={n}, {ticks} ticks): applied {got_done}, exact {want_done}")
+            continue
+        for i, (x, y) in enumerate(zip(got, want)):
+            lx, ly = float(log10(x)), float(log10(y))
+            if abs(lx - ly) > rel * max(1.0, abs(ly)) + 1e-12:
+                failures.append(f"trial {trial} (n={n}, {ticks} ticks): stat {i} "
+                                f"log10 {lx!r} vs exact {ly!r}")
+                break
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time offline progress.")
+    parser.add_argument("--trials", type=int, default=60)
+    parser.add_argument("--stats", type=int, default=9, help="max stats in the check")
+    parser.add_argument("--ticks", type=int, default=1500, help="max ticks per check trial")
+    parser.add_argument("--away", type=float, default=7 * 86400, help="seconds away to time")
+    args = parser.parse_args()
+
+    failures = check(args.trials, args.stats, args.ticks)
+    for line in failures[:20]:
+        print(line)
+    print(f"check against Game.tick: {'OK' if not failures else f'{len(failures)} mismatches'}")
+
+    ticks = int(args.away // TICK_SECONDS)
+    for n in (1, 3, 6, 7, 8, 12):
+        values = [BigNum(10.0)] * n
+        started = time.perf_counter()
+        new, done = advance_gains(values, 1, 1, ticks)
+        elapsed = time.perf_counter() - started
+        print(f"{n:>2} stats, {ticks:,} ticks: {elapsed * 1e3:8.2f} ms, applied {done:,}, "
+              f"a = {new[0]:.4g}")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Lightweight profiling counters for the games.
+
+Hot paths register once, at import:
+
+    perf.hook(LuckSim, "roll", "roll")
+    perf.hook(statgame_module, "tick", "tick", amount_arg=1)
+
+enable() swaps in timing wrappers that record calls, units, a latency
+histogram and a rolling rate per metric; disable() restores the original
+functions. report() and snapshot() return the numbers as text or a dict,
+write_jsonl()/stream_to() log them as JSON lines. Set JO_PERF=1 to start
+with profiling on.
+"""
+
+import functools
+import json
+import math
+import os
+import time
+from collections import Counter, deque
+
+HIST_STEPS = 4      # histogram buckets per doubling of latency (~19% wide)
+RATE_WINDOW = 5     # seconds behind the rolling rates
+STREAM_INTERVAL = 1.0
+
+enabled = False
+_metrics = {}
+_hooks = []  # (owner, attr, metric name, amount_arg, original)
+_stream_path = None
+_last_stream = 0.0
+
+
+class Metric:
+    """Calls, units, latency histogram and rolling rate of one hot path."""
+
+    __slots__ = ("name", "calls", "units", "total", "hist", "_window")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.units = 0
+        self.total = 0.0  # seconds spent in timed calls
+        self.hist = Counter()  # bucket -> timed calls
+        self._window = deque()  # [second, units] for the last RATE_WINDOW seconds
+
+    def add(self, units, now):
+        second = int(now)
+        window = self._window
+        if window and window[-1][0] == second:
+            window[-1][1] += units
+        else:
+            window.append([second, units])
+            while window[0][0] <= second - RATE_WINDOW:
+                window.popleft()
+        self.units += units
+
+    def observe(self, seconds, units, now):
+        self.calls += 1
+        self.total += seconds
+        self.hist[_bucket(seconds)] += 1
+        self.add(units, now)
+
+    def rate(self, now=None):
+        """Units per second over the last RATE_WINDOW seconds."""
+        now = time.monotonic() if now is None else now
+        start = int(now) - RATE_WINDOW + 1
+        units = sum(n for second, n in self._window if second >= start)
+        return units / RATE_WINDOW
+
+    def percentile(self, q):
+        """Upper edge of the bucket holding the q-th timed call (seconds)."""
+        target = q * sum(self.hist.values())
+        seen = 0
+        for bucket in sorted(self.hist):
+            seen += self.hist[bucket]
+            if seen >= target:
+                return 2.0 ** ((bucket + 1) / HIST_STEPS)
+        return None
+
+    def to_dict(self, now=None):
+        row = {"calls": self.calls, "units": self.units, "rate": self.rate(now)}
+        if self.hist:
+            row.update(mean=self.total / self.calls, p50=self.percentile(0.5),
+                       p99=self.percentile(0.99))
+        return row
+
+
+def _bucket(seconds):
+    if seconds <= 0:
+        return -64 * HIST_STEPS
+    return math.floor(math.log2(seconds) * HIST_STEPS)
+
+
+def metric(name):
+    if name not in _metrics:
+        _metrics[name] = Metric(name)
+    return _metrics[name]
+
+
+# ---- hooks ----
+def hook(owner, attr, name, amount_arg=None):
+    """Time owner.attr under metric name while profiling is on.
+
+    While it is off owner.attr stays the original function, so a hook has
+    no cost. amount_arg is the index of the positional argument holding
+    how many units a call stands for (default 1 per call).
+    """
+    entry = [owner, attr, name, amount_arg, getattr(owner, attr)]
+    _hooks.append(entry)
+    if enabled:
+        _install(entry)
+
+
+def hook_tick(owner, amount_arg=None):
+    """hook() for a game's tick: latency and ticks/sec as the "tick" metric."""
+    hook(owner, "tick", "tick", amount_arg)
+
+
+def _install(entry):
+    owner, attr, name, amount_arg, original = entry
+    target = metric(name)
+    clock = time.perf_counter
+
+    @functools.wraps(original)
+    def timed(*args, **kwargs):
+        started = clock()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            now = clock()
+            units = args[amount_arg] if amount_arg is not None and len(args) > amount_arg else 1
+            target.observe(now - started, units, time.monotonic())
+    setattr(owner, attr, timed)
+
+
+def enable():
+    global enabled
+    if not enabled:
+        enabled = True
+        for entry in _hooks:
+            _install(entry)
+
+
+def disable():
+    global enabled
+    if enabled:
+        enabled = False
+        for owner, attr, _, _, original in _hooks:
+            setattr(owner, attr, original)
+
+
+def count(name, units=1):
+    """Add units (bytes, rolls, ...) to a metric; callers check enabled first."""
+    metric(name).add(units, time.monotonic())
+
+
+def reset():
+    # zero in place: installed wrappers keep references to their Metric
+    for m in _metrics.values():
+        m.__init__(m.name)
+
+
+# ---- output ----
+def snapshot():
+    now = time.monotonic()
+    return {name: m.to_dict(now) for name, m in sorted(_metrics.items()) if m.calls or m.units}
+
+
+def report():
+    """Text table of every metric, for the REPLs and the Tk overlay."""
+    rows = snapshot()
+    if not rows:
+        return "perf: no samples yet" if enabled else "perf: off"
+    lines = [f"{'metric':<18}{'calls':>9}{'units/s':>11}{'p50':>10}{'p99':>10}"]
+    for name, row in rows.items():
+        p50 = _fmt_time(row["p50"]) if "p50" in row else "-"
+        p99 = _fmt_time(row["p99"]) if "p99" in row else "-"
+        lines.append(f"{name:<18}{row['calls']:>9}{row['rate']:>11.4g}{p50:>10}{p99:>10}")
+    return "\n".join(lines)
+
+
+def _fmt_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def write_jsonl(path):
+    """Append one {"time": ..., "metrics": {...}} line to path."""
+    with open(path, "a") as f:
+        f.write(json.dumps({"time": time.time(), "metrics": snapshot()}) + "\n")
+
+
+def stream_to(path):
+    """Have maybe_stream() append a line to path (None stops streaming)."""
+    global _stream_path
+    _stream_path = path
+
+
+def maybe_stream():
+    """Append a JSON line if streaming and STREAM_INTERVAL has passed."""
+    global _last_stream
+    if _stream_path is None or not enabled:
+        return
+    now = time.monotonic()
+    if now - _last_stream >= STREAM_INTERVAL:
+        _last_stream = now
+        write_jsonl(_stream_path)
+
+
+PERF_HELP = "perf [on|off|reset|export FILE|stream FILE|stream off]"
+
+
+def command(args):
+    """Handle a REPL `perf ...` command (args after "perf"); returns text to print.
+
+    A bare `perf` turns profiling on if needed and shows the report.
+    """
+    if not args or args[0] == "on":
+        if not enabled:
+            enable()
+            return "perf: on (hot paths are now timed)"
+        return report()
+    if args[0] == "off":
+        disable()
+        return "perf: off"
+    if args[0] == "reset":
+        reset()
+        return "perf: counters cleared"
+    if args[0] == "export" and len(args) > 1:
+        write_jsonl(args[1])
+        return f"perf: appended to {args[1]}"
+    if args[0] == "stream" and len(args) > 1:
+        stream_to(None if args[1] == "off" else args[1])
+        return "perf: streaming off" if args[1] == "off" else f"perf: streaming to {args[1]}"
+    return f"usage: {PERF_HELP}"
+
+
+if os.environ.get("JO_PERF"):
+    enable()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo prestige-strategy simulator for the luck simulators.
+
+Runs many seeded players through the lucksim rules in a process pool and
+reports, per layer, the share of players that reached it and percentiles
+of the rolls it took. Rolls between resets are skipped: the wait for the
+next target is geometric (sim.tail_probability) and the roll that reaches
+it comes from sim.roll_at_least, so a player costs O(resets).
+
+A policy has target(sim) (next best_rarity worth waiting for, or None)
+and choose(sim) (layers to try resetting once it is reached).
+LadderPolicy is "ladder" or "ladder,PP<4000" (PP only while below 4000),
+ThresholdPolicy is "LP=8,PP=15,TP=30"; "module:callable" names your own.
+A player stops once its target has a negligible chance within the rolls
+left, or after DEFAULT_MAX_RESETS resets. Variants with deterministic
+rolls give every player the same game, so a worker plays it once.
+
+Usage:
+    python prestige_mc.py --variant luckiestsim --players 1000000 \
+        --policy ladder --json results.json
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from functools import lru_cache
+from multiprocessing import Pool
+
+from lucksim import VARIANTS
+
+DEFAULT_POLICIES = {
+    "luckysimu": "ladder",
+    "luckiestsim": "ladder",
+    # ceil(sqrt(PP)) stops paying before TP's 2**28 luck, so PP is capped and
+    # LP ground from there; Rp needs 2**98 luck, out of reach of (2LP+1)*sqrt(PP)
+    "luck100": "ladder,PP<4000,TP<1,Rp<0",
+    "luck101": "ladder",
+}
+
+# roll counts below EXACT_BUCKETS are histogrammed exactly, larger ones in
+# log buckets with BUCKETS_PER_DOUBLING steps (about 4% wide)
+EXACT_BUCKETS = 1024
+BUCKETS_PER_DOUBLING = 16
+
+DEFAULT_MAX_ROLLS = 10**12
+# luck100's default policy takes about 128,000 resets to TP
+DEFAULT_MAX_RESETS = 250_000
+DEFAULT_PATIENCE = 1_000  # about how many rolls LadderPolicy waits for a target
+# chance of reaching the target within the rolls left below which a player stops
+NEGLIGIBLE_CHANCE = 1e-6
+
+
+class LadderPolicy:
+    """Grind the lowest layer while its resets still double luck, then climb.
+
+    A layer that holds no points is reset as soon as it is available; once
+    a lowest-layer reset would less than double luck, the lowest available
+    layer above it is. caps[layer] = n resets that layer only while it holds
+    fewer than n points (0: never). The player is done once the top layer
+    it plays holds points.
+    """
+
+    def __init__(self, caps=None, patience=DEFAULT_PATIENCE):
+        self.caps = dict(caps or {})
+        self.patience = patience
+        self._probe = None
+
+    def _playable(self, sim):
+        s = sim.state
+        return [layer for layer in sim.LAYERS[1:] if s[layer] < self.caps.get(layer, math.inf)]
+
+    def target(self, sim):
+        """Highest rarity one roll in patience reaches, or best_rarity + 1."""
+        top = [layer for layer in sim.LAYERS if self.caps.get(layer) != 0][-1]
+        if sim.state[top] > 0:
+            return None
+        least = 1.0 / self.patience
+        rarity = sim.state["best_rarity"] + 1
+        if sim.tail_probability(rarity) < least:
+            return rarity
+        step = 1
+        while sim.tail_probability(rarity + step) >= least:
+            rarity += step
+            step *= 2
+        while step > 1:
+            step //= 2
+            if sim.tail_probability(rarity + step) >= least:
+                rarity += step
+        return rarity
+
+    def plateaued(self, sim):
+        """True if resetting the lowest layer now would less than double luck."""
+        probe = self._probe
+        if type(probe) is not type(sim):
+            probe = self._probe = type(sim)()
+        probe.load(sim.to_dict())
+        probe.reset(sim.LAYERS[0])
+        return probe.calc_luck() < sim.calc_luck() * 2
+
+    def choose(self, sim):
+        s = sim.state
+        playable = self._playable(sim)
+        layers = [layer for layer in reversed(playable) if s[layer] == 0]
+        if self.plateaued(sim):
+            layers += [layer for layer in playable if s[layer] > 0]
+        return layers + [sim.LAYERS[0]]
+
+
+class ThresholdPolicy:
+    """Reset the highest layer whose rarity threshold best_rarity has reached."""
+
+    def __init__(self, thresholds):
+        self.thresholds = dict(thresholds)
+
+    def target(self, sim):
+        best = sim.state["best_rarity"]
+        above = [t for t in self.thresholds.values() if t > best]
+        return min(above) if above else None
+
+    def choose(self, sim):
+        best = sim.state["best_rarity"]
+        return [layer for layer in reversed(sim.LAYERS)
+                if layer in self.thresholds and best >= self.thresholds[layer]]
+
+
+def load_policy(spec):
+    """Build a policy from "ladder,PP<4000", "LP=8,PP=15" or a "module:callable" factory."""
+    if ":" in spec:
+        module, name = spec.split(":", 1)
+        return getattr(importlib.import_module(module), name)()
+    if spec.split(",")[0].strip() == "ladder":
+        caps = {}
+        for part in spec.split(",")[1:]:
+            layer, _, value = part.partition("<")
+            caps[layer.strip()] = int(value)
+        return LadderPolicy(caps)
+    thresholds = {}
+    for part in spec.split(","):
+        layer, _, value = part.partition("=")
+        thresholds[layer.strip()] = int(value)
+    return ThresholdPolicy(thresholds)
+
+
+def geometric(rng, p):
+    """Number of independent trials up to and including the first success."""
+    if p >= 1.0:
+        return 1
+    return 1 + int(math.log1p(-rng.random()) / math.log1p(-p))
+
+
+def simulate_player(sim, policy, max_rolls, max_resets=DEFAULT_MAX_RESETS):
+    """Play one player; returns {layer: rolls when it first held points}.
+
+    Gives up after max_rolls rolls or max_resets resets, or once the
+    target's chance within the rolls left is below NEGLIGIBLE_CHANCE.
+    """
+    state = sim.state
+    reached = {}
+    rolls = 0
+    resets = 0
+    while len(reached) < len(sim.LAYERS) and resets < max_resets:
+        target = policy.target(sim)
+        if target is None:
+            break
+        try:
+            p = sim.tail_probability(target)
+        except OverflowError:
+            break  # luck left the float range; nothing sensible to report
+        if p * (max_rolls - rolls) < NEGLIGIBLE_CHANCE:
+            break
+        rolls += geometric(sim.rng, p)
+        if rolls > max_rolls:
+            break
+        best = sim.roll_at_least(target)
+        if best > state["best_rarity"]:
+            state["best_rarity"] = best
+        for layer in policy.choose(sim):
+            if sim.reset(layer):
+                resets += 1
+                for name in sim.LAYERS:
+                    if name not in reached and state[name] > 0:
+                        reached[name] = rolls
+                break
+    return reached
+
+
+def bucket(rolls):
+    if rolls < EXACT_BUCKETS:
+        return rolls
+    return EXACT_BUCKETS + int(BUCKETS_PER_DOUBLING * math.log2(rolls / EXACT_BUCKETS))
+
+
+def bucket_floor(b):
+    """Smallest roll count that falls into bucket b."""
+    if b < EXACT_BUCKETS:
+        return b
+    return math.ceil(EXACT_BUCKETS * 2 ** ((b - EXACT_BUCKETS) / BUCKETS_PER_DOUBLING))
+
+
+@lru_cache(maxsize=None)
+def deterministic_player(variant, policy_spec, max_rolls, max_resets):
+    """The one game every player of a variant without random rolls plays."""
+    cls = VARIANTS[variant]
+    return simulate_player(cls(), load_policy(policy_spec), max_rolls, max_resets)
+
+
+def run_chunk(job):
+    """Worker entry point: simulate one seeded block of players."""
+    variant, policy_spec, seed, index, players, max_rolls, max_resets = job
+    cls = VARIANTS[variant]
+    hist = {layer: Counter() for layer in cls.LAYERS}
+    totals = dict.fromkeys(cls.LAYERS, 0)
+    if not cls.RANDOM_ROLLS:
+        for layer, rolls in deterministic_player(variant, policy_spec, max_rolls, max_resets).items():
+            hist[layer][bucket(rolls)] += players
+            totals[layer] += rolls * players
+        return players, hist, totals
+    policy = load_policy(policy_spec)
+    rng = random.Random(f"{seed}-{index}")
+    for _ in range(players):
+        reached = simulate_player(cls(rng=rng), policy, max_rolls, max_resets)
+        for layer, rolls in reached.items():
+            hist[layer][bucket(rolls)] += 1
+            totals[layer] += rolls
+    return players, hist, totals
+
+
+def percentile(hist, count, q):
+    target = q * count
+    seen = 0
+    for b in sorted(hist):
+        seen += hist[b]
+        if seen >= target:
+            return bucket_floor(b)
+    return None
+
+
+def summarize(layers, players, hist, totals):
+    summary = {}
+    for layer in layers:
+        count = sum(hist[layer].values())
+        row = {"reached": count, "share": count / players if players else 0.0}
+        if count:
+            row["mean"] = totals[layer] / count
+            for q in (0.1, 0.5, 0.9, 0.99):
+                row[f"p{round(q * 100)}"] = percentile(hist[layer], count, q)
+        summary[layer] = row
+    return summary
+
+
+def run(variant, players, policy_spec, workers, seed=0, max_rolls=DEFAULT_MAX_ROLLS,
+        max_resets=DEFAULT_MAX_RESETS, chunk=None):
+    """Simulate players across a process pool and return the summary dict."""
+    cls = VARIANTS[variant]
+    workers = workers or os.cpu_count() or 1
+    chunk = chunk or max(1, min(20_000, -(-players // (workers * 8))))
+    jobs = []
+    for index, start in enumerate(range(0, players, chunk)):
+        jobs.append((variant, policy_spec, seed, index, min(chunk, players - start),
+                     max_rolls, max_resets))
+
+    hist = {layer: Counter() for layer in cls.LAYERS}
+    totals = dict.fromkeys(cls.LAYERS, 0)
+    done = 0
+    with Pool(workers) as pool:
+        for n, h, t in pool.imap_unordered(run_chunk, jobs):
+            done += n
+            for layer in cls.LAYERS:
+                hist[layer].update(h[layer])
+                totals[layer] += t[layer]
+    return summarize(cls.LAYERS, done, hist, totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default="luckiestsim")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--policy", help="e.g. ladder, LP=8,PP=15,TP=30 or module:factory "
+                        "(default depends on --variant)")
+    parser.add_argument("--workers", type=int, default=0, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rolls", type=int, default=DEFAULT_MAX_ROLLS,
+                        help="give up on a player after this many rolls")
+    parser.add_argument("--max-resets", type=int, default=DEFAULT_MAX_RESETS,
+                        help="give up on a player after this many resets")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    policy = args.policy or DEFAULT_POLICIES[args.variant]
+    started = time.perf_counter()
+    summary = run(args.variant, args.players, policy, args.workers, args.seed,
+                  args.max_rolls, args.max_resets)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.variant}: {args.players} players, policy {policy}, {elapsed:.1f}s")
+    print(f"{'layer':<6}{'reached':>10}{'mean':>14}{'p10':>12}{'p50':>12}{'p90':>12}{'p99':>12}")
+    for layer, row in summary.items():
+        if not row["reached"]:
+            print(f"{layer:<6}{'0.0%':>10}")
+            continue
+        print(f"{layer:<6}{row['share']:>10.1%}{row['mean']:>14.4g}"
+              f"{row['p10']:>12.4g}{row['p50']:>12.4g}{row['p90']:>12.4g}{row['p99']:>12.4g}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"variant": args.variant, "players": args.players, "policy": policy,
+                       "seconds": elapsed, "layers": summary}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Exact reset-policy solver for the luck prestige layers.
+
+For a goal layer, computes for every state (points below the goal plus
+best_rarity) the expected rolls still needed under optimal play, and the
+best action there:
+
+    V(P, b) = min(  min over available resets of V(after reset),
+                    (1 + sum over x > b of P(x) * V(P, x)) / (1 - F(b))  )
+
+Every reset moves to a lexicographically larger layer vector, so one
+top-down sweep solves the table. Layers are capped at CAPS. Solved tables
+are cached under CACHE_DIR, keyed on the rules' source, goal and caps.
+
+Usage:
+    python prestige_solver.py --variant luckysimu --goal TP --hint LP=12,PP=1,best=9
+"""
+
+import argparse
+import hashlib
+import inspect
+import itertools
+import json
+import math
+import os
+import sys
+from array import array
+
+import bignum
+import rarity
+from lucksim import VARIANTS
+from rarity import TOP_RARITY
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "jo-prestige")
+SOLVER_VERSION = 1
+RULE_MODULES = (bignum, rarity)  # what the engines compute luck and rarities with
+
+DEFAULT_GOALS = {"luckysimu": "TP", "luckiestsim": "RP", "luck100": "Rp"}
+DEFAULT_CAPS = {"LP": 200, "PP": 30, "TP": 10, "RP": 5, "Rp": 5}
+
+ROLL = -1  # action code for "keep rolling"; resets are coded by layer index
+
+
+def _reset_rules(cls, layers):
+    """Per layer and best_rarity: None if the reset is not allowed, else
+    (gain, indices of the lower layers it clears), read off cls.LADDER.
+    """
+    rules = {}
+    for li, layer in enumerate(layers):
+        spec = cls.LADDER[li]
+        lo = 0 if spec.clears is None else max(0, li - spec.clears)
+        cleared = tuple(range(lo, li))
+        rules[layer] = [None if best < spec.threshold
+                        else ((best - spec.offset) // spec.divisor, cleared)
+                        for best in range(TOP_RARITY + 1)]
+    return rules
+
+
+def _rules_key(cls, goal, caps):
+    modules = {sys.modules[c.__module__] for c in cls.__mro__ if c is not object}
+    modules.update(RULE_MODULES)
+    source = "".join(inspect.getsource(m) for m in sorted(modules, key=lambda m: m.__name__))
+    blob = json.dumps([SOLVER_VERSION, TOP_RARITY, cls.__name__, source, goal, caps])
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+class PolicyTable:
+    """Optimal action and expected rolls-to-goal for every capped state."""
+
+    def __init__(self, variant, goal, layers, caps, actions, values):
+        self.variant = variant
+        self.goal = goal
+        self.layers = layers  # the layers below goal, in LAYERS order
+        self.caps = caps
+        self.actions = actions  # array('b'), ROLL or index into layers + [goal]
+        self.values = values    # array('d'), expected rolls to goal
+
+    def _index(self, state):
+        idx = 0
+        for layer in reversed(self.layers):
+            idx = idx * (self.caps[layer] + 1) + min(state[layer], self.caps[layer])
+        return idx * (TOP_RARITY + 1) + min(max(state["best_rarity"], 0), TOP_RARITY)
+
+    def best_action(self, state):
+        """"roll", or the name of the layer to reset right now."""
+        action = self.actions[self._index(state)]
+        if action == ROLL:
+            return "roll"
+        return (self.layers + [self.goal])[action]
+
+    def expected_rolls(self, state):
+        return self.values[self._index(state)]
+
+    # ---- disk cache ----
+    def save(self, path):
+        meta = {"variant": self.variant, "goal": self.goal,
+                "layers": self.layers, "caps": self.caps}
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(meta).encode() + b"\n")
+            self.actions.tofile(f)
+            self.values.tofile(f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            meta = json.loads(f.readline())
+            size = TOP_RARITY + 1
+            for layer in meta["layers"]:
+                size *= meta["caps"][layer] + 1
+            actions = array("b")
+            actions.fromfile(f, size)
+            values = array("d")
+            values.fromfile(f, size)
+        return cls(meta["variant"], meta["goal"], meta["layers"], meta["caps"], actions, values)
+
+
+def solve(variant, goal=None, caps=None):
+    """Solve the table for variant/goal from scratch (no cache)."""
+    cls = VARIANTS[variant]
+    if variant == "luck101":
+        raise ValueError("luck101 keeps Luck as its own state, so luck is not a function of the layers")
+    goal = goal or DEFAULT_GOALS[variant]
+    layers = list(cls.LAYERS[:cls.LAYERS.index(goal)])
+    caps = {layer: (caps or DEFAULT_CAPS)[layer] for layer in layers}
+    rules = _reset_rules(cls, layers + [goal])
+    top = TOP_RARITY
+
+    strides = []
+    stride = top + 1
+    for layer in layers:
+        strides.append(stride)
+        stride *= caps[layer] + 1
+    size = stride
+    values = array("d", [math.inf]) * size
+    actions = array("b", [ROLL]) * size
+
+    sim = cls()
+    # highest layer varies slowest and descends first: every reset target is already solved
+    ranges = [range(caps[layer], -1, -1) for layer in reversed(layers)]
+    for combo in itertools.product(*ranges):
+        points = combo[::-1]  # back to LAYERS order
+        base = sum(p * s for p, s in zip(points, strides))
+        for layer, p in zip(layers, points):
+            sim.state[layer] = p
+        try:
+            tails = [sim.tail_probability(x) for x in range(1, top + 1)] + [0.0]
+        except OverflowError:
+            tails = [1.0] + [0.0] * top  # luck too large: every roll is 1
+
+        suffix = 0.0  # sum over x > b of P(x) * V(points, x)
+        for b in range(top, -1, -1):
+            best_value = math.inf
+            best_action = ROLL
+            # rolling: wait for the first roll above b
+            beat = tails[b]  # P(roll >= b + 1)
+            if beat > 0.0:
+                best_value = (1.0 + suffix) / beat
+            for li, per_best in enumerate(rules.values()):
+                rule = per_best[b]
+                if rule is None:
+                    continue
+                if li == len(layers):
+                    best_value, best_action = 0.0, li  # goal reached
+                    break
+                gain, cleared = rule
+                new = list(points)
+                new[li] = min(new[li] + gain, caps[layers[li]])
+                for i in cleared:
+                    new[i] = 0
+                if new[::-1] <= list(points)[::-1]:
+                    continue  # capped away, or no gain: not a real move
+                target = sum(p * s for p, s in zip(new, strides))
+                if values[target] < best_value:
+                    best_value, best_action = values[target], li
+            values[base + b] = best_value
+            actions[base + b] = best_action
+            p_b = tails[b - 1] - tails[b] if b > 0 else 0.0
+            if p_b > 0.0:
+                suffix += p_b * best_value
+    return PolicyTable(variant, goal, layers, caps, actions, values)
+
+
+def load_or_solve(variant, goal=None, caps=None, cache_dir=CACHE_DIR):
+    """Return the cached PolicyTable for these rules, solving it on a miss."""
+    cls = VARIANTS[variant]
+    goal = goal or DEFAULT_GOALS.get(variant)
+    layers = list(cls.LAYERS[:cls.LAYERS.index(goal)]) if goal in cls.LAYERS else []
+    caps = {layer: (caps or DEFAULT_CAPS)[layer] for layer in layers}
+    path = os.path.join(cache_dir, f"{variant}-{goal}-{_rules_key(cls, goal, caps)}.bin")
+    if os.path.exists(path):
+        return PolicyTable.load(path)
+    table = solve(variant, goal, caps)
+    os.makedirs(cache_dir, exist_ok=True)
+    table.save(path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve the optimal prestige reset policy.")
+    parser.add_argument("--variant", choices=sorted(DEFAULT_GOALS), default="luckysimu")
+    parser.add_argument("--goal", help="layer whose first point is the goal")
+    parser.add_argument("--cap", action="append", default=[], metavar="LAYER=N",
+                        help="cap for a lower layer (repeatable)")
+    parser.add_argument("--hint", help='state to advise on, e.g. "LP=12,PP=1,best=9"')
+    args = parser.parse_args()
+
+    caps = dict(DEFAULT_CAPS)
+    for item in args.cap:
+        layer, _, n = item.partition("=")
+        caps[layer] = int(n)
+    table = load_or_solve(args.variant, args.goal, caps)
+    state = dict.fromkeys(table.layers, 0)
+    state["best_rarity"] = 0
+    if args.hint:
+        for part in args.hint.split(","):
+            key, _, n = part.partition("=")
+            state["best_rarity" if key == "best" else key] = int(n)
+    print(f"goal: first {table.goal} ({args.variant}), caps {table.caps}")
+    print(f"state {state}: {table.best_action(state)} "
+          f"(expected {table.expected_rolls(state):.1f} rolls to goal)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+SQLite profile store for the luck simulators.
+
+Every save lives in one WAL-mode database, one row per field:
+
+    fields(profile, variant, field, value)    value is the field as JSON
+
+save() writes only the fields that differ from the database, in one
+BEGIN IMMEDIATE transaction; writers from many processes queue on the
+lock (up to BUSY_TIMEOUT) and the later save wins. The GUIs use the
+profile named by JO_PROFILE ("default" if unset) and import their old
+JSON save on first start.
+
+    store = ProfileStore()
+    sim.load(store.load_or_import("default", "luck100", "game_save.json") or {})
+    saver = SaveScheduler(sim.to_dict, store.writer("default", "luck100"))
+
+    python profile_store.py --procs 16 --saves 2000   # concurrent save test
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import perf
+
+DB_FILE = "profiles.db"
+DEFAULT_PROFILE = os.environ.get("JO_PROFILE", "default")
+BUSY_TIMEOUT = 30.0  # seconds a writer waits for the lock before giving up
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fields (
+    profile TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (profile, variant, field)
+) WITHOUT ROWID
+"""
+UPSERT = ("INSERT INTO fields (profile, variant, field, value) VALUES (?, ?, ?, ?) "
+          "ON CONFLICT (profile, variant, field) DO UPDATE SET value = excluded.value")
+
+
+class ProfileStore:
+    """Per-field saves of (profile, variant) pairs in one SQLite database.
+
+    One store may be shared by threads (the GUI and its saver thread). Each
+    process opens its own.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # autocommit mode: transactions are opened explicitly below
+        self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                   check_same_thread=False)
+        self._set_wal()
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(SCHEMA)
+        self._lock = threading.Lock()
+        self._known = {}  # (profile, variant) -> {field: JSON} as last read or written
+        self._version = None  # data_version _known is valid for
+
+    def _set_wal(self):
+        # the busy timeout does not cover switching a new database to WAL,
+        # which processes starting together race for; retry until it does
+        deadline = time.monotonic() + BUSY_TIMEOUT
+        while True:
+            try:
+                self._db.execute("PRAGMA journal_mode=WAL")
+                return
+            except sqlite3.OperationalError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ---- single profiles ----
+    def load(self, profile, variant):
+        """The saved dict, or None if nothing is saved for this pair."""
+        return self.load_many(variant, [profile]).get(profile)
+
+    def load_or_import(self, profile, variant, legacy_path):
+        """load(), importing the old JSON save at legacy_path if nothing is stored yet."""
+        data = self.load(profile, variant)
+        if data is None and legacy_path and os.path.exists(legacy_path):
+            with open(legacy_path) as f:
+                data = json.load(f)
+            self.save(profile, variant, data)
+        return data
+
+    def save(self, profile, variant, data):
+        """Write the fields of data that changed; returns how many rows changed."""
+        return self.save_many(variant, {profile: data})
+
+    def writer(self, profile, variant):
+        """A write(data) callable for SaveScheduler."""
+        return lambda data: self.save(profile, variant, data)
+
+    def delete(self, profile, variant):
+        with self._lock:
+            self._db.execute("DELETE FROM fields WHERE profile = ? AND variant = ?",
+                             (profile, variant))
+            self._known[profile, variant] = {}
+
+    def profiles(self, variant=None):
+        """Sorted profile names, optionally only those with a save for variant."""
+        if variant is None:
+            query, args = "SELECT DISTINCT profile FROM fields ORDER BY profile", ()
+        else:
+            query, args = "SELECT DISTINCT profile FROM fields WHERE variant = ? ORDER BY profile", (variant,)
+        with self._lock:
+            return [row[0] for row in self._db.execute(query, args)]
+
+    # ---- what the database holds ----
+    def _sync_known(self):
+        """Forget _known if another connection committed since; True if it did."""
+        # data_version changes only on other connections' commits, never our own
+        version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._version:
+            return False
+        self._known.clear()
+        self._version = version
+        return True
+
+    def _diff(self, variant, encoded):
+        """(upserts, deletes) turning the stored rows into encoded {profile: {field: JSON}}."""
+        upserts = []
+        deletes = []
+        for profile, fields in encoded.items():
+            known = self._known.get((profile, variant))
+            if known is None:
+                known = self._known[profile, variant] = dict(self._db.execute(
+                    "SELECT field, value FROM fields WHERE profile = ? AND variant = ?",
+                    (profile, variant)))
+            for field, value in fields.items():
+                if known.get(field) != value:
+                    upserts.append((profile, variant, field, value))
+            # a field missing from data is deleted, so load() returns exactly data
+            deletes.extend((profile, variant, field) for field in known if field not in fields)
+        return upserts, deletes
+
+    # ---- bulk ----
+    def load_many(self, variant, profiles=None):
+        """{profile: saved dict} for the given profiles (default: all) of variant."""
+        query = "SELECT profile, field, value FROM fields WHERE variant = ?"
+        args = [variant]
+        if profiles is not None:
+            profiles = list(profiles)
+            if not profiles:
+                return {}
+            query += f" AND profile IN ({','.join('?' * len(profiles))})"
+            args += profiles
+        encoded = {}
+        with self._lock:
+            self._sync_known()  # before the read, so a commit racing it is noticed later
+            for profile, field, value in self._db.execute(query, args):
+                encoded.setdefault(profile, {})[field] = value
+            for profile, fields in encoded.items():
+                self._known[profile, variant] = dict(fields)
+        return {profile: {field: json.loads(value) for field, value in fields.items()}
+                for profile, fields in encoded.items()}
+
+    def save_many(self, variant, saves):
+        """Save {profile: dict} in one transaction; returns how many rows changed."""
+        encoded = {profile: {field: json.dumps(value) for field, value in data.items()}
+                   for profile, data in saves.items()}
+        with self._lock:
+            self._sync_known()
+            upserts, deletes = self._diff(variant, encoded)
+            if upserts or deletes:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    if self._sync_known():  # another process committed since the diff
+                        upserts, deletes = self._diff(variant, encoded)
+                    self._db.executemany(UPSERT, upserts)
+                    self._db.executemany("DELETE FROM fields WHERE profile = ? AND variant = ? "
+                                         "AND field = ?", deletes)
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+            for profile, fields in encoded.items():
+                self._known[profile, variant] = fields
+        if perf.enabled:
+            perf.count("save_bytes", sum(len(row[3]) for row in upserts))
+        return len(upserts) + len(deletes)
+
+
+perf.hook(ProfileStore, "save_many", "store_save")
+
+
+# ---- concurrent save test ----
+def _hammer(path, worker, saves):
+    """Save one profile saves times, changing two fields each time."""
+    store = ProfileStore(path)
+    profile = f"worker{worker}"
+    data = {"LP": 0, "PP": 0, "TP": 0, "best_rarity": 0, "luck": 1}
+    started = time.perf_counter()
+    for i in range(1, saves + 1):
+        data["LP"] = i
+        data["best_rarity"] = i % 101
+        store.save(profile, "luckysimu", data)
+    elapsed = time.perf_counter() - started
+    store.close()
+    return elapsed
+
+
+def check(path, procs, saves):
+    """Run procs processes saving at once; returns (lost saves, saves/s overall)."""
+    with multiprocessing.Pool(procs) as pool:
+        started = time.perf_counter()
+        pool.starmap(_hammer, [(path, worker, saves) for worker in range(procs)])
+        elapsed = time.perf_counter() - started
+    store = ProfileStore(path)
+    stored = store.load_many("luckysimu")
+    store.close()
+    lost = sum(1 for worker in range(procs)
+               if stored.get(f"worker{worker}", {}).get("LP") != saves)
+    return lost, procs * saves / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save from many processes at once and check nothing is lost.")
+    parser.add_argument("--procs", type=int, default=16)
+    parser.add_argument("--saves", type=int, default=2000, help="saves per process")
+    parser.add_argument("--db", help="database file (default: a temporary one)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, DB_FILE)
+        lost, rate = check(path, args.procs, args.saves)
+    print(f"{args.procs} processes x {args.saves} saves: {rate:,.0f} saves/s, "
+          f"{'no lost writes' if not lost else f'{lost} profiles lost writes'}")
+    raise SystemExit(1 if lost else 0)
+
+
+if __name__ == "__main__":
+    main()
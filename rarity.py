@@ -0,0 +1,160 @@
+"""
+Rarity sampling shared by the luck simulators.
+
+luckysimu.py and luckiestsim.py roll by walking rarities from TOP_RARITY down
+to 1; rarity r hits with chance luck / 2**r (skipped while that is >= 1).
+RarityTable holds that walk's closed-form CDF for one luck value, so a roll
+is one uniform draw and a bisect. luck100.py and luck101.py roll
+deterministically: floor(log2(luck)) + 2 (threshold_rarity).
+"""
+
+import bisect
+import math
+import random
+from functools import lru_cache
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # roll_many falls back to a plain Python loop
+    np = None
+
+TOP_RARITY = 100
+ROLL_CHUNK = 1 << 20  # rolls drawn per NumPy batch in roll_many
+
+
+class RarityTable:
+    """Exact result distribution of one top-down roll at a fixed luck."""
+
+    def __init__(self, luck, top=TOP_RARITY):
+        self.luck = luck
+        self.top = top
+        # cdf[r - 1] = P(result <= r), built from the top rarity downwards;
+        # neg_tail[r - 1] = -P(result >= r), kept separately (via expm1) so
+        # tails far below float epsilon stay accurate
+        if luck >= 2 ** top:
+            chances = ()  # every rarity is skipped; the walk always falls to 1
+        else:
+            luck = float(luck)
+            chances = [luck * inv for inv in _inv_pow2(top)[1:]]
+        # log_below[r - 1] = log P(result < r) = sum of log(1 - p(s)) for s >= r
+        logs = [math.log1p(-p) if p < 1 else 0.0 for p in chances]
+        log_below = list(accumulate(reversed(logs)))[::-1] or [0.0] * top
+        self.log_cdf = log_below[1:] + [0.0]
+        self.cdf = [math.exp(x) for x in self.log_cdf]
+        self.neg_tail = [-1.0] + [math.expm1(x) for x in log_below[1:]]
+
+    def sample(self, u):
+        """Map a uniform draw u in [0, 1) to a rarity."""
+        return bisect.bisect_right(self.cdf, u) + 1
+
+    def sample_best_of(self, n, u):
+        """Map u in [0, 1) to the best rarity of n rolls, in O(1) for any n.
+
+        The best of n rolls is <= r with probability cdf(r)**n, so invert
+        that in log space: the first r with n * log cdf(r) > log u.
+        """
+        if n <= 0:
+            return 0
+        if u <= 0.0:
+            return 1
+        return bisect.bisect_right(self.log_cdf, math.log(u) / n) + 1
+
+    def tail(self, rarity):
+        """Chance that a single roll is at least rarity."""
+        if rarity <= 1:
+            return 1.0
+        if rarity > self.top:
+            return 0.0
+        return -self.neg_tail[rarity - 1]
+
+    def sample_at_least(self, rarity, u):
+        """Map u in [0, 1) to a rarity, conditioned on the roll being >= rarity.
+
+        Inverts the conditional survival function P(X >= r) / P(X >= rarity),
+        so it works even when that tail is far smaller than 1 - u can resolve.
+        """
+        rarity = max(rarity, 1)
+        cutoff = (1.0 - u) * self.tail(rarity)
+        return max(rarity, bisect.bisect_right(self.neg_tail, -cutoff))
+
+    def probability(self, rarity):
+        """Chance that a single roll lands exactly on rarity."""
+        if not 1 <= rarity <= self.top:
+            return 0.0
+        below = self.cdf[rarity - 2] if rarity > 1 else 0.0
+        return self.cdf[rarity - 1] - below
+
+
+@lru_cache(maxsize=None)
+def _inv_pow2(top):
+    return [2.0 ** -r for r in range(top + 1)]
+
+
+def floor_log2(luck):
+    """Exact floor(log2(luck)) for luck > 0.
+
+    Ints use bit_length and floats use frexp, so neither rounds at powers of
+    two and big ints never go through float. Anything else is taken to be in
+    log form and must provide a log2() method.
+    """
+    if isinstance(luck, int):
+        return luck.bit_length() - 1
+    if isinstance(luck, float):
+        if not math.isfinite(luck):
+            raise OverflowError("luck is outside the float range")
+        return math.frexp(luck)[1] - 1
+    return math.floor(luck.log2())
+
+
+def threshold_rarity(luck):
+    """First rarity r whose chance luck / 2**(r - 1) is below 1.
+
+    Costs the same for any luck, with no upper rarity cap.
+    """
+    if luck < 1:
+        return 1
+    return floor_log2(luck) + 2
+
+
+@lru_cache(maxsize=4096)
+def rarity_table(luck, top=TOP_RARITY):
+    """Cached RarityTable; luck only changes on resets, so hits are the norm."""
+    return RarityTable(luck, top)
+
+
+def sample_rarity(luck, rng=random, top=TOP_RARITY):
+    """Draw one rarity with the same distribution as the top-down walk."""
+    return rarity_table(luck, top).sample(rng.random())
+
+
+def roll_many(luck, n, best_only=False, seed=None, top=TOP_RARITY):
+    """Roll n times at a fixed luck.
+
+    Returns the list (or NumPy array) of rarities, or just their maximum when
+    best_only is set (0 for n == 0). Uses NumPy in chunks of ROLL_CHUNK when
+    it is installed, so memory stays bounded for tens of millions of rolls.
+    """
+    table = rarity_table(luck, top)
+    if np is None:
+        rng = random.Random(seed)
+        sample = table.sample
+        if best_only:
+            return max((sample(rng.random()) for _ in range(n)), default=0)
+        return [sample(rng.random()) for _ in range(n)]
+
+    rng = np.random.default_rng(seed)
+    cdf = np.asarray(table.cdf)
+    dtype = np.uint8 if top < 256 else np.uint32
+    best = 0
+    chunks = []
+    for start in range(0, n, ROLL_CHUNK):
+        u = rng.random(min(ROLL_CHUNK, n - start))
+        rolled = (np.searchsorted(cdf, u, side="right") + 1).astype(dtype)
+        if best_only:
+            best = max(best, int(rolled.max()))
+        else:
+            chunks.append(rolled)
+    if best_only:
+        return best
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
@@ -0,0 +1,105 @@
+"""
+Frame-rate-limited label updates for the luck simulators.
+
+RenderScheduler.mark_dirty() books one root.after frame, at most fps per
+second; the frame asks the app for its label texts and reconfigures only
+the labels whose text changed. PerfOverlay is a toggleable label showing
+perf.report(); profiling is on only while it is shown.
+"""
+
+import time
+
+import perf
+
+DEFAULT_FPS = 30
+PERF_REFRESH_MS = 500
+
+
+class RenderScheduler:
+    """Coalesce label refreshes to at most fps per second.
+
+    render() returns (label, text) pairs for the current state. Labels are
+    any widgets that take config(text=...).
+    """
+
+    def __init__(self, root, render, fps=DEFAULT_FPS):
+        self.root = root
+        self.render = render
+        self.interval = 1.0 / fps
+        self.frames = 0  # frames that reconfigured at least one label
+        self._dirty = False
+        self._pending = None  # after() id of the booked frame
+        self._last_frame = 0.0
+        self._shown = {}  # label -> text it currently shows
+
+    def mark_dirty(self):
+        """Note that the state changed; the labels refresh on the next frame."""
+        self._dirty = True
+        if self._pending is None:
+            delay = self._last_frame + self.interval - time.monotonic()
+            self._pending = self.root.after(max(0, round(delay * 1000)), self._frame)
+
+    def flush(self):
+        """Refresh the labels now if anything is pending."""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._last_frame = time.monotonic()
+        changed = False
+        for label, text in self.render():
+            if self._shown.get(label) != text:
+                label.config(text=text)
+                self._shown[label] = text
+                changed = True
+        if changed:
+            self.frames += 1
+
+    def close(self):
+        """Cancel any booked frame; call before the window is destroyed."""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        self._dirty = False
+
+    def _frame(self):
+        self._pending = None
+        self.flush()
+
+
+class PerfOverlay:
+    """Toggleable perf report in a label the app created (but did not pack)."""
+
+    def __init__(self, root, label):
+        self.root = root
+        self.label = label
+        self._pending = None
+
+    @property
+    def shown(self):
+        return self._pending is not None
+
+    def toggle(self, event=None):
+        if self.shown:
+            self.close()
+            self.label.pack_forget()
+            perf.disable()
+        else:
+            perf.enable()
+            self.label.pack()
+            self._refresh()
+
+    def close(self):
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+
+    def _refresh(self):
+        self.label.config(text=perf.report())
+        perf.maybe_stream()
+        self._pending = self.root.after(PERF_REFRESH_MS, self._refresh)
+
+
+perf.hook(RenderScheduler, "flush", "render")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Roll recorder for the luck simulators: the rarities players actually roll.
+
+A RollRecorder set as sim.recorder counts rolls per rarity (counts, an
+array('Q') of HIST_SIZE counters; the last one is shared by every higher
+rarity) and optionally appends each roll to a RollLog.
+
+A log file is a 16-byte header (LOG_MAGIC, rolls logged) followed by the
+rolls as native uint16, capped at MAX_LOGGED. read_log() maps the rolls
+logged so far as a read-only NumPy array.
+
+The GUIs attach a recorder when JO_ROLL_LOG names a directory, logging to
+<dir>/<variant>-<pid>.rolls.
+
+    python roll_recorder.py rolls/*.rolls       # rarity counts of saved logs
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HIST_SIZE = 2048        # rarities >= HIST_SIZE - 1 share the last counter
+LOG_MAGIC = b"JOROLLS1"
+HEADER = struct.Struct("=8sQ")  # magic, rolls logged
+LOG_CHUNK = 1 << 24     # rolls the log file grows by (32 MiB)
+MAX_LOGGED = 0xFFFF     # largest rarity a log can hold
+LOG_ENV = "JO_ROLL_LOG"
+
+
+class RollLog:
+    """Append-only memory-mapped file of uint16 rarities (single writer)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < HEADER.size:
+            os.ftruncate(self._fd, HEADER.size + 2 * LOG_CHUNK)
+            os.pwrite(self._fd, HEADER.pack(LOG_MAGIC, 0), 0)
+        else:
+            magic, _ = HEADER.unpack(os.pread(self._fd, HEADER.size, 0))
+            if magic != LOG_MAGIC:
+                os.close(self._fd)
+                raise ValueError(f"{path} is not a roll log")
+        self._map()
+        self.count = self._header[1]
+
+    def _map(self):
+        size = os.fstat(self._fd).st_size
+        self._mm = mmap.mmap(self._fd, size)
+        self._header = memoryview(self._mm)[:HEADER.size].cast("Q")
+        self._rolls = memoryview(self._mm)[HEADER.size:].cast("H")
+        self.capacity = len(self._rolls)
+
+    def _unmap(self):
+        self._header.release()
+        self._rolls.release()
+        self._mm.close()
+
+    def _grow(self, needed):
+        chunks = -(-(needed - self.capacity) // LOG_CHUNK)
+        self._unmap()
+        os.ftruncate(self._fd, HEADER.size + 2 * (self.capacity + chunks * LOG_CHUNK))
+        self._map()
+
+    def append(self, rarity):
+        n = self.count
+        if n == self.capacity:
+            self._grow(n + 1)
+        self._rolls[n] = rarity if rarity < MAX_LOGGED else MAX_LOGGED
+        self.count = self._header[1] = n + 1  # publish after the roll is written
+
+    def extend(self, rarities):
+        """Append many rarities (a NumPy array, or any sequence of ints)."""
+        n = self.count
+        end = n + len(rarities)
+        if end > self.capacity:
+            self._grow(end)
+        if np is not None:
+            rolled = np.asarray(rarities)
+            if rolled.max() > MAX_LOGGED:
+                rolled = np.minimum(rolled, MAX_LOGGED)
+            np.frombuffer(self._rolls, dtype=np.uint16)[n:end] = rolled
+        else:
+            self._rolls[n:end] = array("H", (min(r, MAX_LOGGED) for r in rarities))
+        self.count = self._header[1] = end
+
+    def fill(self, rarity, n):
+        """Append rarity n times."""
+        value = rarity if rarity < MAX_LOGGED else MAX_LOGGED
+        end = self.count + n
+        if end > self.capacity:
+            self._grow(end)
+        while self.count < end:  # a chunk at a time, so no n-sized buffer
+            start = self.count
+            stop = min(end, start + LOG_CHUNK)
+            if np is not None:
+                np.frombuffer(self._rolls, dtype=np.uint16)[start:stop] = value
+            else:
+                self._rolls[start:stop] = array("H", [value]) * (stop - start)
+            self.count = self._header[1] = stop
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if self._fd is not None:
+            self._mm.flush()
+            self._unmap()
+            os.close(self._fd)
+            self._fd = None
+
+
+class RollRecorder:
+    """Per-rarity roll counts, plus an optional RollLog of every roll."""
+
+    def __init__(self, log_path=None):
+        self.counts = array("Q", bytes(8 * HIST_SIZE))
+        self.log = RollLog(log_path) if log_path else None
+
+    def record(self, rarity):
+        self.counts[rarity if rarity < HIST_SIZE else HIST_SIZE - 1] += 1
+        if self.log is not None:
+            self.log.append(rarity)
+
+    def record_many(self, rarities):
+        """Record a batch of rolls (roll_many's output); returns the best (0 if none)."""
+        if not len(rarities):
+            return 0
+        if np is not None:
+            rolled = np.asarray(rarities)
+            best = int(rolled.max())
+            if best >= HIST_SIZE:
+                rolled = np.minimum(rolled, HIST_SIZE - 1)
+            hist = np.frombuffer(self.counts, dtype=np.uint64)  # the counters, not a copy
+            hist += np.bincount(rolled, minlength=HIST_SIZE).astype(np.uint64)
+        else:
+            counts = self.counts
+            for rarity in rarities:
+                counts[rarity if rarity < HIST_SIZE else HIST_SIZE - 1] += 1
+            best = max(rarities)
+        if self.log is not None:
+            self.log.extend(rarities)
+        return best
+
+    def record_repeat(self, rarity, n):
+        """Record n rolls of the same rarity."""
+        self.counts[rarity if rarity < HIST_SIZE else HIST_SIZE - 1] += n
+        if self.log is not None:
+            self.log.fill(rarity, n)
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    def histogram(self):
+        """{rarity: rolls} for every rarity rolled at least once."""
+        return {r: n for r, n in enumerate(self.counts) if n}
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+
+def recorder_from_env(variant):
+    """A recorder logging to $JO_ROLL_LOG/<variant>-<pid>.rolls, or None if unset."""
+    directory = os.environ.get(LOG_ENV)
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return RollRecorder(os.path.join(directory, f"{variant}-{os.getpid()}.rolls"))
+
+
+def read_log(path):
+    """The rolls logged at path so far, as a read-only uint16 array mapped from the file."""
+    with open(path, "rb") as f:
+        magic, count = HEADER.unpack(f.read(HEADER.size))
+    if magic != LOG_MAGIC:
+        raise ValueError(f"{path} is not a roll log")
+    if not count:
+        return np.zeros(0, dtype=np.uint16)
+    return np.memmap(path, dtype=np.uint16, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rarity counts of roll logs.")
+    parser.add_argument("logs", nargs="+")
+    args = parser.parse_args()
+    if np is None:
+        raise SystemExit("roll_recorder.py needs NumPy to read logs")
+
+    counts = np.zeros(MAX_LOGGED + 1, dtype=np.int64)
+    for path in args.logs:
+        rolls = read_log(path)
+        counts += np.bincount(rolls, minlength=MAX_LOGGED + 1)
+        print(f"{path}: {len(rolls):,} rolls, best {int(rolls.max()) if len(rolls) else 0}")
+    total = int(counts.sum())
+    print(f"{'rarity':>6}{'rolls':>16}{'share':>10}")
+    for rarity in np.flatnonzero(counts):
+        print(f"{rarity:>6}{int(counts[rarity]):>16,}{counts[rarity] / total:>10.4%}")
+
+
+if __name__ == "__main__":
+    main()
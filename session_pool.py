@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Struct-of-arrays pool of incremental-stats sessions.
+
+SessionPool keeps every session in shared NumPy arrays, so one tick()
+advances all of them:
+
+    values[slot, i]   stat i of the session in that slot (0 = "a")
+    unlocked[slot]    how many stats it has unlocked (0 for a free slot)
+    all_boost[slot], a_boost[slot]
+
+The rules are chosen per pool, as in stat_tick: "copy" (incremental_stats_game
+(7).py, or (8).py with base_a=30) or "gains" (the GUI). Stats are
+float64; sessions that overflow turn inf and are listed by overflowed().
+Freed slots are reused; the pool doubles when full.
+
+    python session_pool.py --sessions 10000 --stats 8 --ticks 200
+"""
+
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+import stat_labels
+import stat_tick
+
+MODES = ("copy", "gains")
+REL_TOL = 1e-9  # check() tolerance, as in stat_tick.check
+
+
+class SessionPool:
+    """Many Game sessions advanced together by one vectorized tick."""
+
+    def __init__(self, mode="copy", base_a=None, capacity=64, max_stats=8):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.mode = mode
+        self.base_a = base_a
+        self.values = np.zeros((capacity, max_stats))
+        self.unlocked = np.zeros(capacity, dtype=np.int64)
+        self.all_boost = np.ones(capacity)
+        self.a_boost = np.ones(capacity)
+        self._free = list(range(capacity - 1, -1, -1))  # pop() hands out low slots first
+        self._high = 0  # slots >= _high have never been used
+
+    def __len__(self):
+        return self._high - sum(1 for slot in self._free if slot < self._high)
+
+    # ---- sessions ----
+    def add(self, values=(1.0,), all_boost=1, a_boost=1):
+        """Start a session with these stat values (lowest first); returns its slot."""
+        if not values:
+            raise ValueError("a session needs at least stat a")
+        if not self._free:
+            self._grow_rows()
+        slot = self._free.pop()
+        self._high = max(self._high, slot + 1)
+        self._fill(slot, values, all_boost, a_boost)
+        return slot
+
+    def reset(self, slot, values=(1.0,), all_boost=1, a_boost=1):
+        """Overwrite a live session's stats and boosts, e.g. on a challenge reset."""
+        self._check(slot)
+        if not values:
+            raise ValueError("a session needs at least stat a")
+        self._fill(slot, values, all_boost, a_boost)
+
+    def add_game(self, game):
+        """Copy a Game's stats and boosts into a new session."""
+        values = [float(game.stats[name]) for name in game.unlocked]
+        return self.add(values, game.all_boost, game.a_boost)
+
+    def remove(self, slot):
+        self._check(slot)
+        self.values[slot] = 0.0
+        self.unlocked[slot] = 0
+        self.all_boost[slot] = self.a_boost[slot] = 1.0
+        self._free.append(slot)
+
+    def unlock(self, slot, value=0.0):
+        """Unlock the session's next stat at value ((7)/(8) use 0, the GUI 10)."""
+        self._check(slot)
+        n = int(self.unlocked[slot])
+        self._ensure_width(n + 1)
+        self.values[slot, n] = value
+        self.unlocked[slot] = n + 1
+
+    def stats(self, slot):
+        """{label: value} for one session, as Game.stats holds them."""
+        self._check(slot)
+        n = int(self.unlocked[slot])
+        return {stat_labels.label(i + 1): float(v) for i, v in enumerate(self.values[slot, :n])}
+
+    def overflowed(self):
+        """Slots whose stats left the float range."""
+        rows = self.values[:self._high]
+        return np.flatnonzero(~np.isfinite(rows).all(axis=1)).tolist()
+
+    def _fill(self, slot, values, all_boost, a_boost):
+        self._ensure_width(len(values))
+        self.values[slot] = 0.0
+        self.values[slot, :len(values)] = values
+        self.unlocked[slot] = len(values)
+        self.all_boost[slot] = all_boost
+        self.a_boost[slot] = a_boost
+
+    def _check(self, slot):
+        if not 0 <= slot < self._high or not self.unlocked[slot]:
+            raise KeyError(f"no session in slot {slot}")
+
+    def _grow_rows(self):
+        old = len(self.unlocked)
+        new = max(1, 2 * old)
+        self.values = np.concatenate([self.values, np.zeros((new - old, self.values.shape[1]))])
+        self.unlocked = np.concatenate([self.unlocked, np.zeros(new - old, dtype=np.int64)])
+        self.all_boost = np.concatenate([self.all_boost, np.ones(new - old)])
+        self.a_boost = np.concatenate([self.a_boost, np.ones(new - old)])
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def _ensure_width(self, n):
+        width = self.values.shape[1]
+        if n > width:
+            grown = np.zeros((len(self.unlocked), max(n, 2 * width)))
+            grown[:, :width] = self.values
+            self.values = grown
+
+    # ---- ticking ----
+    def tick(self):
+        """Advance every session by one Game.tick."""
+        high = self._high
+        if not high:
+            return
+        n = self.unlocked[:high]
+        width = int(n.max())
+        v = self.values[:high, :width]
+        live = n > 0
+        with np.errstate(over="ignore", invalid="ignore"):
+            if self.mode == "gains":
+                new = self._tick_gains(v, n, width)
+            else:
+                new = self._tick_copy(v, n, width, live)
+        self.values[:high, :width] = new
+
+    def _far_mask(self, n, width, d):
+        # stat i has a partner at distance d only while i + d < unlocked
+        return np.arange(width - d) < (n - d)[:, None]
+
+    def _tick_copy(self, v, n, width, live):
+        new = v.copy()
+        all_boost, a_boost = self.all_boost[:len(n)], self.a_boost[:len(n)]
+        # same association as Game.tick: (3 * all_boost) * a_boost
+        if self.base_a is None:
+            new[:, 0] *= 3 * all_boost * a_boost
+        else:
+            new[:, 0] += np.where(live, self.base_a * all_boost * a_boost, 0.0)
+        for d in range(1, width):
+            if d <= stat_tick.NEAR:
+                new[:, :width - d] += v[:, d:] * (5 * d)
+            else:
+                term = v[:, :width - d] ** stat_tick.distance_exponent(d)
+                new[:, :width - d] += np.where(self._far_mask(n, width, d), term, 0.0)
+        return new
+
+    def _tick_gains(self, v, n, width):
+        boost = self.all_boost[:len(n), None]
+        stat_live = np.arange(width) < n[:, None]
+        gain = np.where(stat_live, np.maximum(1.0, v * 0.05), 0.0)
+        for d in range(1, width):
+            higher = v[:, d:]
+            if d <= stat_tick.NEAR:
+                gain[:, :width - d] += higher * (5 * d) * boost
+            else:
+                term = higher * (v[:, :width - d] ** stat_tick.distance_exponent(d)) * boost
+                gain[:, :width - d] += np.where(self._far_mask(n, width, d), term, 0.0)
+        new = v + gain
+        new[:, 0] *= 3 * self.a_boost[:len(n)]
+        return new
+
+
+# ---- regression check ----
+def check(sessions=300, max_stats=24, ticks=5, seed=0, min_stats=1):
+    """Compare pooled ticks with stat_tick's Python path, session by session.
+
+    Returns a list of mismatch descriptions (empty when all agree).
+    """
+    rng = random.Random(seed)
+    failures = []
+    for mode, base_a in (("copy", None), ("copy", 10 * 3), ("gains", None)):
+        pool = SessionPool(mode, base_a, capacity=4)
+        games = {}
+        for _ in range(sessions):
+            n = rng.randint(min_stats, max_stats)
+            values = [rng.choice((0.0, 1.0, rng.uniform(0, 2))) for _ in range(n)]
+            boosts = (2 ** rng.randint(0, 4), rng.choice((1, 1.5, 3.75)))
+            games[pool.add(values, *boosts)] = [values, *boosts]
+        for slot in list(games)[::7]:  # free some slots and refill them
+            pool.remove(slot)
+            del games[slot]
+        for _ in range(sessions // 7):
+            games[pool.add([1.0, 0.5], 1, 1)] = [[1.0, 0.5], 1, 1]
+        for _ in range(ticks):
+            pool.tick()
+            for game in games.values():
+                values, all_boost, a_boost = game
+                if values is None:
+                    continue
+                try:
+                    if mode == "gains":
+                        game[0] = stat_tick.tick_gains(values, all_boost, a_boost, backend="python")
+                    else:
+                        game[0] = stat_tick.tick_copy(values, all_boost, a_boost, base_a,
+                                                      backend="python")
+                except OverflowError:
+                    game[0] = None  # the float game would have crashed; the pool has inf
+        overflowed = set(pool.overflowed())
+        for slot, (values, _, _) in games.items():
+            got = list(pool.stats(slot).values())
+            if values is None or slot in overflowed:
+                if values is not None or slot not in overflowed:
+                    failures.append(f"{mode}/{base_a}: slot {slot} overflowed in only one of them")
+            elif not all(math.isclose(x, y, rel_tol=REL_TOL) for x, y in zip(got, values)):
+                failures.append(f"{mode}/{base_a}: slot {slot} n={len(values)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick many sessions at once and check the result.")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--stats", type=int, default=8, help="unlocked stats per session")
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--mode", choices=MODES, default="copy")
+    args = parser.parse_args()
+
+    failures = check()
+    for line in failures[:20]:
+        print(line)
+    print(f"check against stat_tick: {'OK' if not failures else f'{len(failures)} mismatches'}")
+
+    pool = SessionPool(args.mode)
+    for _ in range(args.sessions):
+        pool.add([1.0] + [0.0] * (args.stats - 1))
+    started = time.perf_counter()
+    for _ in range(args.ticks):
+        pool.tick()
+    elapsed = time.perf_counter() - started
+    print(f"{args.sessions} sessions x {args.stats} stats: {elapsed / args.ticks * 1e3:.2f} ms per pool tick, "
+          f"{args.sessions * args.ticks / elapsed:,.0f} session-ticks/s")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
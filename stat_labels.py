@@ -0,0 +1,68 @@
+"""
+Stat labels for the incremental stats games.
+
+Stats are labelled by position in bijective base 52: a..z are 1..26, A..Z
+27..52, then aa, ab, ..., aZ, ba, ... Labels up to three letters
+(MAX_INDEXED) are table lookups; longer ones are computed.
+"""
+
+import string
+
+ALPHABET = string.ascii_lowercase + string.ascii_uppercase
+BASE = len(ALPHABET)
+PRECOMPUTED = BASE + BASE ** 2  # every one- and two-letter label
+MAX_INDEXED = PRECOMPUTED + BASE ** 3
+
+_DIGITS = {c: i for i, c in enumerate(ALPHABET)}
+_labels = [""]  # _labels[pos]; position 0 has no label
+_positions = {}
+
+
+def _encode(pos):
+    digits = []
+    while pos:
+        pos, d = divmod(pos - 1, BASE)
+        digits.append(ALPHABET[d])
+    return "".join(reversed(digits))
+
+
+def _extend(size):
+    """Grow the index to cover positions 1..size, at least doubling it."""
+    size = min(max(size, 2 * (len(_labels) - 1)), MAX_INDEXED)
+    for pos in range(len(_labels), size + 1):
+        label = _encode(pos)
+        _labels.append(label)
+        _positions[label] = pos
+
+
+def label(pos):
+    """Label of the stat at 1-based position pos."""
+    if pos < 1:
+        raise ValueError(f"stat positions start at 1, got {pos}")
+    if pos >= len(_labels):
+        if pos > MAX_INDEXED:
+            return _encode(pos)
+        _extend(pos)
+    return _labels[pos]
+
+
+def position(name):
+    """1-based position of a label, or None if it is not a stat label."""
+    pos = _positions.get(name)
+    if pos is not None or not name:
+        return pos
+    pos = 0
+    for c in name:
+        d = _DIGITS.get(c)
+        if d is None:
+            return None
+        pos = pos * BASE + d + 1
+    return pos
+
+
+def next_label(name):
+    """Label of the stat after name (a -> b, Z -> aa, aZ -> ba)."""
+    return label(position(name) + 1)
+
+
+_extend(PRECOMPUTED)
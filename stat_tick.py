@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Tick engine for the incremental stats games.
+
+Each (lower, higher) pair of unlocked stats adds one term to the lower
+stat, depending only on their distance d:
+
+    1 <= d <= 5     higher * 5d                 (the near window)
+    6 <= d <= 15    ... lower ** (d - 5)        (integer exponents 1..10)
+    d > 15          ... lower ** (10 + log10(d - 5))
+
+The GUI version also weights the far terms by the higher stat; the CLI
+versions ((7) and (8)) add the bare power. The near window and band are
+at most 15 terms per stat (one shifted array operation each with NumPy,
+from NUMPY_MIN_STATS stats). The CLI d > 15 tail is summed exactly up to
+TAIL_EXACT, then in closed form (power_sum_log), a fixed cost per row. The
+GUI tail is weighted by every higher stat, so it has no closed form and
+stays a full row per stat (one shifted array operation per distance).
+
+BigNum stats tick as floats while they are plain, and on BigNum only past
+the float range. check() compares every path with the reference loops:
+
+    python stat_tick.py --trials 2000 --stats 80
+"""
+
+import argparse
+import math
+import random
+import time
+from functools import lru_cache
+
+from bignum import BigNum, from_plain_floats, log10, plain_floats
+
+try:
+    import numpy as np
+except ImportError:  # every tick runs on the pure-Python path
+    np = None
+
+NEAR = 5          # distances 1..NEAR use the linear window
+BAND = NEAR + 10  # distances up to BAND use integer exponents 1..10
+TAIL_EXACT = 64   # CLI tail terms up to this distance are added one by one
+NUMPY_MIN_STATS = 48
+
+# B(2j) / (2j)! for the Euler-Maclaurin corrections in power_sum_log
+_EM_COEFFS = (1 / 12, -1 / 720, 1 / 30240, -1 / 1209600, 1 / 47900160,
+              -691 / 1307674368000)
+_TAIL_START = TAIL_EXACT - NEAR + 1  # first k = d - NEAR the closed form covers
+_NEGLIGIBLE = math.log(1e-18)
+
+
+def distance_exponent(distance):
+    """Exponent the far term uses at this distance (int up to BAND)."""
+    exp = distance - NEAR
+    if exp > 10:
+        exp = 10 + math.log10(exp)
+    return exp
+
+
+@lru_cache(maxsize=64)
+def far_exponents(n):
+    """Exponents for distances BAND + 1 .. n - 1, shared by every row."""
+    return tuple(distance_exponent(d) for d in range(BAND + 1, n))
+
+
+def power_sum_log(c, a, b, xp=math):
+    """Natural log of sum(k ** c for k in a..b), for b > a >= 3 * |c| and a >= 60.
+
+    Euler-Maclaurin: the integral, the endpoint average and six Bernoulli
+    corrections, all taken relative to the integral so nothing overflows.
+    xp is math for floats or numpy for arrays of c and b.
+    """
+    s = c + 1
+    s = s + (s == 0) * 1e-300  # c == -1 is the limit s -> 0 (a log)
+    log_a, log_b = xp.log(a), xp.log(b)
+    u = s * (log_b - log_a)
+    # log of a ** s * expm1(u) / s, without overflowing expm1
+    integral = s * log_a + (u + abs(u)) / 2 + xp.log(-xp.expm1(-abs(u))) - xp.log(abs(s))
+    rest = (xp.exp(c * log_a - integral) + xp.exp(c * log_b - integral)) / 2
+    falling = c  # c (c - 1) ... (c - 2j + 2), the factor of the (2j - 1)th derivative
+    for j, coeff in enumerate(_EM_COEFFS, 1):
+        power = c - 2 * j + 1
+        rest = rest + coeff * falling * (xp.exp(power * log_b - integral)
+                                         - xp.exp(power * log_a - integral))
+        falling = falling * (c - 2 * j + 1) * (c - 2 * j)
+    return integral + xp.log1p(rest)
+
+
+def tail_sum_log(c, a, b):
+    """Natural log of sum(k ** c for k in a..b) for any float c and 1 <= a <= b.
+
+    The closed form covers k >= 3 * |c|; any k below that (or a lone k) are
+    added one by one from the largest term and stop once the rest cannot matter, which
+    is a fixed number of terms for any c.
+    """
+    split = max(a, _TAIL_START, math.ceil(3 * abs(c)))
+    peak = power_sum_log(c, split, b) if b > split else -math.inf
+    if b == split:
+        split += 1  # a single term is added directly
+    hi = min(b, split - 1)
+    if hi < a:
+        return peak
+    # terms k ** c in decreasing order: from hi down for c >= 0, from a up otherwise
+    ks = range(hi, a - 1, -1) if c >= 0 else range(a, hi + 1)
+    first = c * math.log(ks[0])
+    ref = max(peak, first)
+    total = math.exp(peak - ref) if peak > -math.inf else 0.0
+    left = len(ks)
+    for k in ks:
+        term = c * math.log(k)
+        # the terms left are each at most this one
+        if total and term + math.log(left) - ref - math.log(total) < _NEGLIGIBLE:
+            break
+        total += math.exp(term - ref)
+        left -= 1
+    return ref + math.log(total)
+
+
+def _use_numpy(values, backend):
+    if backend is None:
+        return np is not None and len(values) >= NUMPY_MIN_STATS
+    if backend == "numpy" and np is None:
+        raise RuntimeError("the numpy backend needs NumPy installed")
+    return backend == "numpy"
+
+
+def _tick_big(tick, values, args, backend):
+    """tick() BigNum stats as floats, or as BigNums if they leave the float range."""
+    floats = plain_floats(values)
+    if floats is not None:
+        try:
+            new = from_plain_floats(tick(floats, *args, backend=backend))
+        except OverflowError:
+            new = None
+        if new is not None:
+            return new
+    # the Python path only needs + * ** and compares, which BigNum has
+    return tick(values, *args, backend="python")
+
+
+# ---- incremental_stats_game.py (GUI): gains from pre-tick values ----
+def tick_gains(values, all_boost, a_boost, backend=None):
+    """One GUI-version tick over the unlocked stats' values, lowest first.
+
+    Returns the new values. backend is "python", "numpy" or None (choose by
+    size); "python" keeps BigNum stats as BigNums throughout.
+    """
+    n = len(values)
+    if not n:
+        return []
+    if backend != "python" and isinstance(values[0], BigNum):
+        return _tick_big(tick_gains, values, (all_boost, a_boost), backend)
+    if _use_numpy(values, backend):
+        new = _gains_numpy(values, all_boost)
+    else:
+        new = _gains_python(values, all_boost)
+    new[0] *= 3 * a_boost
+    return new
+
+
+def _gains_python(v, all_boost):
+    n = len(v)
+    tail_exps = far_exponents(n)
+    new = []
+    for i, lower in enumerate(v):
+        gain = max(1, lower * 0.05)
+        top = n - 1 - i
+        for d in range(1, min(NEAR, top) + 1):
+            gain += v[i + d] * (5 * d) * all_boost
+        if lower != 0:
+            for d in range(NEAR + 1, min(BAND, top) + 1):
+                gain += v[i + d] * (lower ** (d - NEAR)) * all_boost
+            for d in range(BAND + 1, top + 1):
+                gain += v[i + d] * (lower ** tail_exps[d - BAND - 1]) * all_boost
+        new.append(lower + gain)
+    return new
+
+
+def _gains_numpy(values, all_boost):
+    v = np.array(values, dtype=float)
+    n = len(v)
+    boost = float(all_boost)
+    gain = np.maximum(1.0, v * 0.05)
+    for d in range(1, min(NEAR, n - 1) + 1):
+        gain[:n - d] += v[d:] * (5 * d) * boost
+    for d in range(NEAR + 1, n):
+        power = _power(v[:n - d], distance_exponent(d))
+        with np.errstate(over="ignore"):  # inf, as float * float gives
+            gain[:n - d] += v[d:] * power * boost
+    return (v + gain).tolist()
+
+
+# ---- incremental_stats_game (7).py / (8).py: add onto a copy ----
+def tick_copy(values, all_boost, a_boost, base_a=None, backend=None):
+    """One CLI-version tick over the unlocked stats' values, lowest first.
+
+    "a" is multiplied by 3 * all_boost * a_boost, as in (7), or, when
+    base_a is given, has base_a * all_boost * a_boost added, as in (8).
+    """
+    n = len(values)
+    if not n:
+        return []
+    if backend != "python" and isinstance(values[0], BigNum):
+        return _tick_big(tick_copy, values, (all_boost, a_boost, base_a), backend)
+    if _use_numpy(values, backend):
+        return _copy_numpy(values, all_boost, a_boost, base_a)
+    return _copy_python(values, all_boost, a_boost, base_a)
+
+
+def _copy_python(v, all_boost, a_boost, base_a):
+    n = len(v)
+    tail_exps = far_exponents(min(n, TAIL_EXACT + 1))
+    new = []
+    for i, lower in enumerate(v):
+        x = lower
+        if i == 0:
+            if base_a is None:
+                x *= 3 * all_boost * a_boost
+            else:
+                x += base_a * all_boost * a_boost
+        top = n - 1 - i
+        for d in range(1, min(NEAR, top) + 1):
+            x += v[i + d] * (5 * d)
+        if lower != 0:
+            for d in range(NEAR + 1, min(BAND, top) + 1):
+                x += lower ** (d - NEAR)
+            for d in range(BAND + 1, min(TAIL_EXACT, top) + 1):
+                x += lower ** tail_exps[d - BAND - 1]
+            if top > TAIL_EXACT:
+                x += _tail_python(lower, top - NEAR)
+        new.append(x)
+    return new
+
+
+def _tail_python(lower, last):
+    """sum(lower ** (10 + log10(k))) over k = _TAIL_START .. last (lower > 0)."""
+    c = float(log10(lower))
+    log = 10 * c + tail_sum_log(c, _TAIL_START, last) / math.log(10)
+    if isinstance(lower, BigNum):
+        return BigNum.from_log10(log)
+    return 10.0 ** log  # OverflowError past the float range, like lower ** e
+
+
+def _copy_numpy(values, all_boost, a_boost, base_a):
+    v = np.array(values, dtype=float)
+    n = len(v)
+    new = v.copy()
+    if base_a is None:
+        new[0] *= 3 * all_boost * a_boost
+    else:
+        new[0] += base_a * all_boost * a_boost
+    for d in range(1, min(NEAR, n - 1) + 1):
+        new[:n - d] += v[d:] * (5 * d)
+    for d in range(NEAR + 1, min(TAIL_EXACT, n - 1) + 1):
+        new[:n - d] += _power(v[:n - d], distance_exponent(d))
+    if n > TAIL_EXACT + 1:
+        rows = np.flatnonzero(v[:n - TAIL_EXACT - 1])
+        c = np.log10(v[rows])
+        last = n - 1 - rows - NEAR
+        # the closed form needs k >= 3 |c|; below 1e-31 the tail is under the
+        # smallest float anyway
+        fits = (c >= -31) & (3 * np.abs(c) <= _TAIL_START) & (last > _TAIL_START)
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            log = 10 * c[fits] + power_sum_log(c[fits], _TAIL_START, last[fits], np) / math.log(10)
+        new[rows[fits]] += _power(10.0, log)
+        for i in rows[~fits & (c >= -31)]:
+            new[i] += _tail_python(float(v[i]), n - 1 - i - NEAR)
+    return new.tolist()
+
+
+def _power(base, exp):
+    """base ** exp that raises OverflowError like float ** does."""
+    with np.errstate(over="raise", invalid="ignore"):
+        try:
+            return np.power(base, exp)
+        except FloatingPointError as exc:
+            raise OverflowError("stat value too large") from exc
+
+
+# ---- reference implementations (the old double loops) ----
+def reference_tick_gains(values, all_boost, a_boost):
+    n = len(values)
+    gains = [0] * n
+    for i in range(n):
+        gains[i] += max(1, values[i] * 0.05)
+    for i in range(n):
+        for j in range(i + 1, n):
+            distance = j - i
+            h_val = values[j]
+            if 1 <= distance <= 5:
+                gains[i] += h_val * (5 * distance) * all_boost
+            else:
+                exp = distance - 5
+                if exp > 10:
+                    exp = 10 + math.log10(exp)
+                gains[i] += h_val * (values[i] ** exp) * all_boost
+    new = [x + g for x, g in zip(values, gains)]
+    if new:
+        new[0] *= 3 * a_boost
+    return new
+
+
+def reference_tick_copy(values, all_boost, a_boost, base_a=None):
+    n = len(values)
+    new = list(values)
+    for i in range(n):
+        if i == 0:
+            if base_a is None:
+                new[0] *= 3 * all_boost * a_boost
+            else:
+                new[0] += base_a * all_boost * a_boost
+        for j in range(i + 1, n):
+            distance = j - i
+            if 1 <= distance <= 5:
+                new[i] += values[j] * (5 * distance)
+            else:
+                exp = distance - 5
+                if exp > 10:
+                    exp = 10 + math.log10(exp)
+                new[i] += values[i] ** exp
+    return new
+
+
+# ---- regression check ----
+def _random_case(rng, max_stats):
+    n = rng.randint(1, max_stats)
+    # keep the far powers finite: lower ** 11+ overflows once lower > ~1e28
+    values = [rng.choice((0.0, 0.0, 1.0, rng.uniform(0, 2), rng.uniform(0, 60)))
+              for _ in range(n)]
+    return values, 2 ** rng.randint(0, 8), rng.choice((1, 1.5, 3.75))
+
+
+def _close(a, b, rel=1e-9):
+    return all(x == y or math.isclose(x, y, rel_tol=rel) for x, y in zip(a, b)) and len(a) == len(b)
+
+
+def check(trials=500, max_stats=64, seed=0):
+    """Compare every backend against the reference loops on random games.
+
+    Returns a list of mismatch descriptions (empty when all agree).
+    """
+    rng = random.Random(seed)
+    backends = ["python"] + (["numpy"] if np is not None else [])
+    failures = []
+    for trial in range(trials):
+        values, all_boost, a_boost = _random_case(rng, max_stats)
+        cases = [
+            ("gains", reference_tick_gains(values, all_boost, a_boost),
+             lambda b: tick_gains(values, all_boost, a_boost, backend=b)),
+            ("copy", reference_tick_copy(values, all_boost, a_boost),
+             lambda b: tick_copy(values, all_boost, a_boost, backend=b)),
+            ("copy+base", reference_tick_copy(values, all_boost, a_boost, 10 * 3),
+             lambda b: tick_copy(values, all_boost, a_boost, 10 * 3, backend=b)),
+        ]
+        exact = len(values) <= TAIL_EXACT + 1  # past that the tail is a closed form
+        for name, expected, run in cases:
+            for backend in backends:
+                got = run(backend)
+                ok = got == expected if backend == "python" and exact else _close(got, expected)
+                if not ok:
+                    failures.append(f"trial {trial} {name}/{backend}: n={len(values)}")
+        # BigNum is plain float arithmetic in this range, so it must match exactly
+        big = [BigNum(v) for v in values]
+        for backend in ("python", None):
+            got = [float(x) for x in tick_gains(big, all_boost, a_boost, backend=backend)]
+            ok = got == cases[0][1] if backend == "python" and exact else _close(got, cases[0][1])
+            if not ok:
+                failures.append(f"trial {trial} gains/bignum/{backend}: n={len(values)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check stat_tick against the old double loop.")
+    parser.add_argument("--trials", type=int, default=500)
+    parser.add_argument("--stats", type=int, default=64, help="largest stat count to try")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    failures = check(args.trials, args.stats, args.seed)
+    for line in failures[:20]:
+        print(line)
+    print(f"{args.trials} random games, up to {args.stats} stats: "
+          f"{'OK' if not failures else f'{len(failures)} mismatches'}")
+
+    values = [1.0 + (i % 7) / 10 for i in range(args.stats)]
+    for name, fn in (("reference", reference_tick_gains), ("stat_tick", tick_gains)):
+        started = time.perf_counter()
+        fn(values, 2, 1)
+        print(f"{name:>10}: {(time.perf_counter() - started) * 1e3:.2f} ms per tick "
+              f"at {args.stats} stats")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
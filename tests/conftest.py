@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# the modules are top-level scripts in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def statgame():
+    # statgame has no .py extension, so load it the way bench.py does
+    from bench import load_script
+    return load_script("statgame")
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+
+import pytest
+
+from autosave import SaveScheduler, write_json_atomic
+
+
+class Recorder:
+    def __init__(self):
+        self.writes = []
+        self.written = threading.Event()
+
+    def __call__(self, data):
+        self.writes.append(data)
+        self.written.set()
+
+
+def test_changes_within_an_interval_are_one_write():
+    state = {"LP": 0}
+    writer = Recorder()
+    saver = SaveScheduler(lambda: dict(state), writer, interval=0.2)
+    saver.flush()  # nothing pending: no write
+    saver.mark_dirty()
+    saver.flush()  # a write just happened, so the next one waits out the interval
+    writer.written.clear()
+    for i in range(1, 101):
+        state["LP"] = i
+        saver.mark_dirty()
+    assert writer.written.wait(5)
+    saver.close()
+    assert writer.writes == [{"LP": 0}, {"LP": 100}]
+
+
+def test_close_flushes_pending_changes():
+    writer = Recorder()
+    saver = SaveScheduler(lambda: {"LP": 7}, writer, interval=60)
+    saver.mark_dirty()
+    saver.close()
+    assert writer.writes == [{"LP": 7}]
+    saver.close()  # idempotent, nothing left to write
+    assert len(writer.writes) == 1
+
+
+def test_snapshot_is_taken_when_marked_dirty():
+    # a change after mark_dirty (e.g. a reset in progress) must not leak into that save
+    state = {"LP": 1, "best_rarity": 9}
+    writer = Recorder()
+    saver = SaveScheduler(lambda: dict(state), writer, interval=60)
+    saver.mark_dirty()
+    state["LP"] += 9  # the first half of a reset
+    saver.flush()
+    saver.close()
+    assert writer.writes == [{"LP": 1, "best_rarity": 9}]
+
+
+def test_failed_write_is_retried():
+    calls = []
+
+    def flaky(data):
+        calls.append(data)
+        if len(calls) == 1:
+            raise OSError("disk full")
+
+    saver = SaveScheduler(lambda: {"LP": 3}, flaky, interval=60)
+    saver.mark_dirty()
+    saver.flush()
+    assert isinstance(saver.error, OSError)
+    saver.close()
+    assert calls == [{"LP": 3}, {"LP": 3}] and saver.error is None
+
+
+def test_atomic_write_keeps_old_file_on_failure(tmp_path):
+    path = tmp_path / "save.json"
+    write_json_atomic(str(path), {"LP": 1})
+    with pytest.raises(TypeError):
+        write_json_atomic(str(path), {"LP": object()})  # not JSON serializable
+    assert json.loads(path.read_text()) == {"LP": 1}
+    assert os.listdir(tmp_path) == ["save.json"]  # no temp file left behind
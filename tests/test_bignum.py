@@ -0,0 +1,114 @@
+import math
+
+import pytest
+
+from bignum import FLOAT_DIGITS, HUGE, TINY, BigArray, BigNum
+
+
+def close(a, b, rel=1e-12):
+    """a and b have the same sign and decimal logs within rel of each other."""
+    a, b = BigNum(a), BigNum(b)
+    if a.m == 0 or b.m == 0:
+        return a.m == b.m
+    a_log, b_log = abs(a).log10(), abs(b).log10()
+    return a.m * b.m > 0 and abs(a_log - b_log) <= rel * max(1.0, abs(a_log))
+
+
+def test_float_range_edges():
+    assert BigNum(math.nextafter(HUGE, 0.0)).e == 0
+    assert BigNum(HUGE).e == FLOAT_DIGITS
+    assert BigNum(TINY).e == 0
+    assert BigNum(math.nextafter(TINY, 0.0)).e == -FLOAT_DIGITS - 1
+    below = BigArray([math.nextafter(HUGE, 0.0), HUGE, TINY, math.nextafter(TINY, 0.0)])
+    assert list(below.e) == [0, FLOAT_DIGITS, 0, -FLOAT_DIGITS - 1]
+    assert BigNum("1e300") == BigNum(1e300) and BigNum("1e299") == 1e299
+
+
+def test_add_across_the_edge():
+    total = BigNum(6e299) + BigNum(6e299)
+    assert (total.e, round(total.m, 12)) == (300, 1.2)
+    back = total - BigNum(6e299)
+    assert back.e == 0 and math.isclose(back.m, 6e299, rel_tol=1e-15)
+    assert BigNum("1e1000") + 1 == BigNum("1e1000")  # far below its precision
+    assert close(BigNum("1e1000") + BigNum("1e1000"), BigNum("2e1000"))
+    assert close(BigNum("1e1000") + BigNum("1e999"), BigNum("1.1e1000"))
+    assert BigNum("-1e1000") + BigNum("1e1000") == 0
+
+
+def test_mul_and_div_past_both_edges():
+    assert close(BigNum(1e200) * 1e200, BigNum("1e400"))
+    assert close(BigNum(1e-200) * 1e-200, BigNum("1e-400"))
+    assert close(BigNum(1e150) * BigNum(1e150), BigNum(1e300))
+    assert (BigNum("1e-400") * BigNum("1e400")) == 1.0
+    assert close(BigNum("3e10000000000") / BigNum("1.5e-10000000000"), BigNum("2e20000000000"))
+    assert BigNum("1e400") * 0 == 0
+
+
+def test_pow_past_the_edge():
+    assert close(BigNum(10.0) ** 400, BigNum("1e400"))
+    assert close(BigNum(2.0) ** -2000, BigNum.from_log10(-2000 * math.log10(2)))
+    huge = BigNum("1e300") ** 1e15
+    assert huge.e == 3 * 10**17 and math.isclose(huge.m, 1.0)
+    assert close(BigNum("-2e400") ** 3, BigNum("-8e1200"))
+    with pytest.raises(OverflowError):
+        BigNum("1e300") ** 1e308
+    with pytest.raises(ValueError):
+        BigNum("-2e400") ** 0.5
+
+
+def test_compare_and_hash():
+    ordered = [BigNum("-1e400"), -1e300, BigNum("-1e-400"), 0, BigNum("1e-400"),
+               1e-300, 1e299, BigNum("9.99e299"), BigNum(1e300), BigNum("1e400"), BigNum("2e400")]
+    for low, high in zip(ordered, ordered[1:]):
+        assert BigNum(low) < high and BigNum(high) > low, (low, high)
+        assert BigNum(low) <= high and not BigNum(low) >= high
+    assert hash(BigNum(1e299)) == hash(1e299)
+    assert hash(BigNum("1e400")) == hash(BigNum("10e399")) and BigNum("1e400") in {BigNum("1.0e400")}
+
+
+@pytest.mark.parametrize("text", ["1.5e400", "-2.25e-400", "1e300", "9.99e299", "7.0e123456789012345"])
+def test_str_round_trips(text):
+    num = BigNum(text)
+    assert BigNum(str(num)) == num
+
+
+def test_format_and_conversions():
+    assert str(BigNum("1.5e400")) == "1.5e400"
+    assert format(BigNum("1.5e400"), ".2e") == "1.50e+400"
+    assert format(BigNum("1.5e-400"), ".2E") == "1.50E-400"
+    assert format(BigNum(1.5e299), ".2e") == "1.50e+299"
+    assert float(BigNum("1e400")) == math.inf and float(BigNum("-1e400")) == -math.inf
+    assert float(BigNum("1e-400")) == 0.0
+    assert int(BigNum("1.5e400")) == 15 * 10**399
+    assert close(BigNum(10**1000 + 1), BigNum("1e1000"))
+
+
+def test_array_ops_match_scalars_across_the_edge():
+    values = [0.0, 1e-300, 6e299, 9.99e299, 1e150, 2.5]
+    other = [1.0, 1e-10, 6e299, 1e10, 1e150, BigNum("1e400")]
+    a, b = BigArray(values), BigArray(other)
+    for got, want in ((a.add(b), [BigNum(x) + y for x, y in zip(values, other)]),
+                      (a.mul(b), [BigNum(x) * y for x, y in zip(values, other)]),
+                      (a.pow(3.5), [BigNum(x) ** 3.5 for x in values])):
+        for g, w in zip(got.tolist(), want):
+            assert close(g, w), (g, w)
+    assert close(a.sum(), sum((BigNum(x) for x in values), BigNum(0)))
+
+
+def test_array_from_log10():
+    logs = [-math.inf, -400.5, 0.0, 299.9, 300.0, 1e15]
+    arr = BigArray.from_log10(logs)
+    assert arr[0] == 0
+    for num, log in zip(arr.tolist()[1:], logs[1:]):
+        assert close(num, BigNum.from_log10(log))
+    assert list(arr.log10()[1:]) == pytest.approx(logs[1:], rel=1e-15)
+    for bad in (math.nan, math.inf):
+        with pytest.raises(OverflowError):
+            BigArray.from_log10([1.0, bad])
+        with pytest.raises(OverflowError):
+            BigNum.from_log10(bad)
+
+
+def test_array_pow_overflow():
+    with pytest.raises(OverflowError):
+        BigArray([2.0, BigNum("1e300")]).pow(1e308)
@@ -0,0 +1,38 @@
+import copy
+import time
+
+import incremental_stats_game as isg
+from autosave import write_json_atomic
+from bignum import log10
+
+
+def test_load_catches_up_on_time_away(tmp_path):
+    game = isg.Game()
+    game.unlocked = ["a", "b", "c"]
+    game.stats = {s: isg.BigNum(10.0) for s in game.unlocked}
+    game.all_boost = 2
+    data = game.to_dict()
+    path = str(tmp_path / isg.SAVE_FILE)
+    write_json_atomic(path, data)
+
+    away = 3000
+    loaded, applied = isg.load_game(path, now=data["saved_at"] + away * isg.offline.TICK_SECONDS)
+    assert applied == away
+
+    expected = isg.Game.from_dict(copy.deepcopy(data), now=data["saved_at"])[0]
+    for _ in range(away):
+        expected.tick()
+    for s in game.unlocked:
+        assert abs(log10(loaded.stats[s]) - log10(expected.stats[s])) < 1e-9 * log10(expected.stats[s])
+
+    # a week away is one jump, not 604,800 ticks
+    started = time.perf_counter()
+    loaded, applied = isg.load_game(path, now=data["saved_at"] + 7 * 86400)
+    assert applied == 7 * 86400
+    assert time.perf_counter() - started < 1.0
+    assert log10(loaded.stats["a"]) > log10(expected.stats["a"])
+
+
+def test_no_save_starts_a_new_game(tmp_path):
+    game, applied = isg.load_game(str(tmp_path / "missing.json"))
+    assert applied == 0 and game.unlocked == ["a"]
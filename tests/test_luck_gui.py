@@ -0,0 +1,19 @@
+import pytest
+
+from luck100 import Luck100App
+from luck101 import Luck101App
+from luckiestsim import LuckiestSimApp
+from luckysimu import LuckySimuApp
+
+APPS = [LuckySimuApp, LuckiestSimApp, Luck100App, Luck101App]
+
+
+@pytest.mark.parametrize("app_class", APPS)
+def test_variant_tables(app_class):
+    assert {layer for _, layer, _ in app_class.RESET_KEYS} == set(app_class.SIM.LAYERS)
+    app = app_class.__new__(app_class)  # no window needed for the texts
+    app.sim = app_class.SIM()
+    app.sim.roll_n(1000)
+    texts = app.stat_texts()
+    assert len(texts) == app_class.LABELS and all(texts)
+    assert app.format_number(12345)
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from lucksim import VARIANTS
+
+
+def derived(sim):
+    # compute every cached value, then report which are still cached
+    sim.calc_luck(), sim.table(), sim.threshold(), sim.preview()
+    return set(sim.state.derived)
+
+
+def fresh(sim):
+    """Derived values of a sim built from scratch with the same state."""
+    other = type(sim)(state=sim.to_dict())
+    return other.calc_luck(), other.threshold(), other.preview(), other.table().cdf
+
+
+def current(sim):
+    return sim.calc_luck(), sim.threshold(), sim.preview(), sim.table().cdf
+
+
+@pytest.mark.parametrize("variant", ["luckysimu", "luckiestsim", "luck100"])
+def test_setitem_drops_what_depends_on_the_key(variant):
+    sim = VARIANTS[variant]()
+    assert derived(sim) == {"luck", "table", "threshold", "preview"}
+    sim.state["LP"] = 12
+    assert set(sim.state.derived) == {"preview"}
+    assert current(sim) == fresh(sim)
+    derived(sim)
+    sim.state["best_rarity"] = 40
+    assert set(sim.state.derived) == {"luck", "table", "threshold"}
+    assert current(sim) == fresh(sim)
+
+
+def test_stored_luck_is_the_only_luck_input():
+    sim = VARIANTS["luck101"]()
+    derived(sim)
+    sim.state["LP"] = 5  # Luck101 keeps luck in "Luck"; LP alone changes nothing
+    assert "threshold" in sim.state.derived
+    sim.state["Luck"] = 2.0**40
+    assert "threshold" not in sim.state.derived
+    assert sim.threshold() == 42
+
+
+@pytest.mark.parametrize("change", [
+    lambda sim: sim.state.update(PP=9, best_rarity=20),
+    lambda sim: sim.load({"LP": 3, "PP": 4, "TP": 1, "best_rarity": 31}),
+    lambda sim: sim.state.pop("TP"),
+])
+def test_bulk_changes_drop_everything(change):
+    sim = VARIANTS["luckiestsim"](state={"LP": 7, "best_rarity": 16})
+    derived(sim)
+    change(sim)
+    assert sim.state.derived == {}
+    sim.state.setdefault("TP", 0)
+    assert current(sim) == fresh(sim)
+    sim.state.setdefault("LP", 99)  # already there: nothing written, nothing dropped
+    assert set(sim.state.derived) == {"luck", "table", "threshold", "preview"}
+
+
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+def test_reset_refreshes_derived(variant):
+    sim = VARIANTS[variant](rng=random.Random(4))
+    for layer in sim.LAYERS:
+        sim.state["best_rarity"] = 100
+        derived(sim)
+        before = current(sim)
+        assert sim.reset(layer)
+        assert current(sim) == fresh(sim) != before
@@ -0,0 +1,9 @@
+import offline
+
+
+def test_check_matches_game_tick():
+    assert offline.check(trials=20, max_ticks=300, seed=1) == []
+
+
+def test_check_past_exact_tail():
+    assert offline.check(trials=2, min_stats=258, max_stats=300, max_ticks=4, seed=2) == []
@@ -0,0 +1,20 @@
+import perf
+
+
+class Game:
+    def tick(self, n=1):
+        return n
+
+
+def test_hook_tick_is_free_while_off():
+    original = Game.tick
+    perf.hook_tick(Game, amount_arg=1)
+    try:
+        assert Game.tick is original
+        perf.enable()
+        assert Game.tick is not original
+        Game().tick(5)
+        assert perf.snapshot()["tick"]["units"] >= 5
+    finally:
+        perf.disable()
+    assert Game.tick is original
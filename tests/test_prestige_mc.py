@@ -0,0 +1,59 @@
+import random
+import time
+
+import prestige_mc
+from lucksim import VARIANTS
+
+
+def _counting_resets(sim):
+    counts = []
+    reset = sim.reset
+
+    def counted(layer):
+        done = reset(layer)
+        if done:
+            counts.append(layer)
+        return done
+
+    sim.reset = counted
+    return counts
+
+
+def test_default_policies_reach_every_layer():
+    for variant, spec in prestige_mc.DEFAULT_POLICIES.items():
+        cls = VARIANTS[variant]
+        # luck100's Rp needs 2**98 luck, which its boosts cannot build
+        layers = set(cls.LAYERS) - {"Rp"}
+        for seed in range(3 if cls.RANDOM_ROLLS else 1):
+            sim = cls(rng=random.Random(seed))
+            policy = prestige_mc.load_policy(spec)
+            reached = prestige_mc.simulate_player(sim, policy, prestige_mc.DEFAULT_MAX_ROLLS)
+            assert set(reached) == layers, (variant, seed)
+
+
+def test_hopeless_target_stops_player():
+    # luck100 rolls rarity 2 at luck 1, so TP=30 can never be rolled
+    sim = VARIANTS["luck100"](rng=random.Random(0))
+    resets = _counting_resets(sim)
+    policy = prestige_mc.load_policy("TP=30")
+    assert prestige_mc.simulate_player(sim, policy, prestige_mc.DEFAULT_MAX_ROLLS) == {}
+    assert resets == []
+
+
+def test_ladder_caps():
+    policy = prestige_mc.load_policy("ladder,PP<3,Rp<0")
+    sim = VARIANTS["luck100"](state={"LP": 10**6, "PP": 3})
+    assert policy.choose(sim) == ["TP", "LP"]  # PP capped, Rp never
+    assert policy.target(sim) == 23  # luck100 always rolls its threshold rarity
+    sim.state.update(LP=0, TP=1, best_rarity=10)
+    assert policy.choose(sim) == ["LP"]  # an LP reset would still double luck
+    assert policy.target(sim) is None  # TP is the top layer it plays
+
+
+def test_default_run_finishes_in_bounded_time():
+    started = time.perf_counter()
+    for variant, policy in prestige_mc.DEFAULT_POLICIES.items():
+        summary = prestige_mc.run(variant, 40, policy, workers=1)
+        assert summary["LP"]["reached"] == 40
+        assert summary["TP"]["reached"] == 40
+    assert time.perf_counter() - started < 60
@@ -0,0 +1,53 @@
+import math
+
+import pytest
+
+import prestige_solver
+from rarity import RarityTable
+
+
+def test_deterministic_known_answer():
+    # luck100 rolls floor(log2(2 * LP + 1)) + 2 every time, so the only play
+    # is roll once, reset LP, repeat until a roll reaches PP's 15
+    table = prestige_solver.solve("luck100", "PP", {"LP": 4096})
+    lp, rolls = 0, 0
+    while True:
+        rolls += 1
+        best = math.floor(math.log2(2 * lp + 1)) + 2
+        if best >= 15:
+            break
+        lp += best - 1
+    assert table.expected_rolls({"LP": 0, "best_rarity": 1}) == rolls == 352
+    assert table.best_action({"LP": 0, "best_rarity": 1}) == "roll"
+    assert table.best_action({"LP": 0, "best_rarity": 2}) == "LP"
+    assert table.best_action({"LP": 4096, "best_rarity": 15}) == "PP"
+    assert table.expected_rolls({"LP": 4096, "best_rarity": 15}) == 0
+
+
+def test_random_known_answer():
+    # luckysimu toward PP with LP capped at 1: waiting at luck 3 beats luck 1,
+    # so the first roll is followed by an LP reset unless it already hit 15
+    table = prestige_solver.solve("luckysimu", "PP", {"LP": 1})
+    at1, at3 = RarityTable(1).tail(15), RarityTable(3).tail(15)
+    for best in range(1, 15):
+        assert table.expected_rolls({"LP": 1, "best_rarity": best}) == pytest.approx(1 / at3)
+        assert table.best_action({"LP": 0, "best_rarity": best}) == "LP"
+    assert table.expected_rolls({"LP": 0, "best_rarity": 0}) == pytest.approx(1 + (1 - at1) / at3)
+    assert table.best_action({"LP": 0, "best_rarity": 0}) == "roll"
+
+
+def test_capped_away_goal_is_unreachable():
+    # without LP, luck100's luck stays 1 and it rolls 2 forever
+    table = prestige_solver.solve("luck100", "PP", {"LP": 0})
+    assert table.expected_rolls({"LP": 0, "best_rarity": 1}) == math.inf
+
+
+def test_load_or_solve_caches(tmp_path):
+    caps = {"LP": 3}
+    solved = prestige_solver.load_or_solve("luckysimu", "PP", caps, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+    loaded = prestige_solver.load_or_solve("luckysimu", "PP", caps, cache_dir=str(tmp_path))
+    assert loaded.actions == solved.actions and loaded.values == solved.values
+    assert loaded.layers == ["LP"] and loaded.caps == caps
+    with pytest.raises(ValueError):
+        prestige_solver.solve("luck101", "TP")
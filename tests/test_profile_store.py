@@ -0,0 +1,38 @@
+from lucksim import VARIANTS
+from profile_store import ProfileStore
+
+
+def test_later_save_wins_across_stores(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    first, second = ProfileStore(path), ProfileStore(path)
+    first.save("p", "luckysimu", {"LP": 1, "luck": 1})
+    second.save("p", "luckysimu", {"LP": 2, "luck": 1})
+    # first still remembers LP=1; its save must not be skipped as unchanged
+    first.save("p", "luckysimu", {"LP": 1, "luck": 1})
+    assert second.load("p", "luckysimu") == {"LP": 1, "luck": 1}
+    first.close()
+    second.close()
+
+
+def test_unchanged_fields_are_not_rewritten(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"))
+    assert store.save("p", "luck100", {"LP": 1, "PP": 0}) == 2
+    assert store.save("p", "luck100", {"LP": 2, "PP": 0}) == 1
+    assert store.save("p", "luck100", {"LP": 2}) == 1  # PP deleted
+    assert store.load("p", "luck100") == {"LP": 2}
+    store.close()
+
+
+def test_luck101_saves_one_field_per_stat(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"))
+    sim = VARIANTS["luck101"]()
+    sim.load({"stats": {"Luck": 3}, "best_rarity": 7})  # progress.json layout
+    store.save("p", "luck101", sim.to_dict())
+    saved = store.load("p", "luck101")
+    assert saved["Luck"] == 3 and saved["best_rarity"] == 7
+    sim.state["Luck"] = 4
+    assert store.save("p", "luck101", sim.to_dict()) == 1
+    again = VARIANTS["luck101"]()
+    again.load(store.load("p", "luck101"))
+    assert again.state == sim.state
+    store.close()
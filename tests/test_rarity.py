@@ -0,0 +1,77 @@
+import math
+import random
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from bignum import BigNum
+from rarity import TOP_RARITY, RarityTable, floor_log2, roll_many, threshold_rarity
+
+
+def walk(luck, rng):
+    # luckysimu.py's original roll: top-down, skipping certain rarities
+    for rarity in range(TOP_RARITY, 0, -1):
+        chance = luck * (1 / (2 ** rarity))
+        if chance >= 1:
+            continue
+        if rng.random() < chance:
+            return rarity
+    return 1
+
+
+@pytest.mark.parametrize("luck", [1, 3.7, 1000, 2**40 + 5, 2**90, 2**100, 2**200])
+def test_table_matches_top_down_walk(luck):
+    n = 20_000
+    rng = random.Random(1)
+    walked = Counter(walk(luck, rng) for _ in range(n))
+    table = RarityTable(luck)
+    sampled = Counter(table.sample(rng.random()) for _ in range(n))
+    for rarity in range(1, TOP_RARITY + 1):
+        p = table.probability(rarity)
+        # five standard errors of each count, plus one stray roll
+        slack = 5 * math.sqrt(n * p * (1 - p)) + 1
+        assert abs(walked[rarity] - n * p) <= slack, (rarity, walked[rarity], n * p)
+        assert abs(sampled[rarity] - n * p) <= slack, (rarity, sampled[rarity], n * p)
+    assert math.isclose(math.fsum(table.probability(r) for r in range(1, TOP_RARITY + 1)), 1.0)
+
+
+def test_roll_many_matches_table():
+    table = RarityTable(2**20)
+    rolled = Counter(int(r) for r in roll_many(2**20, 50_000, seed=5))
+    for rarity, count in rolled.items():
+        assert abs(count - 50_000 * table.probability(rarity)) <= 5 * math.sqrt(count) + 1
+    assert roll_many(2**20, 50_000, best_only=True, seed=5) == max(rolled)
+
+
+def exact_threshold(luck):
+    luck = Fraction(luck)
+    r = 1
+    while luck / 2 ** (r - 1) >= 1:
+        r += 1
+    return r
+
+
+@pytest.mark.parametrize("k", [0, 1, 2, 30, 52, 53, 63, 64, 200, 1023])
+def test_threshold_at_powers_of_two(k):
+    assert threshold_rarity(2**k) == exact_threshold(2**k) == k + 2
+    if k:
+        assert threshold_rarity(2**k + 1) == k + 2
+        assert threshold_rarity(2**k - 1) == exact_threshold(2**k - 1) == k + 1
+    power = 2.0**k
+    assert threshold_rarity(power) == k + 2
+    below = math.nextafter(power, 0.0)
+    assert threshold_rarity(below) == exact_threshold(below) == (k + 1 if k else 1)
+
+
+def test_threshold_edges():
+    assert threshold_rarity(0) == threshold_rarity(0.5) == 1
+    assert threshold_rarity(1) == threshold_rarity(1.0) == 2
+    assert threshold_rarity(2**5000) == 5002  # past the float range, still exact
+    assert floor_log2(2**5000 - 1) == 4999
+    assert floor_log2(math.ulp(0.0)) == -1074
+    assert threshold_rarity(BigNum("1e400")) == math.floor(400 * math.log2(10)) + 2
+    with pytest.raises(OverflowError):
+        threshold_rarity(math.inf)
+    with pytest.raises(OverflowError):
+        floor_log2(math.nan)
@@ -0,0 +1,29 @@
+import random
+import tracemalloc
+
+import lucksim
+from lucksim import VARIANTS
+from roll_recorder import RollRecorder, read_log
+
+
+def test_deterministic_roll_n_records_one_count(tmp_path):
+    sim = VARIANTS["luck100"]()
+    sim.recorder = RollRecorder(str(tmp_path / "luck100.rolls"))
+    tracemalloc.start()
+    best = sim.roll_n(10**7)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 1 << 20  # no [rarity] * n list
+    assert sim.recorder.histogram() == {best: 10**7}
+    rolls = read_log(sim.recorder.log.path)
+    assert len(rolls) == 10**7 and rolls[0] == rolls[-1] == best
+    sim.recorder.close()
+
+
+def test_random_roll_n_records_in_chunks(monkeypatch):
+    monkeypatch.setattr(lucksim, "RECORD_CHUNK", 1000)
+    sim = VARIANTS["luckysimu"](rng=random.Random(3))
+    sim.recorder = RollRecorder()
+    best = sim.roll_n(10_500)
+    assert sim.recorder.total == 10_500
+    assert best == max(sim.recorder.histogram()) == sim.state["best_rarity"]
@@ -0,0 +1,10 @@
+import session_pool
+
+
+def test_check_small_sessions():
+    assert session_pool.check(sessions=60, seed=1) == []
+
+
+def test_check_past_exact_tail():
+    # more stats than stat_tick's exact tail, in copy and gains mode
+    assert session_pool.check(sessions=4, min_stats=258, max_stats=300, ticks=3, seed=2) == []
@@ -0,0 +1,45 @@
+import math
+import random
+
+import pytest
+
+import stat_tick
+from bignum import BigNum
+
+
+def test_check_matches_reference_loops():
+    assert stat_tick.check(trials=200, max_stats=stat_tick.TAIL_EXACT) == []
+
+
+def test_check_past_exact_tail():
+    assert stat_tick.check(trials=12, max_stats=300, seed=1) == []
+
+
+@pytest.mark.parametrize("c", [-31.0, -20.5, -3.0, -1.0, -0.25, 0.0, 0.5, 1.0, 2.7, 9.0, 20.0, 27.5, 120.0])
+@pytest.mark.parametrize("last", [60, 61, 90, 400, 5000])
+def test_tail_sum_matches_term_by_term(c, last):
+    want = math.log(math.fsum(math.exp(c * math.log(k) - c * math.log(last if c > 0 else 60))
+                              for k in range(60, last + 1))) + c * math.log(last if c > 0 else 60)
+    got = stat_tick.tail_sum_log(c, 60, last)
+    assert abs(got - want) <= 1e-13 * max(1.0, abs(want))
+
+
+def test_bignum_stats_past_float_range():
+    rng = random.Random(3)
+    values = [BigNum("1e400")] + [BigNum(rng.uniform(0, 2)) for _ in range(79)]
+    for tick, ref in ((stat_tick.tick_copy, stat_tick.reference_tick_copy),
+                      (stat_tick.tick_gains, stat_tick.reference_tick_gains)):
+        got = tick(values, 2, 1.5)
+        want = ref(values, 2, 1.5)
+        assert all(isinstance(x, BigNum) for x in got)
+        assert all(math.isclose(float(x.log10()), float(y.log10()), rel_tol=1e-12)
+                   for x, y in zip(got, want) if y)
+
+
+def test_gains_keep_full_reach():
+    # far terms grow with distance, so the farthest stats matter most
+    values = [1.5] * 400
+    want = stat_tick.reference_tick_gains(values, 1, 1)
+    for backend in ("python", "numpy"):
+        got = stat_tick.tick_gains(values, 1, 1, backend=backend)
+        assert all(math.isclose(x, y, rel_tol=1e-12) for x, y in zip(got, want))
@@ -0,0 +1,100 @@
+import random
+
+
+def _boosted(statgame, state, vectorized):
+    saved = statgame.np
+    if not vectorized:
+        statgame.np = None  # the per-stat loop
+    try:
+        statgame.apply_all_boosts(state)
+        return state.values.tolist()
+    except OverflowError:
+        return None
+    finally:
+        statgame.np = saved
+
+
+def _random_pair(statgame, rng):
+    max_stats = rng.randint(1, 60)
+    states = statgame.GameState(max_stats), statgame.GameState(max_stats)
+    for n in range(2, max_stats + 1):
+        if rng.random() < 0.5:
+            for state in states:
+                state.unlock(n)
+    for n in states[0].unlocked:
+        value = rng.choice((0.0, 1e-12, 0.5, rng.uniform(0, 3), rng.uniform(0, 50), 1e100))
+        for state in states:
+            state.values[n] = value
+    return states
+
+
+def test_vectorized_boosts_match_loop(statgame):
+    rng = random.Random(0)
+    for _ in range(150):
+        loop_state, vec_state = _random_pair(statgame, rng)
+        for _ in range(3):
+            want = _boosted(statgame, loop_state, False)
+            got = _boosted(statgame, vec_state, True)
+            assert (want is None) == (got is None)
+            if want is None:
+                break
+            for x, y in zip(want, got):
+                if x != y:
+                    assert x and y
+                    assert abs(x.log10() - y.log10()) <= 1e-12 * max(1.0, abs(x.log10()))
+
+
+def test_tick_many_equals_ticks_one_by_one(statgame):
+    one, many = statgame.GameState(30), statgame.GameState(30)
+    for state in (one, many):
+        for n in (2, 5, 9):
+            state.unlock(n)
+            state.generation[n] = float(n * 3)
+    for _ in range(1000):
+        statgame.tick(one)
+    statgame.tick(many, 1000)
+    assert one.values.tolist() == many.values.tolist()
+    assert one.time == many.time == 1000
+
+
+def test_large_game_ticks(statgame):
+    state = statgame.GameState(10_000)
+    for n in range(2, 10_001, 3):
+        state.unlock(n)
+        state.generation[n] = 1e-12
+    statgame.run_command(state, statgame.OP_TICK, 10)
+    assert state.values[1] > 0
+
+
+def test_out_of_range_arg_is_refused_before_running(statgame, tmp_path):
+    journal = statgame.Journal(str(tmp_path / "save.json"))
+    state = statgame.GameState(100)  # the size load_game starts from
+    statgame.play(state, journal, statgame.OP_TICK, 5)
+    before = state.to_dict()
+    ok, _ = statgame.play(state, journal, statgame.OP_TICK, 2**63)
+    assert not ok
+    assert state.to_dict() == before
+    statgame.play(state, journal, statgame.OP_TICK, 7)
+    journal.close()
+    replayed = statgame.load_game(statgame.Journal(str(tmp_path / "save.json")))
+    assert replayed.to_dict() == state.to_dict()
+
+
+def test_overflowing_tick_is_rolled_back(statgame, tmp_path):
+    journal = statgame.Journal(str(tmp_path / "save.json"))
+    state = statgame.GameState(100)
+    for n in range(2, 41):
+        state.unlock(n)
+        state.generation[n] = 1.0
+    journal.snapshot(state.to_dict())
+    refused = 0
+    for _ in range(50):
+        before = state.to_dict()
+        ok, msg = statgame.play(state, journal, statgame.OP_TICK, 1)
+        if not ok:
+            refused += 1
+            assert state.to_dict() == before, msg
+    assert refused  # the values do outgrow BigNum within 50 ticks
+    journal.close()
+    replayed = statgame.load_game(statgame.Journal(str(tmp_path / "save.json")))
+    assert replayed.to_dict() == state.to_dict()
@@ -0,0 +1,86 @@
+import random
+
+import triggers
+from triggers import Triggers
+
+
+def test_fires_once_in_threshold_order():
+    t = Triggers()
+    t.set("c", 0, 30)
+    t.set("a", 0, 10)
+    t.set("b", 0, 20)
+    t.set("z", 1, 5)
+    values = [25, 4]
+    assert t.check(values.__getitem__) == ["a", "b"]
+    assert t.fired == {"a": (0, 10), "b": (0, 20)}
+    assert t.check(values.__getitem__) == []
+    values[1] = 5
+    assert t.check(values.__getitem__) == ["z"]
+    assert len(t) == 1 and "c" in t and "a" not in t
+
+
+def test_set_replaces_and_discard_forgets():
+    t = Triggers()
+    t.set("x", 0, 10)
+    t.set("x", 0, 50)  # the 10 entry is stale now
+    t.set("y", 0, 5)
+    t.discard("y")
+    assert t.check(lambda stat: 20) == []
+    assert t.check(lambda stat: 50) == ["x"]
+    t.discard("x")
+    assert t.fired == {} and len(t) == 0
+
+
+def test_rearm_only_what_the_value_no_longer_meets():
+    t = Triggers()
+    t.set("cheap", 0, 10)
+    t.set("dear", 0, 100)
+    t.set("other", 1, 10)
+    assert sorted(t.check(lambda stat: 100)) == ["cheap", "dear", "other"]
+    t.rearm(0, 50)  # spent down to 50
+    assert "dear" in t and "cheap" not in t and "other" not in t
+    assert t.check(lambda stat: 60) == []
+    assert t.check(lambda stat: 100) == ["dear"]
+
+
+def test_compaction_keeps_behaviour():
+    t = Triggers()
+    for i in range(3 * triggers.COMPACT_MIN):
+        t.set("k", 0, i)
+    t.set("other", 0, 7)
+    assert t._stale <= triggers.COMPACT_MIN
+    assert sum(len(h) for h in t._heaps.values()) <= len(t) + triggers.COMPACT_MIN
+    assert t.check(lambda stat: 3 * triggers.COMPACT_MIN) == ["other", "k"]
+
+
+def test_matches_brute_force():
+    rng = random.Random(5)
+    t = Triggers()
+    armed, fired = {}, {}
+    values = [0] * 4
+    for _ in range(5000):
+        op = rng.random()
+        key = rng.randrange(40)
+        if op < 0.4:
+            stat, threshold = rng.randrange(4), rng.randrange(100)
+            t.set(key, stat, threshold)
+            armed[key] = (stat, threshold)
+            fired.pop(key, None)
+        elif op < 0.5:
+            t.discard(key)
+            armed.pop(key, None)
+            fired.pop(key, None)
+        elif op < 0.8:
+            stat = rng.randrange(4)
+            values[stat] = rng.randrange(110)
+            t.rearm(stat, values[stat])
+            for k, (s, threshold) in list(fired.items()):
+                if s == stat and values[stat] < threshold:
+                    armed[k] = fired.pop(k)
+        else:
+            got = t.check(values.__getitem__)
+            want = [k for k, (s, threshold) in armed.items() if values[s] >= threshold]
+            assert sorted(got) == sorted(want)
+            for k in want:
+                fired[k] = armed.pop(k)
+            assert t.fired == fired and len(t) == len(armed)
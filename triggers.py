@@ -0,0 +1,89 @@
+"""
+Threshold triggers: "fire once stat reaches this value", without polling.
+
+Triggers keeps each stat's conditions in a min-heap, so check() compares
+only the top entry per stat. set(key, ...) replaces a key's condition;
+rearm(stat, value) restores fired keys that value no longer meets.
+
+    triggers = Triggers()
+    triggers.set("all_x2", 1, price)
+    for key in triggers.check(values.__getitem__):
+        ...
+"""
+
+import heapq
+
+COMPACT_MIN = 64  # stale heap entries tolerated before the heaps are rebuilt
+
+
+class Triggers:
+    """Pending stat >= threshold conditions of one session, keyed by name."""
+
+    def __init__(self):
+        self._heaps = {}  # stat -> heap of (threshold, seq, key)
+        self._armed = {}  # key -> (stat, threshold, seq) of its live heap entry
+        self.fired = {}   # key -> (stat, threshold) met and not re-armed since
+        self._seq = 0
+        self._stale = 0   # replaced or discarded entries still in the heaps
+
+    def __len__(self):
+        return len(self._armed)
+
+    def __contains__(self, key):
+        return key in self._armed
+
+    def set(self, key, stat, threshold):
+        """Arm key to fire once stat >= threshold, replacing any earlier condition."""
+        if self._armed.pop(key, None) is not None:
+            self._stale += 1
+        self.fired.pop(key, None)
+        self._seq += 1
+        self._armed[key] = (stat, threshold, self._seq)
+        heap = self._heaps.get(stat)
+        if heap is None:
+            heap = self._heaps[stat] = []
+        heapq.heappush(heap, (threshold, self._seq, key))
+        if self._stale > COMPACT_MIN and self._stale > len(self._armed):
+            self._compact()
+
+    def discard(self, key):
+        """Forget key, armed or fired."""
+        if self._armed.pop(key, None) is not None:
+            self._stale += 1
+        self.fired.pop(key, None)
+
+    def check(self, value_of):
+        """Fire every armed condition that is now met; returns the keys.
+
+        value_of(stat) returns a stat's current value. Keys come out in
+        threshold order per stat.
+        """
+        fired = []
+        for stat, heap in self._heaps.items():
+            if not heap:
+                continue
+            value = value_of(stat)
+            while heap and heap[0][0] <= value:
+                threshold, seq, key = heapq.heappop(heap)
+                armed = self._armed.get(key)
+                if armed is None or armed[2] != seq:
+                    self._stale -= 1  # replaced or discarded since it was pushed
+                    continue
+                del self._armed[key]
+                self.fired[key] = (stat, threshold)
+                fired.append(key)
+        return fired
+
+    def rearm(self, stat, value):
+        """Re-arm the fired conditions on stat that value no longer meets."""
+        for key, (fired_stat, threshold) in list(self.fired.items()):
+            if fired_stat == stat and value < threshold:
+                self.set(key, stat, threshold)
+
+    def _compact(self):
+        self._heaps = {}
+        for key, (stat, threshold, seq) in self._armed.items():
+            self._heaps.setdefault(stat, []).append((threshold, seq, key))
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+        self._stale = 0